@@ -0,0 +1,87 @@
+import json
+import time
+import inspect
+import logging
+import functools
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from .metrics import metrics
+
+# One JSON line per action run; enable/disable independently of the debug dumps
+# (e.g. logging.getLogger("actions.trace").setLevel(logging.WARNING))
+trace_logger = logging.getLogger("actions.trace")
+
+_fields: ContextVar[Optional[Dict[str, Any]]] = ContextVar("action_log_fields", default=None)
+
+
+def log_fields(**fields):
+    """Attach extra fields (e.g. ``results=len(rows)``) to the current action's log line"""
+    current = _fields.get()
+    if current is not None:
+        current.update(fields)
+
+
+def _emit(action, tracker, dispatcher, seconds, messages_before, fields, turn, error):
+    record = {
+        "action": action.name(),
+        "sender_id": getattr(tracker, "sender_id", None),
+        "intent": (tracker.latest_message.get("intent") or {}).get("name"),
+        "duration_ms": round(seconds * 1000, 2),
+        "db_ms": round(turn.db_seconds * 1000, 2),
+        "messages": len(dispatcher.messages) - messages_before,
+    }
+    record.update(fields)
+    if error is not None:
+        record["error"] = type(error).__name__
+    trace_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+class _Run:
+    """Bookkeeping for one decorated run: metrics always, the trace line when INFO is enabled"""
+
+    __slots__ = ("action", "dispatcher", "tracker", "fields", "fields_token", "turn", "turn_token",
+                 "started", "messages_before")
+
+    def __init__(self, action, dispatcher, tracker):
+        self.action, self.dispatcher, self.tracker = action, dispatcher, tracker
+        self.fields = {} if trace_logger.isEnabledFor(logging.INFO) else None
+        self.fields_token = _fields.set(self.fields)
+        self.turn, self.turn_token = metrics.start()
+        self.messages_before = len(dispatcher.messages)
+        self.started = time.perf_counter()
+
+    def finish(self, error: Optional[BaseException]):
+        seconds = time.perf_counter() - self.started
+        _fields.reset(self.fields_token)
+        metrics.finish(self.action.name(), self.turn, self.turn_token, seconds, error)
+        if self.fields is not None:
+            _emit(self.action, self.tracker, self.dispatcher, seconds, self.messages_before,
+                  self.fields, self.turn, error)
+
+
+def log_action(run):
+    """Decorate ``Action.run`` to record metrics and emit one structured log line with timing and counts"""
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def wrapper(self, dispatcher, tracker, domain):
+            state, error = _Run(self, dispatcher, tracker), None
+            try:
+                return await run(self, dispatcher, tracker, domain)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                state.finish(error)
+    else:
+        @functools.wraps(run)
+        def wrapper(self, dispatcher, tracker, domain):
+            state, error = _Run(self, dispatcher, tracker), None
+            try:
+                return run(self, dispatcher, tracker, domain)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                state.finish(error)
+    return wrapper
@@ -3,218 +3,108 @@ from rasa_sdk import Action, Tracker, FormValidationAction
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
 from rasa_sdk.events import SlotSet
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import json
 import logging
+from datetime import datetime
+
+from .db import DatabaseUnavailable
+from .cache import cached_fetch, cached_fetchrow
+from . import queries
+from .destination_resolver import resolve_destination_ids
+from .search_index import search_destinations
+from .fuzzy_match import fuzzy_destinations
+from .best_time import best_months
+from .action_logging import log_action, log_fields
+from .renderers import format_results
+from .knowledge import knowledge
+from .slots import turn_slots
+from .routes import plan_route, objective_from_text, route_graph, FASTEST, CHEAPEST
 
 logger = logging.getLogger(__name__)
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'travel_chatbot',
-    'user': 'postgres',
-    'password': 'test1234',
-    'port': 5432
-}
-
-def get_db_connection():
-    """Create database connection"""
-    try:
-        return psycopg2.connect(**DB_CONFIG)
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
-def format_results(results, entity_type):
-    """Format database results into readable text as a list of messages"""
-    if not results:
-        return ["Xin lỗi, tôi không tìm thấy kết quả phù hợp. Bạn có thể thử tìm kiếm khác không?"]
-    
-    messages = []
-    messages.append(f"Tôi tìm thấy {len(results)} kết quả:")
-    
-    for idx, item in enumerate(results[:5], 1):
-        msg = ""
-        if entity_type == 'destination':
-            msg += f"{idx}. 📍 {item['name']}"
-            if item.get('province'):
-                msg += f" - {item['province']}"
-            msg += f"\n   ⭐ Đánh giá: {item.get('rating', 'N/A')}/5\n"
-            if item.get('category'):
-                msg += f"   🏷️ Loại: {item['category']}\n"
-            if item.get('description'):
-                desc = item['description'][:100] + "..." if len(item['description']) > 100 else item['description']
-                msg += f"   📝 {desc}\n"
-        
-        elif entity_type == 'hotel':
-            msg += f"{idx}. 🏨 {item['name']}\n"
-            if item.get('address'):
-                msg += f"   📍 {item['address']}\n"
-            if item.get('star_rating'):
-                msg += f"   ⭐ {item['star_rating']} sao\n"
-            if item.get('price_range'):
-                msg += f"   💰 Giá: {item['price_range']}\n"
-            if item.get('amenities'):
-                try:
-                    amenities = json.loads(item['amenities']) if isinstance(item['amenities'], str) else item['amenities']
-                    if amenities and isinstance(amenities, list):
-                        msg += f"   🎯 Tiện ích: {', '.join(amenities[:3])}\n"
-                except:
-                    pass
-        
-        elif entity_type == 'restaurant':
-            msg += f"{idx}. 🍽️ {item['name']}\n"
-            if item.get('cuisine_type'):
-                msg += f"   🍜 Loại: {item['cuisine_type']}\n"
-            if item.get('price_range'):
-                msg += f"   💰 Giá: {item['price_range']}\n"
-            if item.get('rating'):
-                msg += f"   ⭐ Đánh giá: {item['rating']}/5\n"
-            if item.get('specialties'):
-                msg += f"   🌟 Đặc sản: {item['specialties']}\n"
-        
-        elif entity_type == 'activity':
-            msg += f"{idx}. 🎯 {item['name']}\n"
-            if item.get('type'):
-                msg += f"   🏷️ Loại: {item['type']}\n"
-            if item.get('price'):
-                msg += f"   💰 Giá: {item['price']:,} VNĐ\n"
-            if item.get('duration'):
-                msg += f"   ⏱️ Thời gian: {item['duration']}\n"
-            if item.get('description'):
-                desc = item['description'][:80] + "..." if len(item['description']) > 80 else item['description']
-                msg += f"   📝 {desc}\n"
-        
-        elif entity_type == 'tour':
-            msg += f"{idx}. 🎫 {item['name']}\n"
-            if item.get('duration_days'):
-                msg += f"   📅 Thời gian: {item['duration_days']} ngày\n"
-            if item.get('price'):
-                msg += f"   💰 Giá: {item['price']:,} VNĐ\n"
-            if item.get('destinations'):
-                try:
-                    dests = json.loads(item['destinations']) if isinstance(item['destinations'], str) else item['destinations']
-                    if dests:
-                        msg += f"   📍 Điểm đến: {', '.join(dests)}\n"
-                except:
-                    pass
-        
-        if msg:
-            messages.append(msg)
-    
-    if len(results) > 5:
-        messages.append(f"... và {len(results) - 5} kết quả khác.")
-    
-    return messages
+# Destinations listed by ActionSearchByCity
+CITY_TOP_N = 5
+# Most destinations ActionCompareDestinations compares in one turn
+MAX_COMPARE = 4
+
+TRANSPORT_ICONS = {"máy bay": "✈️", "tàu hỏa": "🚄", "xe khách": "🚌", "taxi": "🚕"}
+
+
+def _format_minutes(minutes: float) -> str:
+    hours, mins = divmod(int(round(minutes)), 60)
+    if not hours:
+        return f"{mins} phút"
+    return f"{hours} giờ {mins} phút" if mins else f"{hours} giờ"
+
+
+def _format_route(route, title: str) -> str:
+    response = f"{title} ({len(route.legs)} chặng):\n\n"
+    for idx, leg in enumerate(route.legs, 1):
+        icon = TRANSPORT_ICONS.get(leg.type, "🚗")
+        response += f"{idx}. {icon} {leg.type.capitalize()}: {route_graph.name(leg.source)} → {route_graph.name(leg.target)}\n"
+        if leg.duration:
+            response += f"   ⏱️ Thời gian: ~{leg.duration}\n"
+        if leg.price_range:
+            response += f"   💰 Giá: {leg.price_range}\n"
+    if all(leg.minutes is not None for leg in route.legs):
+        response += f"\n⏱️ Tổng thời gian: ~{_format_minutes(route.minutes)}"
+    if all(leg.price is not None for leg in route.legs):
+        response += f"\n💰 Tổng chi phí: từ {route.price:,.0f} VNĐ"
+    return response.rstrip("\n")
 
 class ActionSearchDestination(Action):
     def name(self) -> Text:
         return "action_search_destination"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        print("\n" + "="*80)
-        print("🔍 ACTION: ActionSearchDestination")
-        print("="*80)
-        
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         province = tracker.get_slot("province")
         region = tracker.get_slot("region")
         
-        print("\n📦 SLOTS EXTRACTED:")
-        print(f"   destination: '{destination}'")
-        print(f"   province: '{province}'")
-        print(f"   region: '{region}'")
-        
-        entities = tracker.latest_message.get('entities', [])
-        print(f"\n🏷️  ENTITIES IN MESSAGE:")
-        for entity in entities:
-            print(f"   - {entity['entity']}: '{entity['value']}' (confidence: {entity.get('confidence', 'N/A')})")
-        
-        user_text = tracker.latest_message.get('text', '')
-        print(f"\n💬 USER MESSAGE: '{user_text}'")
-        
-        conn = get_db_connection()
-        if not conn:
-            print("❌ DATABASE CONNECTION FAILED!")
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố. Vui lòng thử lại sau.")
-            return []
-        
-        print("✅ DATABASE CONNECTION OK")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Slots: destination={destination!r}, province={province!r}, region={region!r}")
+            for entity in tracker.latest_message.get('entities', []):
+                logger.debug(f"Entity {entity['entity']}={entity['value']!r} (confidence: {entity.get('confidence', 'N/A')})")
+            logger.debug(f"User message: {tracker.latest_message.get('text', '')!r}")
         
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = "SELECT * FROM destinations WHERE 1=1"
-            params = []
-            
-            if destination:
-                query += " AND LOWER(name) LIKE LOWER(%s)"
-                params.append(f"%{destination}%")
-                print(f"\n   Added filter: name LIKE '%{destination}%'")
-            
-            if province:
-                query += " AND LOWER(province) LIKE LOWER(%s)"
-                params.append(f"%{province}%")
-                print(f"   Added filter: province LIKE '%{province}%'")
-            
-            if region:
-                query += " AND LOWER(region) LIKE LOWER(%s)"
-                params.append(f"%{region}%")
-                print(f"   Added filter: region LIKE '%{region}%'")
-            
-            query += " ORDER BY rating DESC LIMIT 10"
-            
-            print(f"\n🔧 SQL QUERY:")
-            print(f"   {query}")
-            print(f"\n📝 PARAMS:")
-            print(f"   {params}")
-            
-            try:
-                actual_query = cur.mogrify(query, params).decode('utf-8')
-                print(f"\n✨ ACTUAL QUERY:")
-                print(f"   {actual_query}")
-            except:
-                pass
+            destination_ids = await slots.destination_ids()
+            results = []
             
-            print(f"\n⚙️  EXECUTING QUERY...")
-            cur.execute(query, params)
-            results = cur.fetchall()
+            if (destination and not destination_ids) or not (destination or province or region):
+                # Nothing the slots pin down exactly: rank names, categories and descriptions in memory
+                free_text = " ".join(filter(None, [destination, province, region])) or tracker.latest_message.get('text', '')
+                results = await search_destinations(free_text, limit=10)
+                log_fields(search="bm25")
             
-            print(f"\n📊 QUERY RESULTS:")
-            print(f"   Found {len(results)} result(s)")
-            
-            if results:
-                print(f"\n📋 RESULTS:")
+            if not results:
+                params = [
+                    destination_ids if destination else None,
+                    f"%{province}%" if province else None,
+                    f"%{region}%" if region else None,
+                ]
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"SQL: {queries.SEARCH_DESTINATIONS!r} params={params}")
+                results = await cached_fetch(queries.SEARCH_DESTINATIONS, *params)
+            log_fields(results=len(results))
+            
+            if logger.isEnabledFor(logging.DEBUG):
                 for idx, result in enumerate(results[:5], 1):
-                    print(f"   {idx}. {result.get('name', 'N/A')} - {result.get('province', 'N/A')} ({result.get('category', 'N/A')})")
-            else:
-                print("   ⚠️  No results found!")
+                    logger.debug(f"Result {idx}: {result.get('name', 'N/A')} - {result.get('province', 'N/A')} ({result.get('category', 'N/A')})")
             
             messages = format_results(results, 'destination')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
-            print("\n✅ ACTION COMPLETED")
-            print("="*80 + "\n")
-            
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố. Vui lòng thử lại sau.")
         except Exception as e:
-            print(f"\n❌ EXCEPTION: {type(e).__name__}")
-            print(f"   Message: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("="*80 + "\n")
-            
-            logger.error(f"Error in ActionSearchDestination: {e}")
+            logger.exception(f"Error in ActionSearchDestination: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm. Vui lòng thử lại.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -224,64 +114,41 @@ class ActionSearchDestinationFuzzy(Action):
     def name(self) -> Text:
         return "action_search_destination_fuzzy"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        print("\nACTION: ActionSearchDestinationFuzzy")
-        
         destination = tracker.get_slot("destination")
         
         if not destination:
             dispatcher.utter_message(text="Bạn muốn tìm địa điểm nào?")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Lỗi kết nối database")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Fuzzy search using PostgreSQL similarity functions
-            # enable extension pg_trgm: CREATE EXTENSION IF NOT EXISTS pg_trgm;
-            query = """
-                SELECT *, 
-                    similarity(LOWER(name), LOWER(%s)) as sim_score
-                FROM destinations 
-                WHERE similarity(LOWER(name), LOWER(%s)) > 0.3
-                ORDER BY sim_score DESC
-                LIMIT 5
-            """
-            
-            cur.execute(query, [destination, destination])
-            results = cur.fetchall()
-            
-            print(f"Fuzzy search for '{destination}': found {len(results)} results")
+            matches = await fuzzy_destinations(destination, limit=5)
+            if matches:
+                log_fields(search="fuzzy")
+                results = [row for row, _ in matches]
+            else:
+                # Nothing within a couple of typos: fall back to ranked free-text search
+                log_fields(search="bm25")
+                results = await search_destinations(destination, limit=5)
+            log_fields(results=len(results))
             
-            if results:
-                for r in results:
-                    print(f"  - {r['name']} (similarity: {r['sim_score']:.2f})")
+            if logger.isEnabledFor(logging.DEBUG):
+                for row, distance in matches:
+                    logger.debug(f"Fuzzy match for {destination!r}: {row['name']} (edit distance: {distance})")
             
             messages = format_results(results, 'destination')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Lỗi kết nối database")
         except Exception as e:
-            print(f"ERROR: {e}")
-            query = "SELECT * FROM destinations WHERE LOWER(name) LIKE LOWER(%s) LIMIT 5"
-            cur.execute(query, [f"%{destination}%"])
-            results = cur.fetchall()
-            messages = format_results(results, 'destination')
-            for message in messages:
-                dispatcher.utter_message(text=message)
-            
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
+            logger.error(f"Error in ActionSearchDestinationFuzzy: {e}")
+            dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm")
         
         return []
 
@@ -292,74 +159,51 @@ class ActionSearchByCity(Action):
     def name(self) -> Text:
         return "action_search_by_city"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        print("\nACTION: ActionSearchByCity")
-        
         province = tracker.get_slot("province")
         
         if not province:
             dispatcher.utter_message(text="Bạn muốn tìm ở thành phố nào?")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Lỗi kết nối database")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT * FROM destinations 
-                WHERE LOWER(province) LIKE LOWER(%s)
-                ORDER BY rating DESC
-            """
+            summary = await cached_fetchrow(queries.CITY_SUMMARY, f"%{province.strip()}%", CITY_TOP_N)
+            total = summary['total'] if summary else 0
+            log_fields(results=total)
             
-            cur.execute(query, [f"%{province}%"])
-            results = cur.fetchall()
-            
-            print(f"Found {len(results)} places in {province}")
-            
-            if not results:
+            if not total:
                 dispatcher.utter_message(text=f"Không tìm thấy địa điểm nào ở {province}")
                 return []
             
-            categories = {}
-            for r in results:
-                cat = r.get('category', 'khác')
-                categories[cat] = categories.get(cat, 0) + 1
+            facets = summary['facets']
+            top = summary['top']
             
-            header = f"Tìm thấy {len(results)} địa điểm ở {province}:\n\n"
-            for cat, count in categories.items():
-                header += f"- {cat.capitalize()}: {count} địa điểm\n"
+            header = f"Tìm thấy {total} địa điểm ở {province}:\n\n"
+            for facet in facets:
+                header += f"- {facet['category'].capitalize()}: {facet['count']} địa điểm\n"
             dispatcher.utter_message(text=header)
 
-            dispatcher.utter_message(text=f"Top {min(5, len(results))} địa điểm được đánh giá cao nhất:")
+            dispatcher.utter_message(text=f"Top {len(top)} địa điểm được đánh giá cao nhất:")
             
-            for idx, item in enumerate(results[:5], 1):
+            for idx, item in enumerate(top, 1):
                 item_msg = f"{idx}. {item['name']}"
                 if item.get('rating'):
                     item_msg += f" ({item['rating']}/5)"
-                item_msg += f"\n   Loại: {item.get('category', 'khác')}\n"
+                item_msg += f"\n   Loại: {item['category']}\n"
                 if item.get('description'):
-                    desc = item['description'][:80] + "..." if len(item['description']) > 80 else item['description']
-                    item_msg += f"   {desc}"
+                    item_msg += f"   {item['description']}"
                 dispatcher.utter_message(text=item_msg)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Lỗi kết nối database")
         except Exception as e:
-            print(f"ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error in ActionSearchByCity: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm")
             
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -367,12 +211,13 @@ class ActionSearchHotel(Action):
     def name(self) -> Text:
         return "action_search_hotel"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
-        star_rating = tracker.get_slot("star_rating")
         price_range = tracker.get_slot("price_range")
         amenities = tracker.get_slot("amenities")
         
@@ -380,48 +225,23 @@ class ActionSearchHotel(Action):
             dispatcher.utter_message(response="utter_ask_destination")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố. Vui lòng thử lại sau.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
+            destination_ids = await slots.destination_ids()
             
-            query = """
-                SELECT h.* FROM hotels h
-                JOIN destinations d ON h.destination_id = d.id
-                WHERE LOWER(d.name) LIKE LOWER(%s)
-            """
-            params = [f"%{destination}%"]
+            price = f"%{slots.price_band or price_range}%" if price_range else None
             
-            if star_rating:
-                rating_num = int(''.join(filter(str.isdigit, str(star_rating))))
-                if rating_num:
-                    query += " AND h.star_rating = %s"
-                    params.append(rating_num)
-            
-            if price_range:
-                query += " AND LOWER(h.price_range) LIKE LOWER(%s)"
-                params.append(f"%{price_range}%")
-            
-            query += " ORDER BY h.star_rating DESC, h.name LIMIT 10"
-            
-            cur.execute(query, params)
-            results = cur.fetchall()
+            results = await cached_fetch(queries.HOTELS, destination_ids, slots.star_rating, price) if destination_ids else []
+            log_fields(results=len(results))
             
             messages = format_results(results, 'hotel')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố. Vui lòng thử lại sau.")
         except Exception as e:
             logger.error(f"Error in ActionSearchHotel: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm khách sạn. Vui lòng thử lại.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -430,10 +250,12 @@ class ActionSearchRestaurant(Action):
     def name(self) -> Text:
         return "action_search_restaurant"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         cuisine_type = tracker.get_slot("cuisine_type")
         price_range = tracker.get_slot("price_range")
@@ -442,46 +264,24 @@ class ActionSearchRestaurant(Action):
             dispatcher.utter_message(response="utter_ask_destination")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT r.* FROM restaurants r
-                JOIN destinations d ON r.destination_id = d.id
-                WHERE LOWER(d.name) LIKE LOWER(%s)
-            """
-            params = [f"%{destination}%"]
+            destination_ids = await slots.destination_ids()
             
-            if cuisine_type:
-                query += " AND LOWER(r.cuisine_type) LIKE LOWER(%s)"
-                params.append(f"%{cuisine_type}%")
+            cuisine = f"%{cuisine_type}%" if cuisine_type else None
+            price = f"%{slots.price_band or price_range}%" if price_range else None
             
-            if price_range:
-                query += " AND LOWER(r.price_range) LIKE LOWER(%s)"
-                params.append(f"%{price_range}%")
-            
-            query += " ORDER BY r.rating DESC LIMIT 10"
-            
-            cur.execute(query, params)
-            results = cur.fetchall()
+            results = await cached_fetch(queries.RESTAURANTS, destination_ids, cuisine, price) if destination_ids else []
+            log_fields(results=len(results))
             
             messages = format_results(results, 'restaurant')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionSearchRestaurant: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm nhà hàng.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -490,10 +290,12 @@ class ActionSearchActivity(Action):
     def name(self) -> Text:
         return "action_search_activity"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         activity_type = tracker.get_slot("activity_type")
         
@@ -501,42 +303,23 @@ class ActionSearchActivity(Action):
             dispatcher.utter_message(response="utter_ask_destination")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT a.* FROM activities a
-                JOIN destinations d ON a.destination_id = d.id
-                WHERE LOWER(d.name) LIKE LOWER(%s)
-            """
-            params = [f"%{destination}%"]
-            
-            if activity_type:
-                query += " AND LOWER(a.type) LIKE LOWER(%s)"
-                params.append(f"%{activity_type}%")
+            destination_ids = await slots.destination_ids()
             
-            query += " ORDER BY a.price ASC LIMIT 10"
+            kind = f"%{activity_type}%" if activity_type else None
             
-            cur.execute(query, params)
-            results = cur.fetchall()
+            results = await cached_fetch(queries.ACTIVITIES, destination_ids, kind) if destination_ids else []
+            log_fields(results=len(results))
             
             messages = format_results(results, 'activity')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionSearchActivity: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm hoạt động.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -545,52 +328,30 @@ class ActionSearchTour(Action):
     def name(self) -> Text:
         return "action_search_tour"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
-        duration = tracker.get_slot("duration")
         price_range = tracker.get_slot("price_range")
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
+            destination_ids = await slots.destination_ids() if destination else None
             
-            query = "SELECT * FROM tours WHERE 1=1"
-            params = []
-            
-            if destination:
-                query += " AND destinations::text LIKE %s"
-                params.append(f"%{destination}%")
-            
-            if duration:
-                days = int(''.join(filter(str.isdigit, str(duration))))
-                if days:
-                    query += " AND duration_days = %s"
-                    params.append(days)
-            
-            query += " ORDER BY price ASC LIMIT 10"
-            
-            cur.execute(query, params)
-            results = cur.fetchall()
+            results = await cached_fetch(queries.TOURS, destination_ids, slots.days)
+            log_fields(results=len(results))
             
             messages = format_results(results, 'tour')
             for message in messages:
                 dispatcher.utter_message(text=message)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionSearchTour: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi tìm kiếm tour.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -599,43 +360,23 @@ class ActionGetWeather(Action):
     def name(self) -> Text:
         return "action_get_weather"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
-        month = tracker.get_slot("month")
         
         if not destination:
             dispatcher.utter_message(response="utter_ask_destination")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT w.*, d.name as destination_name 
-                FROM weather w
-                JOIN destinations d ON w.destination_id = d.id
-                WHERE LOWER(d.name) LIKE LOWER(%s)
-            """
-            params = [f"%{destination}%"]
-            
-            if month:
-                month_num = int(''.join(filter(str.isdigit, str(month))))
-                if month_num and 1 <= month_num <= 12:
-                    query += " AND w.month = %s"
-                    params.append(month_num)
-            
-            query += " ORDER BY w.month"
+            destination_ids = await slots.destination_ids()
             
-            cur.execute(query, params)
-            results = cur.fetchall()
+            results = await cached_fetch(queries.WEATHER, destination_ids, slots.month) if destination_ids else []
+            log_fields(results=len(results))
             
             if not results:
                 dispatcher.utter_message(text=f"Xin lỗi, tôi không có thông tin thời tiết cho {destination}.")
@@ -644,17 +385,14 @@ class ActionGetWeather(Action):
                 for item in results:
                     response += f"📅 Tháng {item['month']}: {item['description']}\n"
                     response += f"   🌡️ Nhiệt độ trung bình: {item['avg_temp']}°C\n\n"
-                
+            
                 dispatcher.utter_message(text=response)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionGetWeather: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi lấy thông tin thời tiết.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -663,71 +401,54 @@ class ActionGetBestTime(Action):
     def name(self) -> Text:
         return "action_get_best_time"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         
         if not destination:
             dispatcher.utter_message(response="utter_best_time_general")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(response="utter_best_time_general")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT w.*, d.name as destination_name, d.region
-                FROM weather w
-                JOIN destinations d ON w.destination_id = d.id
-                WHERE LOWER(d.name) LIKE LOWER(%s)
-                ORDER BY w.month
-            """
-            
-            cur.execute(query, [f"%{destination}%"])
-            results = cur.fetchall()
-            
-            if not results:
+            destination_ids = await slots.destination_ids()
+            await best_months.ensure_loaded()
+            
+            # Best match that has weather data; months are precomputed (migrations/0005_best_months.sql)
+            dest_id, best = None, None
+            for candidate in destination_ids:
+                entry = best_months.get(candidate)
+                if entry is not None and entry.months is not None:
+                    dest_id, best = candidate, entry
+                    break
+            log_fields(results=len(best.months) if best else 0)
+            
+            if best is None:
                 dispatcher.utter_message(response="utter_best_time_general")
+            elif best.months:
+                months_str = ", ".join([f"tháng {m}" for m in best.months])
+                response = f"⭐ Thời điểm tốt nhất đi {best.name}:\n\n"
+                response += f"📅 {months_str}\n\n"
+                response += "Lý do:\n"
+                response += "• Thời tiết dễ chịu (20-30°C)\n"
+                response += "• Ít mưa và bão\n"
+                response += "• Thích hợp cho các hoạt động ngoài trời\n"
+                dispatcher.utter_message(text=response)
             else:
-                dest_name = results[0]['destination_name']
-                region = results[0].get('region', '')
-                
-                good_months = []
+                results = await cached_fetch(queries.WEATHER_BY_MONTH, dest_id)
+                response = f"📅 Thông tin thời tiết {best.name} theo tháng:\n\n"
                 for item in results:
-                    temp = item['avg_temp']
-                    desc = item['description'].lower()
-                    if 20 <= temp <= 30 and 'mưa' not in desc and 'bão' not in desc:
-                        good_months.append(item['month'])
-                
-                if good_months:
-                    months_str = ", ".join([f"tháng {m}" for m in good_months])
-                    response = f"⭐ Thời điểm tốt nhất đi {dest_name}:\n\n"
-                    response += f"📅 {months_str}\n\n"
-                    response += "Lý do:\n"
-                    response += "• Thời tiết dễ chịu (20-30°C)\n"
-                    response += "• Ít mưa và bão\n"
-                    response += "• Thích hợp cho các hoạt động ngoài trời\n"
-                else:
-                    response = f"📅 Thông tin thời tiết {dest_name} theo tháng:\n\n"
-                    for item in results[:6]:
-                        response += f"Tháng {item['month']}: {item['description']}, {item['avg_temp']}°C\n"
-                
+                    response += f"Tháng {item['month']}: {item['description']}, {item['avg_temp']}°C\n"
                 dispatcher.utter_message(text=response)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(response="utter_best_time_general")
         except Exception as e:
             logger.error(f"Error in ActionGetBestTime: {e}")
             dispatcher.utter_message(response="utter_best_time_general")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -736,7 +457,8 @@ class ActionGetTransportation(Action):
     def name(self) -> Text:
         return "action_get_transportation"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
@@ -751,48 +473,51 @@ class ActionGetTransportation(Action):
             dispatcher.utter_message(response="utter_ask_to_location")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(response="utter_transportation_vietnam")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT t.*, d1.name as from_name, d2.name as to_name 
-                FROM transportation t
-                JOIN destinations d1 ON t.from_destination_id = d1.id
-                JOIN destinations d2 ON t.to_destination_id = d2.id
-                WHERE LOWER(d1.name) LIKE LOWER(%s)
-                AND LOWER(d2.name) LIKE LOWER(%s)
-            """
+            from_ids = await resolve_destination_ids(from_location)
+            to_ids = await resolve_destination_ids(to_location)
             
-            cur.execute(query, [f"%{from_location}%", f"%{to_location}%"])
-            results = cur.fetchall()
+            results = await cached_fetch(queries.DIRECT_TRANSPORTATION, from_ids, to_ids) if from_ids and to_ids else []
+            log_fields(results=len(results))
             
             if not results:
-                response = f"Xin lỗi, tôi không tìm thấy thông tin di chuyển từ {from_location} đến {to_location}.\n\n"
-                dispatcher.utter_message(text=response)
-                dispatcher.utter_message(response="utter_transportation_vietnam")
+                # No direct connection: plan a route with transfers over the transportation graph
+                objective = objective_from_text(tracker.latest_message.get('text'))
+                routes = []
+                if from_ids and to_ids:
+                    for goal in [objective] if objective else [FASTEST, CHEAPEST]:
+                        route = await plan_route(from_ids, to_ids, goal)
+                        if route is not None and all(route.legs != r.legs for _, r in routes):
+                            routes.append((goal, route))
+                log_fields(route_legs=[len(r.legs) for _, r in routes])
+
+                if not routes:
+                    response = f"Xin lỗi, tôi không tìm thấy thông tin di chuyển từ {from_location} đến {to_location}.\n\n"
+                    dispatcher.utter_message(text=response)
+                    dispatcher.utter_message(response="utter_transportation_vietnam")
+                else:
+                    first = routes[0][1]
+                    dispatcher.utter_message(
+                        text=f"Không có chuyến thẳng từ {route_graph.name(first.legs[0].source)} "
+                             f"đến {route_graph.name(first.legs[-1].target)}, bạn có thể đi nối chặng:")
+                    titles = {FASTEST: "⚡ Nhanh nhất", CHEAPEST: "💸 Tiết kiệm nhất"}
+                    for goal, route in routes:
+                        dispatcher.utter_message(text=_format_route(route, titles.get(goal, "🗺️ Ít chặng nhất")))
             else:
                 response = f"🚗 Cách di chuyển từ {results[0]['from_name']} đến {results[0]['to_name']}:\n\n"
                 for idx, item in enumerate(results, 1):
-                    icon = {"máy bay": "✈️", "tàu hỏa": "🚄", "xe khách": "🚌", "taxi": "🚕"}.get(item['type'], "🚗")
+                    icon = TRANSPORT_ICONS.get(item['type'], "🚗")
                     response += f"{idx}. {icon} {item['type'].capitalize()}\n"
                     response += f"   ⏱️ Thời gian: ~{item['duration']}\n"
                     response += f"   💰 Giá: {item['price_range']}\n\n"
-                
+            
                 dispatcher.utter_message(text=response)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(response="utter_transportation_vietnam")
         except Exception as e:
             logger.error(f"Error in ActionGetTransportation: {e}")
             dispatcher.utter_message(response="utter_transportation_vietnam")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -801,36 +526,23 @@ class ActionGetReviews(Action):
     def name(self) -> Text:
         return "action_get_reviews"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         
         if not destination:
             dispatcher.utter_message(text="Bạn muốn xem đánh giá về địa điểm nào?")
             return []
         
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
-        
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT r.*, d.name as destination_name 
-                FROM reviews r
-                JOIN destinations d ON r.entity_id = d.id
-                WHERE r.entity_type = 'destination'
-                AND LOWER(d.name) LIKE LOWER(%s)
-                ORDER BY r.created_at DESC
-                LIMIT 5
-            """
+            destination_ids = await slots.destination_ids()
             
-            cur.execute(query, [f"%{destination}%"])
-            results = cur.fetchall()
+            results = await cached_fetch(queries.REVIEWS, destination_ids) if destination_ids else []
+            log_fields(results=len(results))
             
             if not results:
                 dispatcher.utter_message(text=f"Chưa có đánh giá về {destination}.")
@@ -838,7 +550,7 @@ class ActionGetReviews(Action):
                 avg_rating = sum(r['rating'] for r in results) / len(results)
                 response = f"⭐ Đánh giá về {results[0]['destination_name']}:\n"
                 response += f"📊 Điểm trung bình: {avg_rating:.1f}/5 ({len(results)} đánh giá)\n\n"
-                
+            
                 for idx, item in enumerate(results[:3], 1):
                     stars = "⭐" * item['rating']
                     response += f"{idx}. {stars} ({item['rating']}/5)\n"
@@ -846,17 +558,14 @@ class ActionGetReviews(Action):
                         comment = item['comment'][:100] + "..." if len(item['comment']) > 100 else item['comment']
                         response += f"   💬 {comment}\n"
                     response += "\n"
-                
+            
                 dispatcher.utter_message(text=response)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionGetReviews: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi lấy đánh giá.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -865,97 +574,39 @@ class ActionRecommendBudget(Action):
     def name(self) -> Text:
         return "action_recommend_budget"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        print("\n" + "="*60)
-        print("ACTION: ActionRecommendBudget")
-        print("="*60)
-        
+        slots = turn_slots(tracker)
         destination = tracker.get_slot("destination")
         duration = tracker.get_slot("duration")
         traveler_count = tracker.get_slot("traveler_count")
         
-        print(f"Slots: destination={destination}, duration={duration}, traveler_count={traveler_count}")
+        logger.debug("Slots: destination=%r, duration=%r, traveler_count=%r", destination, duration, traveler_count)
         
         if not destination:
-            print("ERROR: No destination provided")
             dispatcher.utter_message(text="Bạn muốn đi đâu để tôi tính ngân sách giúp bạn?")
             return []
         
-        days = 3
-        people = 1
-        
-        if duration:
-            try:
-                days = int(''.join(filter(str.isdigit, str(duration))))
-                print(f"Extracted days: {days}")
-            except Exception as e:
-                print(f"Error parsing duration: {e}")
-                days = 3
-        
-        if traveler_count:
-            try:
-                people = int(''.join(filter(str.isdigit, str(traveler_count))))
-                print(f"Extracted people: {people}")
-            except Exception as e:
-                print(f"Error parsing traveler_count: {e}")
-                people = 1
-        
-        conn = get_db_connection()
-        if not conn:
-            print("ERROR: Database connection failed")
-            dispatcher.utter_message(response="utter_budget_ranges")
-            return []
-        
-        print("Database connected")
+        days = slots.days or 3
+        people = slots.people or 1
         
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-                        
-            query = """
-                SELECT 
-                    d.name as destination_name,
-                    AVG(CASE 
-                        WHEN h.price_range LIKE '%%rẻ%%' THEN 500000
-                        WHEN h.price_range LIKE '%%trung bình%%' THEN 1000000
-                        WHEN h.price_range LIKE '%%cao cấp%%' THEN 2500000
-                        ELSE 1000000
-                    END) as avg_hotel_price,
-                    AVG(CASE 
-                        WHEN r.price_range LIKE '%%rẻ%%' THEN 100000
-                        WHEN r.price_range LIKE '%%trung bình%%' THEN 250000
-                        WHEN r.price_range LIKE '%%cao cấp%%' THEN 500000
-                        ELSE 200000
-                    END) as avg_restaurant_price
-                FROM destinations d
-                LEFT JOIN hotels h ON h.destination_id = d.id
-                LEFT JOIN restaurants r ON r.destination_id = d.id
-                WHERE LOWER(d.name) LIKE %s
-                GROUP BY d.name
-            """
-
-            param = f"%{destination.lower()}%"
-            print(f"Query param: {param}")
-
-            cur.execute(query, (param,))
-
-            result = cur.fetchone()
-            
-            print(f"Query result: {result}")
+            destination_ids = await slots.destination_ids()
+            result = await cached_fetchrow(queries.DESTINATION_COSTS, destination_ids) if destination_ids else None
+            log_fields(results=int(result is not None))
+            logger.debug("Budget row for %r (ids %s): %s", destination, destination_ids, result)
             
             if not result:
-                print("ERROR: No destination found in database")
                 dispatcher.utter_message(text=f"Xin lỗi, tôi không tìm thấy thông tin về {destination}.")
                 return []
             
-            hotel_per_night = result['avg_hotel_price'] or 1000000
-            food_per_day = (result['avg_restaurant_price'] or 200000) * 3
-            activities_per_day = 300000
-            transport = 500000
-            
-            print(f"Prices: hotel={hotel_per_night}, food={food_per_day}, activities={activities_per_day}")
+            hotel_per_night = result['hotel_per_night'] or 1000000
+            food_per_day = (result['meal_price'] or 200000) * 3
+            activities_per_day = result['activity_per_day'] or 300000
+            transport = result['transport_estimate'] or 500000
             
             hotel_total = hotel_per_night * days
             food_total = food_per_day * days
@@ -964,8 +615,6 @@ class ActionRecommendBudget(Action):
             per_person = (hotel_total + food_total + activities_total + transport) / people if people > 1 else (hotel_total + food_total + activities_total + transport)
             total_group = per_person * people
             
-            print(f"Calculated: per_person={per_person}, total_group={total_group}")
-            
             response = f"Ngân sách dự kiến cho chuyến đi {result['destination_name']}:\n\n"
             response += f"Số người: {people}\n"
             response += f"Thời gian: {days} ngày\n\n"
@@ -983,22 +632,11 @@ class ActionRecommendBudget(Action):
             
             dispatcher.utter_message(text=response)
             
-            print("SUCCESS: Budget calculated and sent")
-            print("="*60 + "\n")
-            
+        except DatabaseUnavailable:
+            dispatcher.utter_message(response="utter_budget_ranges")
         except Exception as e:
-            print(f"ERROR: Exception occurred - {type(e).__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("="*60 + "\n")
-            
-            logger.error(f"Error in ActionRecommendBudget: {e}")
+            logger.exception(f"Error in ActionRecommendBudget: {e}")
             dispatcher.utter_message(response="utter_budget_ranges")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
     
@@ -1006,7 +644,8 @@ class ActionCompareDestinations(Action):
     def name(self) -> Text:
         return "action_compare_destinations"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    @log_action
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
@@ -1017,65 +656,67 @@ class ActionCompareDestinations(Action):
             dispatcher.utter_message(text="Bạn muốn so sánh điểm đến nào? Vui lòng cho tôi biết 2 địa điểm.")
             return []
         
-        dest1, dest2 = destinations[0], destinations[1]
-        
-        conn = get_db_connection()
-        if not conn:
-            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
-            return []
+        destinations = destinations[:MAX_COMPARE]
+        month = datetime.now().month
         
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = "SELECT * FROM destinations WHERE LOWER(name) LIKE LOWER(%s)"
-            
-            cur.execute(query, [f"%{dest1}%"])
-            result1 = cur.fetchone()
-            
-            cur.execute(query, [f"%{dest2}%"])
-            result2 = cur.fetchone()
-            
-            if not result1 or not result2:
-                dispatcher.utter_message(text="Xin lỗi, tôi không tìm thấy thông tin về một trong hai điểm đến này.")
+            ids, missing = [], False
+            for dest in destinations:
+                dest_ids = await resolve_destination_ids(dest)
+                if not dest_ids:
+                    missing = True
+                elif dest_ids[0] not in ids:
+                    ids.append(dest_ids[0])
+            
+            results = await cached_fetch(queries.COMPARE_DESTINATIONS, ids, month) if len(ids) >= 2 and not missing else []
+            log_fields(results=len(results))
+            
+            if len(results) < 2:
+                if len(destinations) == 2:
+                    dispatcher.utter_message(text="Xin lỗi, tôi không tìm thấy thông tin về một trong hai điểm đến này.")
+                else:
+                    dispatcher.utter_message(text="Xin lỗi, tôi không tìm thấy thông tin về một số điểm đến này.")
                 return []
             
-            response = f"📊 So sánh {result1['name']} vs {result2['name']}:\n\n"
-            
-            response += f"📍 {result1['name']}:\n"
-            response += f"   • Vị trí: {result1['province']}, {result1['region']}\n"
-            response += f"   • Loại: {result1['category']}\n"
-            response += f"   • Đánh giá: {result1['rating']}/5\n"
-            if result1.get('description'):
-                desc = result1['description'][:100] + "..."
-                response += f"   • Mô tả: {desc}\n"
-            response += "\n"
+            response = f"📊 So sánh {' vs '.join(r['name'] for r in results)}:\n\n"
             
-            response += f"📍 {result2['name']}:\n"
-            response += f"   • Vị trí: {result2['province']}, {result2['region']}\n"
-            response += f"   • Loại: {result2['category']}\n"
-            response += f"   • Đánh giá: {result2['rating']}/5\n"
-            if result2.get('description'):
-                desc = result2['description'][:100] + "..."
-                response += f"   • Mô tả: {desc}\n"
-            response += "\n"
-            
-            if result1['rating'] > result2['rating']:
-                response += f"⭐ {result1['name']} có đánh giá cao hơn\n"
-            elif result2['rating'] > result1['rating']:
-                response += f"⭐ {result2['name']} có đánh giá cao hơn\n"
+            for r in results:
+                response += f"📍 {r['name']}:\n"
+                response += f"   • Vị trí: {r['province']}, {r['region']}\n"
+                response += f"   • Loại: {r['category']}\n"
+                response += f"   • Đánh giá: {r['rating']}/5\n"
+                if r['review_count']:
+                    response += f"   • Khách đánh giá: {r['avg_review']}/5 ({r['review_count']} nhận xét)\n"
+                response += f"   • Khách sạn: {r['hotel_count']}\n"
+                if r['hotel_per_night'] is not None:
+                    per_day = r['hotel_per_night'] + r['meal_price'] * 3 + r['activity_per_day']
+                    response += f"   • Chi phí ước tính: {per_day:,.0f} VNĐ/ngày\n"
+                if r['avg_temp'] is not None:
+                    response += f"   • Thời tiết tháng {month}: {r['avg_temp']}°C, {r['weather']}\n"
+                if r.get('description'):
+                    desc = r['description'] + "..."
+                    response += f"   • Mô tả: {desc}\n"
+                response += "\n"
+            
+            best_rating = max(r['rating'] or 0 for r in results)
+            best = [r for r in results if (r['rating'] or 0) == best_rating]
+            if len(best) == len(results):
+                if len(results) == 2:
+                    response += f"⭐ Cả hai đều có đánh giá tương đương\n"
+                else:
+                    response += f"⭐ Các điểm đến đều có đánh giá tương đương\n"
+            elif len(results) == 2:
+                response += f"⭐ {best[0]['name']} có đánh giá cao hơn\n"
             else:
-                response += f"⭐ Cả hai đều có đánh giá tương đương\n"
+                response += f"⭐ {', '.join(r['name'] for r in best)} có đánh giá cao nhất\n"
             
             dispatcher.utter_message(text=response)
             
+        except DatabaseUnavailable:
+            dispatcher.utter_message(text="Xin lỗi, hiện tại hệ thống đang gặp sự cố.")
         except Exception as e:
             logger.error(f"Error in ActionCompareDestinations: {e}")
             dispatcher.utter_message(text="Đã xảy ra lỗi khi so sánh.")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
         
         return []
 
@@ -1084,6 +725,7 @@ class ActionGetTravelTips(Action):
     def name(self) -> Text:
         return "action_get_travel_tips"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
@@ -1110,6 +752,7 @@ class ActionGetTravelDocuments(Action):
     def name(self) -> Text:
         return "action_get_travel_documents"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
@@ -1122,6 +765,7 @@ class ActionGetSpecialRequirements(Action):
     def name(self) -> Text:
         return "action_get_special_requirements"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
@@ -1171,99 +815,31 @@ class ActionGetPackingList(Action):
     def name(self) -> Text:
         return "action_get_packing_list"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        print("\n" + "="*60)
-        print("ACTION: ActionGetPackingList CALLED")
-        print("="*60)
-
         destination = tracker.get_slot("destination")
         category = tracker.get_slot("category")
         season = tracker.get_slot("season")
 
-        print(f"Slots: destination={destination}, category={category}, season={season}")
-
-        response = "🎒 Danh sách đồ cần mang:\n\n"
-
-        response += "📋 Đồ cơ bản:\n"
-        response += "• Giấy tờ tùy thân (CMND/Passport)\n"
-        response += "• Tiền mặt và thẻ ngân hàng\n"
-        response += "• Điện thoại, sạc, pin dự phòng\n"
-        response += "• Thuốc cá nhân\n\n"
-
-        if category:
-            if "biển" in str(category).lower():
-                response += "🏖️ Đi biển:\n"
-                response += "• Đồ bơi, khăn tắm\n"
-                response += "• Kem chống nắng SPF50+\n"
-                response += "• Mũ, kính râm\n"
-                response += "• Dép đi biển\n"
-                response += "• Túi chống nước cho điện thoại\n\n"
-            elif "núi" in str(category).lower():
-                response += "⛰️ Đi núi:\n"
-                response += "• Giày trekking tốt\n"
-                response += "• Áo khoác ấm (núi lạnh)\n"
-                response += "• Mũ/nón chống nắng\n"
-                response += "• Ba lô chắc chắn\n"
-                response += "• Đèn pin/headlamp\n\n"
-
-        if season:
-            if "đông" in str(season).lower() or "lạnh" in str(season).lower():
-                response += "❄️ Mùa đông:\n"
-                response += "• Áo khoác dày, áo len\n"
-                response += "• Khăn choàng, găng tay\n"
-                response += "• Quần dài ấm\n\n"
-            elif "hè" in str(season).lower() or "nóng" in str(season).lower():
-                response += "☀️ Mùa hè:\n"
-                response += "• Quần áo mỏng, thoáng mát\n"
-                response += "• Kem chống nắng\n"
-                response += "• Mũ/nón rộng vành\n\n"
-
-        dispatcher.utter_message(text=response)
-
-        print("✅ ActionGetPackingList executed successfully")
-        print("="*60 + "\n")
+        logger.debug("Slots: destination=%r, category=%r, season=%r", destination, category, season)
 
+        dispatcher.utter_message(text=knowledge.answer("packing_list", category=category, season=season))
         return []
 
 class ActionGetLocalCulture(Action):
     def name(self) -> Text:
         return "action_get_local_culture"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         destination = tracker.get_slot("destination")
-        
-        response = "🏛️ Văn hóa và phong tục Việt Nam:\n\n"
-        
-        response += "👋 Lời chào:\n"
-        response += "• Chào hỏi lịch sự khi gặp người\n"
-        response += "• Cúi đầu nhẹ thể hiện tôn trọng\n\n"
-        
-        response += "🙏 Khi vào chùa/đền:\n"
-        response += "• Mặc quần áo kín đáo\n"
-        response += "• Cởi giày trước khi vào\n"
-        response += "• Không ồn ào, giữ yên lặng\n"
-        response += "• Xin phép trước khi chụp ảnh\n\n"
-        
-        response += "🍜 Ăn uống:\n"
-        response += "• Dùng đũa khi ăn\n"
-        response += "• Có thể húp phở ầm ĩ (bình thường)\n"
-        response += "• Tip không bắt buộc nhưng được hoan nghênh\n\n"
-        
-        response += "🎁 Quà lưu niệm:\n"
-        response += "• Thương lượng giá ở chợ\n"
-        response += "• Mua tại cửa hàng cố định có giá rõ ràng\n"
-        response += "• Đặc sản: cà phê, trà, tranh, áo dài\n\n"
-        
-        if destination:
-            response += f"📍 {destination} có các lễ hội và đặc sản riêng, bạn có thể hỏi người dân địa phương!"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("local_culture", destination))
         return []
 
 
@@ -1271,6 +847,7 @@ class ActionGetPhotographySpots(Action):
     def name(self) -> Text:
         return "action_get_photography_spots"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
@@ -1281,42 +858,7 @@ class ActionGetPhotographySpots(Action):
             dispatcher.utter_message(response="utter_top_beaches")
             return []
         
-        response = f"📸 Địa điểm chụp ảnh đẹp:\n\n"
-        response += "💡 Tips chụp ảnh:\n"
-        response += "• Golden hour: 6-8h sáng, 16-18h chiều\n"
-        response += "• Tránh chụp giữa trưa (ánh sáng gắt)\n"
-        response += "• Dậy sớm để tránh đông người\n"
-        response += "• Xin phép trước khi chụp người dân\n\n"
-        
-        dest_lower = destination.lower()
-        if "đà nẵng" in dest_lower:
-            response += "📍 Đà Nẵng:\n"
-            response += "• Cầu Vàng (Golden Bridge)\n"
-            response += "• Bãi biển Mỹ Khê lúc hoàng hôn\n"
-            response += "• Bán đảo Sơn Trà\n"
-            response += "• Cầu Rồng (tối thứ 7, CN)\n"
-        elif "hội an" in dest_lower:
-            response += "📍 Hội An:\n"
-            response += "• Phố cổ về đêm (đèn lồng)\n"
-            response += "• Cầu Nhật Bản\n"
-            response += "• Bến Thuyền An Hội\n"
-            response += "• Ruộng rau Trà Quế\n"
-        elif "đà lạt" in dest_lower:
-            response += "📍 Đà Lạt:\n"
-            response += "• Đồi chè Cầu Đất\n"
-            response += "• Hồ Tuyền Lâm\n"
-            response += "• Ga Đà Lạt\n"
-            response += "• Đường Hầm Đất Sét\n"
-        elif "sapa" in dest_lower:
-            response += "📍 Sapa:\n"
-            response += "• Ruộng bậc thang (mùa nước đổ)\n"
-            response += "• Đỉnh Fansipan\n"
-            response += "• Bản Cát Cát\n"
-            response += "• Thung lũng Mường Hoa\n"
-        else:
-            response += f"📍 Hãy hỏi người dân địa phương về các điểm chụp ảnh đẹp tại {destination}!"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("photography_spots", destination))
         return []
 
 
@@ -1324,50 +866,13 @@ class ActionGetNightlife(Action):
     def name(self) -> Text:
         return "action_get_nightlife"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         destination = tracker.get_slot("destination")
-        
-        response = "🌃 Hoạt động về đêm:\n\n"
-        
-        dest_lower = str(destination).lower() if destination else ""
-        
-        if "sài gòn" in dest_lower or "hcm" in dest_lower:
-            response += "📍 Sài Gòn:\n"
-            response += "• Phố đi bộ Nguyễn Huệ\n"
-            response += "• Bùi Viện (backpacker street)\n"
-            response += "• Rooftop bars: Chill Skybar, Social Club\n"
-            response += "• Chợ đêm Bến Thành\n"
-        elif "hà nội" in dest_lower:
-            response += "📍 Hà Nội:\n"
-            response += "• Phố cổ: Tạ Hiện, Mã Mây\n"
-            response += "• Hồ Gươm về đêm\n"
-            response += "• Chợ đêm cuối tuần (phố cổ)\n"
-            response += "• Bia hơi Tạ Hiện\n"
-        elif "đà nẵng" in dest_lower:
-            response += "📍 Đà Nẵng:\n"
-            response += "• Chợ đêm Sơn Trà\n"
-            response += "• Cầu Rồng phun lửa (T7, CN 21h)\n"
-            response += "• Sky36 Bar (tầng 36 Novotel)\n"
-            response += "• Đi dạo bờ biển Mỹ Khê\n"
-        elif "nha trang" in dest_lower:
-            response += "📍 Nha Trang:\n"
-            response += "• Chợ đêm Nha Trang\n"
-            response += "• Sailing Club (beach bar)\n"
-            response += "• Louisiane Brewhouse\n"
-            response += "• Đi dạo công viên biển\n"
-        else:
-            response += "🎭 Hoạt động về đêm phổ biến:\n"
-            response += "• Chợ đêm địa phương\n"
-            response += "• Phố đi bộ\n"
-            response += "• Quán bia, cafe\n"
-            response += "• Ăn vặt đường phố\n"
-        
-        response += "\n⚠️ Lưu ý: Giữ tài sản cẩn thận, về sớm nếu đi một mình"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("nightlife", destination))
         return []
 
 
@@ -1375,42 +880,13 @@ class ActionGetFamilyActivities(Action):
     def name(self) -> Text:
         return "action_get_family_activities"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         destination = tracker.get_slot("destination")
-        
-        response = "👨‍👩‍👧‍👦 Hoạt động cho gia đình:\n\n"
-        
-        response += "🎯 Gợi ý chung:\n"
-        response += "• Công viên nước, công viên giải trí\n"
-        response += "• Bảo tàng tương tác cho trẻ em\n"
-        response += "• Tham quan vườn thú, thủy cung\n"
-        response += "• Hoạt động ngoài trời nhẹ nhàng\n"
-        response += "• Ăn tối ở nhà hàng thân thiện trẻ em\n\n"
-        
-        if destination:
-            dest_lower = str(destination).lower()
-            if "đà nẵng" in dest_lower:
-                response += "📍 Đà Nẵng:\n"
-                response += "• Asia Park (công viên giải trí)\n"
-                response += "• Bãi biển Mỹ Khê (an toàn)\n"
-                response += "• Bảo tàng Chăm\n"
-            elif "nha trang" in dest_lower:
-                response += "📍 Nha Trang:\n"
-                response += "• Vinpearl Land\n"
-                response += "• Thủy cung Trí Nguyên\n"
-                response += "• Tắm biển\n"
-            elif "sài gòn" in dest_lower or "hcm" in dest_lower:
-                response += "📍 Sài Gòn:\n"
-                response += "• Thảo Cầm Viên (Sở thú)\n"
-                response += "• Dam Sen Park\n"
-                response += "• KizCiti (thành phố trẻ em)\n"
-        
-        response += "\n💡 Tip: Lên lịch nghỉ ngơi giữa ngày cho trẻ"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("family_activities", destination))
         return []
 
 
@@ -1418,52 +894,13 @@ class ActionGetAdventureActivities(Action):
     def name(self) -> Text:
         return "action_get_adventure_activities"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         destination = tracker.get_slot("destination")
-        
-        response = "🏔️ Hoạt động mạo hiểm:\n\n"
-        
-        if destination:
-            dest_lower = str(destination).lower()
-            if "đà lạt" in dest_lower:
-                response += "📍 Đà Lạt:\n"
-                response += "• Canyoning thác Datanla\n"
-                response += "• Đi xe ATV\n"
-                response += "• Trekking Langbiang\n"
-                response += "• Zipline rừng thông\n"
-            elif "sapa" in dest_lower:
-                response += "📍 Sapa:\n"
-                response += "• Chinh phục Fansipan\n"
-                response += "• Trekking ruộng bậc thang\n"
-                response += "• Camping qua đêm\n"
-            elif "nha trang" in dest_lower:
-                response += "📍 Nha Trang:\n"
-                response += "• Lặn biển, snorkeling\n"
-                response += "• Dù lượn (parasailing)\n"
-                response += "• Jet ski\n"
-                response += "• Flyboard\n"
-            elif "mũi né" in dest_lower:
-                response += "📍 Mũi Né:\n"
-                response += "• Lướt ván diều (kitesurfing)\n"
-                response += "• Đi xe jeep cồn cát\n"
-                response += "• Trượt cát (sandboarding)\n"
-            else:
-                response += f"📍 {destination}:\n"
-                response += "Hỏi người dân địa phương về các hoạt động mạo hiểm\n"
-        else:
-            response += "🎯 Hoạt động mạo hiểm phổ biến:\n"
-            response += "• Trekking, leo núi\n"
-            response += "• Lặn biển, snorkeling\n"
-            response += "• Dù lượn, nhảy bungee\n"
-            response += "• Rafting, canyoning\n"
-            response += "• Zipline\n"
-        
-        response += "\n⚠️ Lưu ý: Chọn công ty uy tín, kiểm tra thiết bị an toàn"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("adventure_activities", destination))
         return []
 
 
@@ -1471,29 +908,13 @@ class ActionGetRomanticSpots(Action):
     def name(self) -> Text:
         return "action_get_romantic_spots"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         destination = tracker.get_slot("destination")
-        
-        response = "💑 Địa điểm lãng mạn:\n\n"
-        
-        response += "✨ Gợi ý chung:\n"
-        response += "• Ngắm hoàng hôn/bình minh cùng nhau\n"
-        response += "• Dinner trên bãi biển\n"
-        response += "• Spa couple\n"
-        response += "• Đi dạo buổi tối\n"
-        response += "• Villa/bungalow riêng tư\n\n"
-        
-        if destination:
-            response += f"📍 Gợi ý cho {destination}:\n"
-            response += "• Resort có private beach\n"
-            response += "• Nhà hàng view đẹp\n"
-            response += "• Điểm ngắm cảnh lãng mạn\n"
-            response += "• Hoạt động riêng tư cho 2 người\n"
-        
-        dispatcher.utter_message(text=response)
+        dispatcher.utter_message(text=knowledge.answer("romantic_spots", destination))
         return []
 
 
@@ -1501,6 +922,7 @@ class ActionGetFoodTour(Action):
     def name(self) -> Text:
         return "action_get_food_tour"
 
+    @log_action
     def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
@@ -0,0 +1,46 @@
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .db import fetch
+from .lazy_store import LazyStore
+
+logger = logging.getLogger(__name__)
+
+
+class BestTime(NamedTuple):
+    name: str
+    # None: no weather data for this destination; (): data, but no month qualifies
+    months: Optional[Tuple[int, ...]]
+
+
+class BestMonthsStore(LazyStore):
+    """In-memory copy of destinations.best_months (maintained by migrations/0005_best_months.sql)"""
+
+    table = 'destinations'
+
+    def __init__(self):
+        super().__init__()
+        self._entries: Dict[int, BestTime] = {}
+
+    async def _load_all(self):
+        rows = await fetch("SELECT id, name, best_months FROM destinations")
+        self._entries = {r['id']: self._entry(r) for r in rows}
+        logger.info(f"Loaded best months for {len(rows)} destinations")
+
+    async def _load_ids(self, ids: List[int]):
+        rows = await fetch("SELECT id, name, best_months FROM destinations WHERE id = ANY($1::int[])", ids)
+        for dest_id in ids:
+            self._entries.pop(dest_id, None)
+        for r in rows:
+            self._entries[r['id']] = self._entry(r)
+
+    @staticmethod
+    def _entry(row) -> BestTime:
+        months = row['best_months']
+        return BestTime(row['name'], tuple(months) if months is not None else None)
+
+    def get(self, dest_id: int) -> Optional[BestTime]:
+        return self._entries.get(dest_id)
+
+
+best_months = BestMonthsStore().watch()
@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from .db import Statement, fetch, fetchrow, listener, on_table_change
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = int(os.getenv('ACTION_CACHE_MAX_ENTRIES', 1024))
+# Upper bound on staleness if a notification is ever missed
+CACHE_TTL = float(os.getenv('ACTION_CACHE_TTL', 600))
+
+_WHITESPACE = re.compile(r"\s+")
+_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cache_key(query, args) -> Tuple:
+    """Cache key from the query shape (whitespace-insensitive, or a Statement's name) and its parameters"""
+    if isinstance(query, Statement):
+        return (query.name, _freeze(args))
+    return (_WHITESPACE.sub(" ", query).strip(), _freeze(args))
+
+
+# Derived tables (kept up to date by triggers or the backend) change whenever their sources do
+DERIVED_TABLES = {
+    'destination_costs': {'destinations', 'hotels', 'restaurants', 'activities', 'transportation'},
+    'tour_destinations': {'tours', 'destinations'},
+}
+
+
+def query_tables(query) -> FrozenSet[str]:
+    """Tables a query reads from, used to tag its cache entry for invalidation"""
+    tables = {t.lower() for t in _TABLES.findall(str(query))}
+    for table in list(tables):
+        tables.update(DERIVED_TABLES.get(table, ()))
+    return frozenset(tables)
+
+
+class QueryCache:
+    """Bounded LRU cache with a per-entry TTL, invalidated by table"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, FrozenSet[str], Any]]" = OrderedDict()
+        # Bumped by every invalidation, so results fetched across one are not cached
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'stale_results': 0}
+
+    def get(self, key) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._stats['misses'] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self._stats['hits'] += 1
+        return True, entry[2]
+
+    def generation(self, tables: FrozenSet[str]) -> Tuple:
+        """Token that changes whenever any of ``tables`` is invalidated; take it before fetching"""
+        return (self._epoch, tuple(self._generations.get(t, 0) for t in sorted(tables)))
+
+    def set(self, key, value, tables: FrozenSet[str], generation: Optional[Tuple] = None):
+        """Cache ``value``, unless ``tables`` were invalidated since ``generation`` was taken"""
+        if generation is not None and generation != self.generation(tables):
+            self._stats['stale_results'] += 1
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, tables, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def invalidate(self, table: Optional[str] = None):
+        """Drop entries reading from ``table``, or everything when table is None"""
+        if table is None:
+            self._epoch += 1
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [k for k, entry in self._entries.items() if table in entry[1]]
+            for k in stale:
+                del self._entries[k]
+            dropped = len(stale)
+        self._stats['invalidations'] += dropped
+        if dropped:
+            logger.debug(f"Invalidated {dropped} cached queries for {table or 'all tables'}")
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['size'] = len(self._entries)
+        stats['max_entries'] = self.max_entries
+        return stats
+
+
+query_cache = QueryCache(CACHE_MAX_ENTRIES, CACHE_TTL)
+on_table_change(lambda table, payload: query_cache.invalidate(table))
+
+
+async def cached_fetch(query: Union[str, Statement], *args) -> List[Dict[str, Any]]:
+    """``fetch`` through the query cache; callers get their own copies of the rows"""
+    await listener.ensure_started()
+    key = cache_key(query, args)
+    hit, rows = query_cache.get(key)
+    if not hit:
+        tables = query_tables(query)
+        generation = query_cache.generation(tables)
+        rows = await fetch(query, *args)
+        query_cache.set(key, rows, tables, generation)
+    return [dict(r) for r in rows]
+
+
+async def cached_fetchrow(query: Union[str, Statement], *args) -> Optional[Dict[str, Any]]:
+    await listener.ensure_started()
+    key = cache_key(query, args)
+    hit, row = query_cache.get(key)
+    if not hit:
+        tables = query_tables(query)
+        generation = query_cache.generation(tables)
+        row = await fetchrow(query, *args)
+        query_cache.set(key, row, tables, generation)
+    return dict(row) if row is not None else None
+
+
+def get_cache_stats() -> dict:
+    return query_cache.stats()
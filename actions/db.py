@@ -0,0 +1,311 @@
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import asyncpg
+
+from .metrics import observe_query
+from .text_utils import parse_text_list
+
+logger = logging.getLogger(__name__)
+
+_PARAMETER = re.compile(r"\$(\d+)")
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'travel_chatbot'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', 'test1234'),
+    'port': int(os.getenv('DB_PORT', 5432)),
+}
+
+POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+# Idle connections older than this are pinged before being handed out
+POOL_VALIDATE_AFTER = float(os.getenv('DB_POOL_VALIDATE_AFTER', 30))
+POOL_CHECKOUT_TIMEOUT = float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 5))
+
+# List-valued columns stored loosely (TEXT[], JSON text or comma separated) across tables;
+# decoded once here so renderers and actions always see a Python list
+LIST_COLUMNS = ('amenities', 'destinations')
+
+# Channel the backend notifies on after every catalog write (see backend/app/services/notify.py)
+CATALOG_CHANNEL = 'catalog_changed'
+LISTEN_RETRY_INTERVAL = float(os.getenv('DB_LISTEN_RETRY_INTERVAL', 10))
+
+# Errors that mean the connection itself is unusable, not the statement
+CONNECTION_ERRORS = (
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    ConnectionError,
+    OSError,
+)
+
+
+class DatabaseUnavailable(Exception):
+    """Raised when no usable connection can be obtained from the pool"""
+
+
+class Statement:
+    """A fixed query shape, prepared once per pooled connection"""
+
+    __slots__ = ('name', 'sql', 'params')
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.params = max((int(n) for n in _PARAMETER.findall(sql)), default=0)
+
+    def __str__(self):
+        return self.sql
+
+    def __repr__(self):
+        return f"Statement({self.name!r})"
+
+
+# Every registered shape; prepared on each new pooled connection (see ConnectionPool._init_connection)
+STATEMENTS: Dict[str, Statement] = {}
+
+
+def statement(name: str, sql: str) -> Statement:
+    """Register a named query shape; parameters that may be NULL disable their filter in the SQL"""
+    existing = STATEMENTS.get(name)
+    if existing is not None and existing.sql != sql:
+        raise ValueError(f"Statement {name!r} is already registered with different SQL")
+    STATEMENTS[name] = stmt = Statement(name, sql)
+    return stmt
+
+
+class ConnectionPool:
+    """Process-wide asyncpg pool with validation on checkout and pool statistics"""
+
+    def __init__(self, min_size: int, max_size: int, validate_after: float, **config):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.validate_after = validate_after
+        self._config = config
+        self._pool = None
+        self._lock = asyncio.Lock()
+        # Keyed by backend pid: asyncpg hands out a fresh proxy object on every acquire
+        self._last_used = {}
+        self._stats = {
+            'checkouts': 0,
+            'in_use': 0,
+            'recycled': 0,
+            'validation_failures': 0,
+            'connect_errors': 0,
+            'wait_seconds_total': 0.0,
+            'statements_prepared': 0,
+        }
+
+    async def _ensure_pool(self):
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        init=self._init_connection,
+                        setup=self._validate,
+                        **self._config,
+                    )
+        return self._pool
+
+    async def _init_connection(self, conn):
+        # json/jsonb values (e.g. json_agg results) arrive as Python objects
+        for type_name in ('json', 'jsonb'):
+            await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+        # Prepare every registered shape into the connection's statement cache now: later fetches
+        # of the same SQL only bind and execute. Run with NULL parameters: optional filters are
+        # switched off and required ones match nothing, so each costs a few rows at most.
+        for stmt in list(STATEMENTS.values()):
+            try:
+                await conn.fetch(stmt.sql, *[None] * stmt.params)
+                self._stats['statements_prepared'] += 1
+            except asyncpg.PostgresError as e:
+                # e.g. a migration not applied yet: prepared lazily, and fails, on first use
+                logger.warning(f"Could not prepare statement {stmt.name}: {e}")
+
+    async def _validate(self, conn):
+        """Pool setup hook: ping connections that have been idle for a while"""
+        last_used = self._last_used.get(conn.get_server_pid())
+        if last_used is None or time.monotonic() - last_used < self.validate_after:
+            return
+        await conn.execute("SELECT 1")
+
+    @asynccontextmanager
+    async def acquire(self):
+        started = time.monotonic()
+        try:
+            pool = await self._ensure_pool()
+            conn = await self._checkout(pool)
+        except (asyncio.TimeoutError, *CONNECTION_ERRORS) as e:
+            self._stats['connect_errors'] += 1
+            raise DatabaseUnavailable(str(e) or type(e).__name__) from e
+
+        self._stats['checkouts'] += 1
+        self._stats['in_use'] += 1
+        self._stats['wait_seconds_total'] += time.monotonic() - started
+        broken = False
+        try:
+            yield conn
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self._stats['in_use'] -= 1
+            await self._release(pool, conn, broken)
+
+    async def _checkout(self, pool):
+        for _ in range(self.max_size):
+            try:
+                return await pool.acquire(timeout=POOL_CHECKOUT_TIMEOUT)
+            except CONNECTION_ERRORS as e:
+                # A failed setup ping: asyncpg already dropped that connection, try the next one
+                self._stats['validation_failures'] += 1
+                self._stats['recycled'] += 1
+                logger.warning(f"Discarded stale pooled connection: {e}")
+        return await pool.acquire(timeout=POOL_CHECKOUT_TIMEOUT)
+
+    async def _release(self, pool, conn, broken: bool):
+        if broken or conn.is_closed():
+            self._stats['recycled'] += 1
+            self._last_used.pop(conn.get_server_pid(), None)
+            conn.terminate()
+        else:
+            self._last_used[conn.get_server_pid()] = time.monotonic()
+        await pool.release(conn)
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats['min_size'] = self.min_size
+        stats['max_size'] = self.max_size
+        stats['open'] = self._pool.get_size() if self._pool else 0
+        stats['idle'] = self._pool.get_idle_size() if self._pool else 0
+        return stats
+
+    async def close(self):
+        async with self._lock:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+            self._last_used.clear()
+
+
+class ChangeListener:
+    """LISTENs for catalog change notifications on a dedicated connection.
+
+    Callbacks receive ``(table, payload)``. ``table`` is None when notifications
+    may have been missed (connection lost), meaning "assume everything changed".
+    """
+
+    def __init__(self, channel: str, **config):
+        self.channel = channel
+        self._config = config
+        self._conn = None
+        self._callbacks: List[Callable[[Optional[str], dict], None]] = []
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    def subscribe(self, callback: Callable[[Optional[str], dict], None]):
+        self._callbacks.append(callback)
+
+    async def ensure_started(self):
+        if self.connected or time.monotonic() < self._retry_at:
+            return
+        async with self._lock:
+            if self.connected or time.monotonic() < self._retry_at:
+                return
+            try:
+                conn = await asyncpg.connect(**self._config)
+                await conn.add_listener(self.channel, self._on_notify)
+                conn.add_termination_listener(self._on_terminate)
+            except CONNECTION_ERRORS as e:
+                self._retry_at = time.monotonic() + LISTEN_RETRY_INTERVAL
+                logger.warning(f"Could not LISTEN on {self.channel}: {e}")
+                return
+            self._conn = conn
+            # Anything cached before we were listening may already be stale
+            self._dispatch(None, {})
+            logger.info(f"Listening for catalog changes on {self.channel}")
+
+    def _on_notify(self, conn, pid, channel, payload):
+        try:
+            data = json.loads(payload) if payload else {}
+        except ValueError:
+            data = {}
+        self._dispatch(data.get('table'), data)
+
+    def _on_terminate(self, conn):
+        logger.warning(f"Lost LISTEN connection on {self.channel}")
+        self._conn = None
+        self._dispatch(None, {})
+
+    def _dispatch(self, table: Optional[str], payload: dict):
+        for callback in self._callbacks:
+            try:
+                callback(table, payload)
+            except Exception as e:
+                logger.error(f"Change callback failed: {e}")
+
+    async def close(self):
+        async with self._lock:
+            if self._conn is not None:
+                conn, self._conn = self._conn, None
+                await conn.close()
+
+
+pool = ConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, POOL_VALIDATE_AFTER, **DB_CONFIG)
+listener = ChangeListener(CATALOG_CHANNEL, **DB_CONFIG)
+
+
+def get_db_connection():
+    """Borrow a pooled connection: ``async with get_db_connection() as conn``"""
+    return pool.acquire()
+
+
+def to_dict(record) -> Dict[str, Any]:
+    row = dict(record)
+    for column in LIST_COLUMNS:
+        if column in row:
+            row[column] = parse_text_list(row[column])
+    return row
+
+
+async def fetch(query: Union[str, Statement], *args) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(str(query), *args)
+    fetched = time.perf_counter()
+    result = [to_dict(r) for r in rows]
+    observe_query(fetched - started, time.perf_counter() - fetched, len(result))
+    return result
+
+
+async def fetchrow(query: Union[str, Statement], *args) -> Optional[Dict[str, Any]]:
+    started = time.perf_counter()
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(str(query), *args)
+    fetched = time.perf_counter()
+    result = to_dict(row) if row is not None else None
+    observe_query(fetched - started, time.perf_counter() - fetched, int(result is not None))
+    return result
+
+
+def on_table_change(callback: Callable[[Optional[str], dict], None]):
+    """Register ``callback(table, payload)`` for catalog change notifications"""
+    listener.subscribe(callback)
+    return callback
+
+
+def get_pool_stats() -> dict:
+    return pool.stats()
@@ -0,0 +1,185 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+import yaml
+
+from .db import fetch, listener, on_table_change
+from .text_utils import normalize_text, fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+SYNONYMS_FILE = os.path.join(DATA_DIR, 'synonyms.yml')
+LOOKUP_TABLES_FILE = os.path.join(DATA_DIR, 'lookup_tables.yml')
+
+# Safety net for writes that bypass the backend (no NOTIFY): reload at least this often
+REFRESH_INTERVAL = float(os.getenv('DESTINATION_INDEX_TTL', 300))
+MEMO_SIZE = 4096
+# Short aliases like "nt" or "sg" only match exactly, never as substrings
+MIN_SUBSTRING_LENGTH = 3
+
+
+def _examples(block) -> List[str]:
+    """Parse a Rasa ``examples: |`` block into its list items"""
+    items = []
+    for line in (block or "").splitlines():
+        line = line.strip()
+        if line.startswith("- "):
+            items.append(line[2:].strip())
+    return items
+
+
+def load_alias_groups(synonyms_file: str = SYNONYMS_FILE,
+                      lookup_file: str = LOOKUP_TABLES_FILE) -> List[Set[str]]:
+    """Groups of normalized names that refer to the same place.
+
+    Only synonyms whose canonical value appears in the destination or province
+    lookup tables are kept, so "biển" or "khách sạn" never become place aliases.
+    """
+    places = set()
+    try:
+        with open(lookup_file, encoding='utf-8') as f:
+            lookups = yaml.safe_load(f) or {}
+        for entry in lookups.get('nlu', []):
+            if entry.get('lookup') in ('destination', 'province'):
+                places.update(normalize_text(x) for x in _examples(entry.get('examples')))
+    except OSError as e:
+        logger.warning(f"Could not read lookup tables: {e}")
+
+    groups = []
+    try:
+        with open(synonyms_file, encoding='utf-8') as f:
+            synonyms = yaml.safe_load(f) or {}
+        for entry in synonyms.get('nlu', []):
+            canonical = normalize_text(entry.get('synonym'))
+            if canonical not in places:
+                continue
+            group = {canonical}
+            group.update(normalize_text(x) for x in _examples(entry.get('examples')))
+            group.discard("")
+            groups.append(group)
+    except OSError as e:
+        logger.warning(f"Could not read synonyms: {e}")
+    return groups
+
+
+def _keys(text: str) -> Tuple[str, ...]:
+    key = normalize_text(text)
+    folded = fold_diacritics(key)
+    return (key,) if folded == key else (key, folded)
+
+
+class DestinationResolver:
+    """Normalized in-memory index from destination slot text to destination ids"""
+
+    def __init__(self, alias_groups: Iterable[Set[str]] = ()):
+        self._aliases: Dict[str, Tuple[str, ...]] = {}
+        for group in alias_groups:
+            members = tuple(sorted(group))
+            for alias in group:
+                for key in _keys(alias):
+                    self._aliases[key] = members
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_province: Dict[str, List[int]] = {}
+        self._names: List[Tuple[str, int]] = []
+        self._memo: Dict[str, Tuple[int, ...]] = {}
+        self._loaded_at = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self, rows: Iterable[dict]):
+        """(Re)build the index from ``destinations`` rows with id, name and province"""
+        by_name, by_province, names = {}, {}, []
+        for row in rows:
+            for key in _keys(row['name']):
+                by_name.setdefault(key, []).append(row['id'])
+                names.append((key, row['id']))
+            if row.get('province'):
+                for key in _keys(row['province']):
+                    by_province.setdefault(key, []).append(row['id'])
+        self._by_name, self._by_province, self._names = by_name, by_province, names
+        self._memo = {}
+        self._loaded_at = time.monotonic()
+
+    async def refresh(self):
+        rows = await fetch("SELECT id, name, province FROM destinations ORDER BY rating DESC NULLS LAST, id")
+        self.load(rows)
+        logger.info(f"Destination resolver loaded {len(rows)} destinations")
+
+    async def ensure_loaded(self):
+        if self.loaded and time.monotonic() - self._loaded_at < REFRESH_INTERVAL:
+            return
+        async with self._lock:
+            if not self.loaded or time.monotonic() - self._loaded_at >= REFRESH_INTERVAL:
+                await self.refresh()
+
+    def invalidate(self):
+        """Force a reload on the next lookup (e.g. after the destinations table changed)"""
+        self._loaded_at = None
+
+    def resolve(self, text) -> Tuple[int, ...]:
+        """Destination ids for slot text: exact name, alias, province, then substring match"""
+        key = normalize_text(text)
+        if not key:
+            return ()
+        if key in self._memo:
+            return self._memo[key]
+
+        candidates = []
+        for k in _keys(key):
+            candidates.append(k)
+            candidates.extend(self._aliases.get(k, ()))
+
+        ids = self._lookup(candidates, self._by_name)
+        if not ids:
+            ids = self._lookup(candidates, self._by_province)
+        if not ids:
+            # Same semantics as the old LOWER(name) LIKE '%x%' filter, without the table scan
+            seen = set()
+            for candidate in candidates:
+                if len(candidate) < MIN_SUBSTRING_LENGTH:
+                    continue
+                for name, dest_id in self._names:
+                    if candidate in name and dest_id not in seen:
+                        seen.add(dest_id)
+                        ids.append(dest_id)
+
+        result = tuple(ids)
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+    @staticmethod
+    def _lookup(candidates, index) -> List[int]:
+        ids = []
+        for candidate in candidates:
+            for dest_id in index.get(candidate, ()):
+                if dest_id not in ids:
+                    ids.append(dest_id)
+        return ids
+
+
+ALIAS_GROUPS = load_alias_groups()
+resolver = DestinationResolver(ALIAS_GROUPS)
+
+
+@on_table_change
+def _on_destinations_change(table, payload):
+    if table in (None, 'destinations'):
+        resolver.invalidate()
+
+
+async def resolve_destination_ids(text) -> List[int]:
+    """Resolve a destination slot value to destination ids (best match first)"""
+    if not text:
+        return []
+    await listener.ensure_started()
+    await resolver.ensure_loaded()
+    return list(resolver.resolve(text))
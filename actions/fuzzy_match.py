@@ -0,0 +1,184 @@
+import time
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .db import fetch, listener
+from .destination_resolver import ALIAS_GROUPS
+from .lazy_store import LazyStore
+from .text_utils import normalize_text, fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+# Largest edit distance tolerated; keys up to SHORT_KEY_LENGTH characters allow one edit,
+# keys shorter than MIN_FUZZY_LENGTH only match exactly
+MAX_DISTANCE = 2
+SHORT_KEY_LENGTH = 5
+MIN_FUZZY_LENGTH = 3
+# Deletes are generated over this many leading characters only (SymSpell prefix indexing):
+# longer names are still verified with their full edit distance
+PREFIX_LENGTH = 10
+
+
+def fuzzy_key(text) -> str:
+    """Diacritic- and case-insensitive key ("Đà  Lạt" -> "da lat")"""
+    return fold_diacritics(normalize_text(text))
+
+
+def max_distance(key: str) -> int:
+    if len(key) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(key) <= SHORT_KEY_LENGTH else MAX_DISTANCE
+
+
+def _deletes(key: str, distance: int) -> Set[str]:
+    """``key`` (prefix) with every combination of up to ``distance`` characters removed"""
+    result = {key[:PREFIX_LENGTH]}
+    frontier = set(result)
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier if len(word) > 1 for i in range(len(word))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once), ``limit + 1`` if above ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        lowest = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            lowest = min(lowest, value)
+        if lowest > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyMatcher(LazyStore):
+    """In-memory typo-tolerant index (SymSpell deletes) over destination names and aliases"""
+
+    table = 'destinations'
+
+    def __init__(self, alias_groups: Iterable[Set[str]] = ()):
+        super().__init__()
+        # folded name -> folded aliases of the same place
+        self._aliases: Dict[str, Set[str]] = {}
+        for group in alias_groups:
+            keys = {fuzzy_key(alias) for alias in group} - {""}
+            for key in keys:
+                self._aliases.setdefault(key, set()).update(keys)
+        self._deletes: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[int]] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._docs: Dict[int, dict] = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add_term(self, term: str, doc_id: int):
+        docs = self._terms.get(term)
+        if docs is None:
+            docs = self._terms[term] = set()
+            for variant in _deletes(term, max_distance(term)):
+                self._deletes.setdefault(variant, set()).add(term)
+        docs.add(doc_id)
+
+    def _remove_term(self, term: str, doc_id: int):
+        docs = self._terms.get(term)
+        if docs is None:
+            return
+        docs.discard(doc_id)
+        if docs:
+            return
+        del self._terms[term]
+        for variant in _deletes(term, max_distance(term)):
+            terms = self._deletes.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[variant]
+
+    def upsert(self, row: dict):
+        doc_id = row['id']
+        self.remove(doc_id)
+        name = fuzzy_key(row.get('name'))
+        if not name:
+            return
+        terms = {name} | self._aliases.get(name, set())
+        for term in terms:
+            self._add_term(term, doc_id)
+        self._doc_terms[doc_id] = terms
+        self._docs[doc_id] = row
+
+    def remove(self, doc_id: int):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            self._remove_term(term, doc_id)
+        del self._docs[doc_id]
+
+    def build(self, rows: Iterable[dict]):
+        self._deletes, self._terms, self._doc_terms, self._docs = {}, {}, {}, {}
+        for row in rows:
+            self.upsert(row)
+
+    def match(self, text, limit: int = 5) -> List[Tuple[dict, int]]:
+        """Destinations whose name or alias is within a few edits of ``text``, as (row, distance)"""
+        key = fuzzy_key(text)
+        if not key or not self._docs:
+            return []
+        limit_distance = max_distance(key)
+
+        distances: Dict[str, int] = {}
+        for variant in _deletes(key, limit_distance):
+            for term in self._deletes.get(variant, ()):
+                if term not in distances:
+                    distances[term] = edit_distance(key, term, limit_distance)
+
+        best: Dict[int, int] = {}
+        for term, distance in distances.items():
+            if distance > limit_distance:
+                continue
+            for doc_id in self._terms[term]:
+                if distance < best.get(doc_id, limit_distance + 1):
+                    best[doc_id] = distance
+
+        ranked = sorted(best.items(), key=lambda item: (
+            item[1], -float(self._docs[item[0]].get('rating') or 0), item[0]))
+        return [(self._docs[doc_id], distance) for doc_id, distance in ranked[:limit]]
+
+    async def _load_all(self):
+        started = time.perf_counter()
+        rows = await fetch("SELECT * FROM destinations")
+        self.build(rows)
+        logger.info(f"Fuzzy matcher built over {len(rows)} destinations "
+                    f"({len(self._terms)} names/aliases, {len(self._deletes)} deletes, "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    async def _load_ids(self, ids: List[int]):
+        rows = await fetch("SELECT * FROM destinations WHERE id = ANY($1::int[])", ids)
+        for doc_id in ids:
+            self.remove(doc_id)
+        for row in rows:
+            self.upsert(row)
+
+
+fuzzy_matcher = FuzzyMatcher(ALIAS_GROUPS).watch()
+
+
+async def fuzzy_destinations(text, limit: int = 5) -> List[Tuple[dict, int]]:
+    """Typo-tolerant destination lookup by name or alias, as (row, edit distance) best first"""
+    await listener.ensure_started()
+    await fuzzy_matcher.ensure_loaded()
+    return fuzzy_matcher.match(text, limit)
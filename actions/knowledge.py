@@ -0,0 +1,138 @@
+import os
+import logging
+from itertools import product
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import yaml
+
+from .destination_resolver import load_alias_groups
+from .text_utils import normalize_text, fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge', 'advice.yml')
+
+# Destination given, but the topic has no section for it
+UNKNOWN = '*'
+DESTINATION_PLACEHOLDER = '{destination}'
+
+Key = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def _variants(text: str) -> Tuple[str, ...]:
+    key = normalize_text(text)
+    folded = fold_diacritics(key)
+    return (key,) if folded == key else (key, folded)
+
+
+def _windows(text: str) -> Iterable[str]:
+    """Every contiguous word span of ``text``, longest first ("tp đà nẵng" -> ..., "đà nẵng", ...)"""
+    words = text.split()
+    for size in range(len(words), 0, -1):
+        for start in range(len(words) - size + 1):
+            yield " ".join(words[start:start + size])
+
+
+def _build_index(keys: Iterable[str], aliases: Mapping[str, Iterable[str]],
+                 groups: Iterable[Iterable[str]] = ()) -> Mapping[str, str]:
+    """Normalized (and diacritic-folded) spelling -> canonical key"""
+    index: Dict[str, str] = {}
+    for key in keys:
+        names = {key, *aliases.get(key, ())}
+        for group in groups:
+            if any(normalize_text(n) in group for n in names):
+                names.update(group)
+        for name in names:
+            for variant in _variants(name):
+                index.setdefault(variant, key)
+    return MappingProxyType(index)
+
+
+class KnowledgeBase:
+    """Immutable, pre-rendered answers keyed by (topic, destination, category, season)"""
+
+    __slots__ = ('_answers', '_destinations', '_categories', '_seasons')
+
+    def __init__(self, answers: Mapping[Key, str], destinations: Mapping[str, str],
+                 categories: Mapping[str, str], seasons: Mapping[str, str]):
+        self._answers = MappingProxyType(dict(answers))
+        self._destinations = destinations
+        self._categories = categories
+        self._seasons = seasons
+
+    @classmethod
+    def from_config(cls, config: dict, alias_groups=()) -> "KnowledgeBase":
+        topics = config.get('topics') or {}
+        dest_keys = {normalize_text(k) for t in topics.values() for k in (t.get('destinations') or {})}
+        cat_keys = {normalize_text(k) for t in topics.values() for k in (t.get('categories') or {})}
+        season_keys = {normalize_text(k) for t in topics.values() for k in (t.get('seasons') or {})}
+
+        def normalized(mapping):
+            return {normalize_text(k): v for k, v in (mapping or {}).items()}
+
+        answers = {}
+        for topic, spec in topics.items():
+            destinations = normalized(spec.get('destinations'))
+            categories = normalized(spec.get('categories'))
+            seasons = normalized(spec.get('seasons'))
+            for dest, cat, season in product([*destinations, UNKNOWN, None],
+                                             [*categories, None], [*seasons, None]):
+                if dest is None:
+                    dest_block = spec.get('no_destination')
+                elif dest == UNKNOWN:
+                    dest_block = spec.get('unknown_destination')
+                else:
+                    dest_block = destinations[dest]
+                blocks = [spec.get('intro'), dest_block, categories.get(cat), seasons.get(season), spec.get('footer')]
+                answers[(topic, dest, cat, season)] = "\n\n".join(b.strip("\n") for b in blocks if b)
+
+        return cls(
+            answers,
+            _build_index(dest_keys, normalized(config.get('aliases')), alias_groups),
+            _build_index(cat_keys, normalized(config.get('category_aliases'))),
+            _build_index(season_keys, normalized(config.get('season_aliases'))),
+        )
+
+    @staticmethod
+    def _match(text, index: Mapping[str, str]) -> Optional[str]:
+        key = normalize_text(text)
+        if not key:
+            return None
+        for variant in _variants(key):
+            for window in _windows(variant):
+                if window in index:
+                    return index[window]
+        return None
+
+    def answer(self, topic: str, destination=None, category=None, season=None) -> Optional[str]:
+        dest_key = None
+        if destination:
+            dest_key = self._match(destination, self._destinations) or UNKNOWN
+        cat_key = self._match(category, self._categories) if category else None
+        season_key = self._match(season, self._seasons) if season else None
+
+        text = self._answers.get((topic, dest_key, cat_key, season_key))
+        if text is None and dest_key not in (None, UNKNOWN):
+            # Place known to the store but without a section in this topic
+            dest_key = UNKNOWN
+            text = self._answers.get((topic, dest_key, cat_key, season_key))
+        if text is None:
+            return None
+        if dest_key == UNKNOWN:
+            text = text.replace(DESTINATION_PLACEHOLDER, str(destination))
+        return text
+
+    def __len__(self):
+        return len(self._answers)
+
+
+def load_knowledge(path: str = KNOWLEDGE_FILE) -> KnowledgeBase:
+    with open(path, encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    kb = KnowledgeBase.from_config(config, load_alias_groups())
+    logger.info(f"Loaded {len(kb)} pre-rendered answers from {os.path.basename(path)}")
+    return kb
+
+
+knowledge = load_knowledge()
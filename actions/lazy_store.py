@@ -0,0 +1,75 @@
+import asyncio
+from typing import List, Optional, Set
+
+from .db import on_table_change
+
+
+class LazyStore:
+    """In-memory copy of a table, loaded on first use and kept current by change notifications.
+
+    A notification with a row id marks just that row dirty; one without (bulk changes, a
+    reconnect) marks the whole store stale. ``ensure_loaded`` then reloads everything or only
+    the dirty rows. Subclasses implement ``_load_all`` and ``_load_ids``.
+    """
+
+    # Table whose notifications ``watch`` subscribes to
+    table: str = ''
+
+    def __init__(self):
+        self._dirty: Set[int] = set()
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    def mark_dirty(self, row_id: Optional[int] = None):
+        if row_id is None:
+            self._stale = True
+        else:
+            self._dirty.add(row_id)
+
+    def _pending(self) -> bool:
+        return self._stale or bool(self._dirty)
+
+    def _clear_pending(self):
+        self._dirty.clear()
+
+    async def _load_all(self):
+        raise NotImplementedError
+
+    async def _load_ids(self, ids: List[int]):
+        raise NotImplementedError
+
+    async def _load_changes(self):
+        if self._dirty:
+            ids, self._dirty = list(self._dirty), set()
+            try:
+                await self._load_ids(ids)
+            except Exception:
+                self._dirty.update(ids)
+                raise
+
+    async def ensure_loaded(self):
+        if not self._pending():
+            return
+        async with self._lock:
+            if self._stale:
+                self._stale = False
+                self._clear_pending()
+                try:
+                    await self._load_all()
+                except Exception:
+                    self._stale = True
+                    raise
+            else:
+                await self._load_changes()
+
+    def on_change(self, table: Optional[str], payload: dict):
+        if table is None:
+            self.mark_dirty()
+        elif table == self.table:
+            self.mark_dirty(payload.get('id'))
+
+    def watch(self):
+        """Subscribe to catalog change notifications; returns the store"""
+        on_table_change(self.on_change)
+        return self
+
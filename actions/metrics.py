@@ -0,0 +1,160 @@
+import bisect
+import logging
+from contextvars import ContextVar
+from typing import Dict, Mapping, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Turn:
+    """What one action run spent, accumulated by the DB and render helpers while it runs"""
+
+    __slots__ = ("db_seconds", "decode_seconds", "render_seconds", "rows", "queries", "errors")
+
+    def __init__(self):
+        self.db_seconds = self.decode_seconds = self.render_seconds = 0.0
+        self.rows = self.queries = self.errors = 0
+
+
+class ActionStats:
+    __slots__ = ("calls", "errors", "latency", "db", "decode_seconds", "render_seconds", "rows", "queries")
+
+    def __init__(self):
+        self.calls = self.errors = self.rows = self.queries = 0
+        self.latency = Histogram()
+        self.db = Histogram()
+        self.decode_seconds = self.render_seconds = 0.0
+
+
+_turn: ContextVar[Optional[_Turn]] = ContextVar("action_metrics_turn", default=None)
+
+
+def observe_query(db_seconds: float, decode_seconds: float, rows: int):
+    """Charge one query to the running action (no-op outside an action)"""
+    turn = _turn.get()
+    if turn is not None:
+        turn.db_seconds += db_seconds
+        turn.decode_seconds += decode_seconds
+        turn.rows += rows
+        turn.queries += 1
+
+
+def observe_render(seconds: float):
+    turn = _turn.get()
+    if turn is not None:
+        turn.render_seconds += seconds
+
+
+class _ErrorCounter(logging.Handler):
+    """Counts ERROR records logged while an action runs (actions catch and log their own failures)"""
+
+    def emit(self, record):
+        turn = _turn.get()
+        if turn is not None:
+            turn.errors += 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class ActionMetrics:
+    """Per-action call counts, latency/DB-time histograms, rows fetched and errors"""
+
+    def __init__(self):
+        self._actions: Dict[str, ActionStats] = {}
+
+    def start(self):
+        turn = _Turn()
+        return turn, _turn.set(turn)
+
+    def finish(self, action: str, turn: _Turn, token, seconds: float, error: Optional[BaseException] = None):
+        _turn.reset(token)
+        stats = self._actions.get(action)
+        if stats is None:
+            stats = self._actions[action] = ActionStats()
+        stats.calls += 1
+        if error is not None or turn.errors:
+            stats.errors += 1
+        stats.latency.observe(seconds)
+        stats.db.observe(turn.db_seconds)
+        stats.decode_seconds += turn.decode_seconds
+        stats.render_seconds += turn.render_seconds
+        stats.rows += turn.rows
+        stats.queries += turn.queries
+
+    def get(self, action: str) -> Optional[ActionStats]:
+        return self._actions.get(action)
+
+    def reset(self):
+        self._actions.clear()
+
+    def render(self, gauges: Mapping[str, Mapping[str, float]] = None) -> str:
+        """Prometheus text exposition of every metric, plus ``{prefix: {name: value}}`` gauges"""
+        lines = []
+        actions = sorted(self._actions.items())
+
+        def counter(name, help_text, attr):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for action, stats in actions:
+                lines.append(f'{name}{{action="{_escape(action)}"}} {_number(getattr(stats, attr))}')
+
+        def histogram(name, help_text, attr):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for action, stats in actions:
+                hist = getattr(stats, attr)
+                label = f'action="{_escape(action)}"'
+                cumulative = 0
+                for bound, count in zip(hist.bounds, hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{label}}} {_number(hist.sum)}")
+                lines.append(f"{name}_count{{{label}}} {hist.count}")
+
+        counter("action_calls_total", "Action runs.", "calls")
+        counter("action_errors_total", "Action runs that raised or logged an error.", "errors")
+        histogram("action_latency_seconds", "Wall time of Action.run.", "latency")
+        histogram("action_db_seconds", "Time an action run spent waiting on the database.", "db")
+        counter("action_decode_seconds_total", "Time spent decoding fetched rows.", "decode_seconds")
+        counter("action_render_seconds_total", "Time spent rendering result messages.", "render_seconds")
+        counter("action_rows_fetched_total", "Rows fetched from the database.", "rows")
+        counter("action_queries_total", "Queries sent to the database (cache hits excluded).", "queries")
+
+        for prefix, values in (gauges or {}).items():
+            for key, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name = f"{prefix}_{key}"
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = ActionMetrics()
+
+_error_counter = _ErrorCounter(logging.ERROR)
+logging.getLogger(__package__).addHandler(_error_counter)
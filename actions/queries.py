@@ -0,0 +1,152 @@
+"""Fixed query shapes of the custom actions, prepared once per pooled connection (see db.statement).
+
+Optional filters are NULL-able parameters rather than SQL fragments appended per turn,
+so each action always sends the same statement text whatever slots are filled.
+"""
+from .db import statement
+
+SEARCH_DESTINATIONS = statement('search_destinations', """
+    SELECT * FROM destinations
+    WHERE ($1::int[] IS NULL OR id = ANY($1::int[]))
+    AND ($2::text IS NULL OR LOWER(province) LIKE LOWER($2))
+    AND ($3::text IS NULL OR LOWER(region) LIKE LOWER($3))
+    ORDER BY rating DESC
+    LIMIT 10
+""")
+
+# Category facets and the top rated few in one round trip; the row size
+# does not grow with the number of destinations in the province
+CITY_SUMMARY = statement('city_summary', """
+    WITH matched AS (
+        SELECT name, COALESCE(category, 'khác') AS category, rating, description
+        FROM destinations
+        WHERE LOWER(province) LIKE LOWER($1)
+    ),
+    facets AS (
+        SELECT category, COUNT(*) AS n, MAX(rating) AS best
+        FROM matched
+        GROUP BY category
+    ),
+    top AS (
+        SELECT name, category, rating,
+            CASE WHEN length(description) > 80
+                THEN LEFT(description, 80) || '...'
+                ELSE description END AS description
+        FROM matched
+        ORDER BY rating DESC NULLS LAST
+        LIMIT $2
+    )
+    SELECT
+        (SELECT COUNT(*) FROM matched) AS total,
+        (SELECT json_agg(json_build_object('category', category, 'count', n)
+            ORDER BY best DESC NULLS LAST, category) FROM facets) AS facets,
+        (SELECT json_agg(top ORDER BY rating DESC NULLS LAST) FROM top) AS top
+""")
+
+HOTELS = statement('hotels', """
+    SELECT h.* FROM hotels h
+    WHERE h.destination_id = ANY($1::int[])
+    AND ($2::int IS NULL OR h.star_rating = $2)
+    AND ($3::text IS NULL OR LOWER(h.price_range) LIKE LOWER($3))
+    ORDER BY h.star_rating DESC, h.name
+    LIMIT 10
+""")
+
+RESTAURANTS = statement('restaurants', """
+    SELECT r.* FROM restaurants r
+    WHERE r.destination_id = ANY($1::int[])
+    AND ($2::text IS NULL OR LOWER(r.cuisine_type) LIKE LOWER($2))
+    AND ($3::text IS NULL OR LOWER(r.price_range) LIKE LOWER($3))
+    ORDER BY r.rating DESC
+    LIMIT 10
+""")
+
+ACTIVITIES = statement('activities', """
+    SELECT a.* FROM activities a
+    WHERE a.destination_id = ANY($1::int[])
+    AND ($2::text IS NULL OR LOWER(a.type) LIKE LOWER($2))
+    ORDER BY a.price ASC
+    LIMIT 10
+""")
+
+TOURS = statement('tours', """
+    SELECT t.* FROM tours t
+    WHERE ($1::int[] IS NULL OR EXISTS (
+        SELECT 1 FROM tour_destinations td
+        WHERE td.tour_id = t.id AND td.destination_id = ANY($1::int[])
+    ))
+    AND ($2::int IS NULL OR t.duration_days = $2)
+    ORDER BY t.price ASC
+    LIMIT 10
+""")
+
+WEATHER = statement('weather', """
+    SELECT w.*, d.name as destination_name
+    FROM weather w
+    JOIN destinations d ON w.destination_id = d.id
+    WHERE w.destination_id = ANY($1::int[])
+    AND ($2::int IS NULL OR w.month = $2)
+    ORDER BY w.month
+""")
+
+WEATHER_BY_MONTH = statement('weather_by_month', """
+    SELECT month, description, avg_temp FROM weather
+    WHERE destination_id = $1
+    ORDER BY month
+    LIMIT 6
+""")
+
+DIRECT_TRANSPORTATION = statement('direct_transportation', """
+    SELECT t.*, d1.name as from_name, d2.name as to_name
+    FROM transportation t
+    JOIN destinations d1 ON t.from_destination_id = d1.id
+    JOIN destinations d2 ON t.to_destination_id = d2.id
+    WHERE t.from_destination_id = ANY($1::int[])
+    AND t.to_destination_id = ANY($2::int[])
+""")
+
+REVIEWS = statement('reviews', """
+    SELECT r.*, d.name as destination_name
+    FROM reviews r
+    JOIN destinations d ON r.entity_id = d.id
+    WHERE r.entity_type = 'destination'
+    AND r.entity_id = ANY($1::int[])
+    ORDER BY r.created_at DESC
+    LIMIT 5
+""")
+
+# destination_costs is maintained by triggers (migrations/0004_destination_costs.sql)
+DESTINATION_COSTS = statement('destination_costs', """
+    SELECT d.name AS destination_name, c.hotel_per_night, c.meal_price,
+        c.activity_per_day, c.transport_estimate
+    FROM destinations d
+    LEFT JOIN destination_costs c ON c.destination_id = d.id
+    WHERE d.id = ANY($1::int[])
+    ORDER BY array_position($1::int[], d.id)
+    LIMIT 1
+""")
+
+# All destinations with their weather this month, hotel count, review average
+# and cost estimate (destination_costs) in one round trip
+COMPARE_DESTINATIONS = statement('compare_destinations', """
+    SELECT d.id, d.name, d.province, d.region, d.category, d.rating,
+        LEFT(d.description, 100) AS description,
+        COALESCE(c.hotel_count, 0) AS hotel_count,
+        c.hotel_per_night, c.meal_price, c.activity_per_day,
+        rv.avg_review, rv.review_count,
+        w.avg_temp, w.description AS weather
+    FROM unnest($1::int[]) WITH ORDINALITY AS q(id, ord)
+    JOIN destinations d ON d.id = q.id
+    LEFT JOIN destination_costs c ON c.destination_id = d.id
+    LEFT JOIN LATERAL (
+        SELECT ROUND(AVG(rating), 1) AS avg_review, COUNT(*) AS review_count
+        FROM reviews
+        WHERE entity_type = 'destination' AND entity_id = d.id
+    ) rv ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT avg_temp, description FROM weather
+        WHERE destination_id = d.id AND month = $2
+        LIMIT 1
+    ) w ON TRUE
+    ORDER BY q.ord
+""")
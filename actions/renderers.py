@@ -0,0 +1,119 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import observe_render
+
+# Rows shown per search reply; the rest are summarized in one line
+MAX_RENDERED = 5
+
+NO_RESULTS = "Xin lỗi, tôi không tìm thấy kết quả phù hợp. Bạn có thể thử tìm kiếm khác không?"
+
+
+def truncate(limit: int) -> Callable[[str], str]:
+    def _truncate(text: str) -> str:
+        return text[:limit] + "..." if len(text) > limit else text
+    return _truncate
+
+
+def join_list(limit: Optional[int] = None) -> Callable[[Any], Optional[str]]:
+    """Join an already-decoded list column (see db.py) into "a, b, c" """
+    def _join(values) -> Optional[str]:
+        if not isinstance(values, (list, tuple)):
+            return None
+        return ", ".join(str(v) for v in values[:limit]) or None
+    return _join
+
+
+class Field:
+    """One optional line of a result: rendered only when the column is truthy, unless ``always``"""
+
+    __slots__ = ("column", "format", "transform", "always", "default")
+
+    def __init__(self, column: str, template: str, transform: Optional[Callable] = None,
+                 always: bool = False, default: Any = None):
+        self.column = column
+        self.format = template.format
+        self.transform = transform
+        self.always = always
+        self.default = default
+
+
+class Renderer:
+    """Precompiled template for one entity type: a title line plus optional fields"""
+
+    def __init__(self, title: str, fields: Sequence[Field] = ()):
+        self._title = title.format
+        self._fields: Tuple[Field, ...] = tuple(fields)
+
+    def render(self, idx: int, item: Dict[str, Any]) -> str:
+        parts = [self._title(idx=idx, name=item['name'])]
+        for field in self._fields:
+            value = item.get(field.column, field.default)
+            if not field.always:
+                if not value:
+                    continue
+                if field.transform is not None:
+                    value = field.transform(value)
+                    if value is None:
+                        continue
+            parts.append(field.format(value))
+        return "".join(parts)
+
+
+RENDERERS: Dict[str, Renderer] = {}
+
+
+def register_renderer(entity_type: str, renderer: Renderer):
+    RENDERERS[entity_type] = renderer
+
+
+register_renderer('destination', Renderer("{idx}. 📍 {name}", [
+    Field('province', " - {}"),
+    Field('rating', "\n   ⭐ Đánh giá: {}/5\n", always=True, default='N/A'),
+    Field('category', "   🏷️ Loại: {}\n"),
+    Field('description', "   📝 {}\n", truncate(100)),
+]))
+
+register_renderer('hotel', Renderer("{idx}. 🏨 {name}\n", [
+    Field('address', "   📍 {}\n"),
+    Field('star_rating', "   ⭐ {} sao\n"),
+    Field('price_range', "   💰 Giá: {}\n"),
+    Field('amenities', "   🎯 Tiện ích: {}\n", join_list(3)),
+]))
+
+register_renderer('restaurant', Renderer("{idx}. 🍽️ {name}\n", [
+    Field('cuisine_type', "   🍜 Loại: {}\n"),
+    Field('price_range', "   💰 Giá: {}\n"),
+    Field('rating', "   ⭐ Đánh giá: {}/5\n"),
+    Field('specialties', "   🌟 Đặc sản: {}\n"),
+]))
+
+register_renderer('activity', Renderer("{idx}. 🎯 {name}\n", [
+    Field('type', "   🏷️ Loại: {}\n"),
+    Field('price', "   💰 Giá: {:,} VNĐ\n"),
+    Field('duration', "   ⏱️ Thời gian: {}\n"),
+    Field('description', "   📝 {}\n", truncate(80)),
+]))
+
+register_renderer('tour', Renderer("{idx}. 🎫 {name}\n", [
+    Field('duration_days', "   📅 Thời gian: {} ngày\n"),
+    Field('price', "   💰 Giá: {:,} VNĐ\n"),
+    Field('destinations', "   📍 Điểm đến: {}\n", join_list()),
+]))
+
+
+def format_results(results: List[Dict[str, Any]], entity_type: str) -> List[str]:
+    """Format database results into readable text as a list of messages"""
+    if not results:
+        return [NO_RESULTS]
+
+    started = time.perf_counter()
+    renderer = RENDERERS[entity_type]
+    messages = [f"Tôi tìm thấy {len(results)} kết quả:"]
+    for idx, item in enumerate(results[:MAX_RENDERED], 1):
+        messages.append(renderer.render(idx, item))
+
+    if len(results) > MAX_RENDERED:
+        messages.append(f"... và {len(results) - MAX_RENDERED} kết quả khác.")
+    observe_render(time.perf_counter() - started)
+    return messages
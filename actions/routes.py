@@ -0,0 +1,268 @@
+import re
+import heapq
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .db import fetch, listener
+from .lazy_store import LazyStore
+from .text_utils import fold_diacritics, parse_price
+
+logger = logging.getLogger(__name__)
+
+FASTEST = 'fastest'
+CHEAPEST = 'cheapest'
+FEWEST_TRANSFERS = 'fewest_transfers'
+
+# Single-source shortest path trees kept for the most recently asked origins
+ROUTE_CACHE_SIZE = 256
+# Legs whose duration/price could not be parsed still count, at this cost, so they are used last
+UNKNOWN_MINUTES = 24 * 60
+UNKNOWN_PRICE = 5_000_000
+
+_DURATION = re.compile(r"(\d+(?:[.,]\d+)?)(?:\s*-\s*(\d+(?:[.,]\d+)?))?\s*(ngay|dem|gio|tieng|h|phut|p)\b")
+_DURATION_UNITS = {'ngay': 1440, 'dem': 1440, 'gio': 60, 'tieng': 60, 'h': 60, 'phut': 1, 'p': 1}
+
+
+# Folded phrases that pick the route objective from the user's message
+OBJECTIVE_KEYWORDS = (
+    (CHEAPEST, ("re nhat", "tiet kiem", "gia re", "it tien")),
+    (FEWEST_TRANSFERS, ("it chang", "it trung chuyen", "it chuyen", "khong doi xe", "it doi")),
+    (FASTEST, ("nhanh nhat", "nhanh", "it thoi gian")),
+)
+
+
+def _fold(text) -> str:
+    return fold_diacritics(str(text).lower())
+
+
+def parse_duration(text) -> Optional[float]:
+    """Minutes from a free-text duration ("1 giờ 30 phút" -> 90, "1-2 tiếng" -> 90, "2h" -> 120)"""
+    if not text:
+        return None
+    total = None
+    for low, high, unit in _DURATION.findall(_fold(text)):
+        value = float(low.replace(',', '.'))
+        if high:
+            value = (value + float(high.replace(',', '.'))) / 2
+        total = (total or 0) + value * _DURATION_UNITS[unit]
+    return total
+
+
+def objective_from_text(text) -> Optional[str]:
+    """Route objective the user asked for ("đi sao cho rẻ nhất" -> CHEAPEST), None if unspecified"""
+    folded = _fold(text or "")
+    for objective, phrases in OBJECTIVE_KEYWORDS:
+        if any(phrase in folded for phrase in phrases):
+            return objective
+    return None
+
+
+class Leg(NamedTuple):
+    id: int
+    source: int
+    target: int
+    type: str
+    duration: Optional[str]
+    price_range: Optional[str]
+    minutes: Optional[float]
+    price: Optional[float]
+
+
+class Route(NamedTuple):
+    legs: Tuple[Leg, ...]
+    minutes: float
+    price: float
+
+    @property
+    def transfers(self) -> int:
+        return max(0, len(self.legs) - 1)
+
+
+def _cost(objective: str, leg: Leg) -> Tuple[float, float]:
+    minutes = leg.minutes if leg.minutes is not None else UNKNOWN_MINUTES
+    price = leg.price if leg.price is not None else UNKNOWN_PRICE
+    if objective == FASTEST:
+        return minutes, price
+    if objective == CHEAPEST:
+        return price, minutes
+    if objective == FEWEST_TRANSFERS:
+        return 1.0, minutes
+    raise ValueError(f"Unknown route objective: {objective}")
+
+
+class RouteGraph(LazyStore):
+    """In-memory weighted graph over the transportation table, updated incrementally"""
+
+    table = 'transportation'
+
+    def __init__(self, cache_size: int = ROUTE_CACHE_SIZE):
+        super().__init__()
+        self._legs: Dict[int, Leg] = {}
+        self._adjacency: Dict[int, Dict[int, Leg]] = {}
+        self._names: Dict[int, str] = {}
+        # (source, objective) -> {target: (cost, previous leg)}
+        self._trees: "OrderedDict[Tuple[int, str], Dict[int, Tuple[Tuple[float, float], Optional[Leg]]]]" = OrderedDict()
+        self._cache_size = cache_size
+        # Destinations whose display name must be reloaded
+        self._dirty_names: Set[int] = set()
+
+    def __len__(self):
+        return len(self._legs)
+
+    @staticmethod
+    def _leg(row) -> Optional[Leg]:
+        source, target = row['from_destination_id'], row['to_destination_id']
+        if source is None or target is None or source == target:
+            return None
+        return Leg(row['id'], source, target, row['type'] or "", row['duration'], row['price_range'],
+                   parse_duration(row['duration']), parse_price(row['price_range']))
+
+    def upsert(self, row):
+        self.remove(row['id'])
+        leg = self._leg(row)
+        if leg is None:
+            return
+        self._legs[leg.id] = leg
+        self._adjacency.setdefault(leg.source, {})[leg.id] = leg
+        self._trees.clear()
+
+    def remove(self, leg_id: int):
+        leg = self._legs.pop(leg_id, None)
+        if leg is None:
+            return
+        out = self._adjacency.get(leg.source)
+        if out is not None:
+            out.pop(leg_id, None)
+            if not out:
+                del self._adjacency[leg.source]
+        self._trees.clear()
+
+    def build(self, rows: Iterable, names: Dict[int, str]):
+        self._legs, self._adjacency, self._names = {}, {}, dict(names)
+        for row in rows:
+            self.upsert(row)
+        self._trees.clear()
+
+    def name(self, dest_id: int) -> str:
+        return self._names.get(dest_id, str(dest_id))
+
+    def _tree(self, source: int, objective: str):
+        key = (source, objective)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+
+        tree = {source: ((0.0, 0.0), None)}
+        heap = [(0.0, 0.0, source)]
+        done = set()
+        while heap:
+            primary, secondary, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for leg in self._adjacency.get(node, {}).values():
+                if leg.target in done:
+                    continue
+                step = _cost(objective, leg)
+                cost = (primary + step[0], secondary + step[1])
+                best = tree.get(leg.target)
+                if best is None or cost < best[0]:
+                    tree[leg.target] = (cost, leg)
+                    heapq.heappush(heap, (cost[0], cost[1], leg.target))
+
+        self._trees[key] = tree
+        if len(self._trees) > self._cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    def shortest(self, source_ids: Iterable[int], target_ids: Iterable[int],
+                 objective: str = FASTEST) -> Optional[Route]:
+        """Best route from any of ``source_ids`` to any of ``target_ids`` (Dijkstra, cached per origin)"""
+        targets = set(target_ids)
+        best = None
+        for source in set(source_ids):
+            if source in targets:
+                continue
+            tree = self._tree(source, objective)
+            for target in targets:
+                entry = tree.get(target)
+                if entry is not None and (best is None or entry[0] < best[0]):
+                    best = (entry[0], tree, target)
+        if best is None:
+            return None
+
+        _, tree, node = best
+        legs = []
+        while True:
+            leg = tree[node][1]
+            if leg is None:
+                break
+            legs.append(leg)
+            node = leg.source
+        legs.reverse()
+        return Route(
+            tuple(legs),
+            sum(leg.minutes if leg.minutes is not None else UNKNOWN_MINUTES for leg in legs),
+            sum(leg.price if leg.price is not None else UNKNOWN_PRICE for leg in legs),
+        )
+
+    def mark_name_dirty(self, dest_id: int):
+        self._dirty_names.add(dest_id)
+
+    def on_change(self, table: Optional[str], payload: dict):
+        if table == 'destinations':
+            if payload.get('id') is None:
+                # Bulk change without row ids: the names may all be stale
+                self.mark_dirty()
+            else:
+                self.mark_name_dirty(payload['id'])
+        else:
+            super().on_change(table, payload)
+
+    def _pending(self) -> bool:
+        return super()._pending() or bool(self._dirty_names)
+
+    def _clear_pending(self):
+        super()._clear_pending()
+        self._dirty_names.clear()
+
+    async def _load_all(self):
+        rows = await fetch("SELECT id, from_destination_id, to_destination_id, type, duration, price_range "
+                           "FROM transportation")
+        names = await fetch("SELECT id, name FROM destinations")
+        self.build(rows, {r['id']: r['name'] for r in names})
+        logger.info(f"Route graph built: {len(self._legs)} legs between {len(self._adjacency)} origins")
+
+    async def _load_ids(self, ids: List[int]):
+        rows = await fetch("SELECT id, from_destination_id, to_destination_id, type, duration, price_range "
+                           "FROM transportation WHERE id = ANY($1::int[])", ids)
+        for leg_id in ids:
+            self.remove(leg_id)
+        for row in rows:
+            self.upsert(row)
+
+    async def _load_changes(self):
+        await super()._load_changes()
+        if self._dirty_names:
+            ids, self._dirty_names = list(self._dirty_names), set()
+            try:
+                rows = await fetch("SELECT id, name FROM destinations WHERE id = ANY($1::int[])", ids)
+            except Exception:
+                self._dirty_names.update(ids)
+                raise
+            for dest_id in ids:
+                self._names.pop(dest_id, None)
+            for r in rows:
+                self._names[r['id']] = r['name']
+
+
+route_graph = RouteGraph().watch()
+
+
+async def plan_route(source_ids: List[int], target_ids: List[int], objective: str = FASTEST) -> Optional[Route]:
+    """Best multi-hop route between two resolved destinations, or None if they are not connected"""
+    await listener.ensure_started()
+    await route_graph.ensure_loaded()
+    return route_graph.shortest(source_ids, target_ids, objective)
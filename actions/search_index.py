@@ -0,0 +1,169 @@
+import math
+import time
+import heapq
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from .db import fetch, listener
+from .lazy_store import LazyStore
+from .text_utils import normalize_text, fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+# Per-field weights: a hit in the name counts more than one in the description
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'province': 2.0,
+    'category': 1.5,
+    'region': 1.0,
+    'description': 1.0,
+}
+K1 = 1.2
+B = 0.75
+# Precomputed BM25 term impacts are rebuilt once the average document length drifts this much
+AVG_LEN_TOLERANCE = 0.1
+# Final score = (1 - RATING_WEIGHT) * normalized BM25 + RATING_WEIGHT * rating / 5
+RATING_WEIGHT = 0.2
+
+# Chat filler that would otherwise match half the catalog (folded, see tokenize)
+STOPWORDS = frozenset(fold_diacritics(w) for w in (
+    "tìm", "kiếm", "cho", "tôi", "mình", "muốn", "đi", "đến", "ở", "tại", "có", "nào", "gì",
+    "không", "được", "các", "những", "nơi", "chỗ", "địa", "điểm", "du", "lịch", "và", "với",
+    "là", "một", "nên", "hãy", "giúp", "gợi", "ý", "cần", "thì", "đẹp", "nhất", "hay",
+))
+
+
+def tokenize(text) -> List[str]:
+    """Folded syllables plus syllable bigrams ("Đà Lạt" -> ["da", "lat", "da_lat"])"""
+    syllables = [s for s in fold_diacritics(normalize_text(text)).split() if s not in STOPWORDS]
+    return syllables + [f"{a}_{b}" for a, b in zip(syllables, syllables[1:])]
+
+
+def _document_terms(row: dict) -> Counter:
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(row.get(field)):
+            terms[term] += weight
+    return terms
+
+
+class SearchIndex(LazyStore):
+    """In-memory BM25 inverted index over destinations, updated incrementally"""
+
+    table = 'destinations'
+
+    def __init__(self):
+        super().__init__()
+        # term -> {doc_id: BM25 term impact for avg length self._impact_avg_len}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._impact_avg_len = 0.0
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_len: Dict[int, float] = {}
+        self._docs: Dict[int, dict] = {}
+        self._total_len = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def upsert(self, row: dict):
+        doc_id = row['id']
+        self.remove(doc_id)
+        terms = _document_terms(row)
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        self._docs[doc_id] = row
+        if not self._impact_avg_len:
+            self._impact_avg_len = length or 1.0
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = self._impact(tf, length)
+
+    def _impact(self, tf: float, length: float) -> float:
+        norm = K1 * (1 - B + B * length / self._impact_avg_len)
+        return tf * (K1 + 1) / (tf + norm)
+
+    def _refresh_impacts(self):
+        """Recompute every term impact against the current average document length"""
+        self._impact_avg_len = self._total_len / len(self._docs)
+        for doc_id, terms in self._doc_terms.items():
+            length = self._doc_len[doc_id]
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = self._impact(tf, length)
+
+    def remove(self, doc_id: int):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id)
+        del self._docs[doc_id]
+
+    def build(self, rows: Iterable[dict]):
+        self._postings, self._doc_terms, self._doc_len, self._docs = {}, {}, {}, {}
+        self._total_len = 0.0
+        self._impact_avg_len = 0.0
+        for row in rows:
+            self.upsert(row)
+        if self._docs:
+            self._refresh_impacts()
+
+    def search(self, text, limit: int = 10) -> List[Tuple[dict, float]]:
+        """Best matching destinations for free text, as (row, score) best first"""
+        n = len(self._docs)
+        query = set(tokenize(text))
+        if not n or not query:
+            return []
+
+        avg_len = self._total_len / n
+        if abs(avg_len - self._impact_avg_len) > AVG_LEN_TOLERANCE * self._impact_avg_len:
+            self._refresh_impacts()
+
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term in query:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, impact in postings.items():
+                scores[doc_id] = get(doc_id, 0.0) + idf * impact
+        if not scores:
+            return []
+
+        best = max(scores.values())
+        ranked = []
+        for doc_id, score in scores.items():
+            rating = float(self._docs[doc_id].get('rating') or 0)
+            ranked.append(((1 - RATING_WEIGHT) * score / best + RATING_WEIGHT * rating / 5, doc_id))
+        return [(self._docs[doc_id], score) for score, doc_id in heapq.nlargest(limit, ranked)]
+
+    async def _load_all(self):
+        started = time.perf_counter()
+        rows = await fetch("SELECT * FROM destinations")
+        self.build(rows)
+        logger.info(f"Search index built over {len(rows)} destinations "
+                    f"({len(self._postings)} terms, {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    async def _load_ids(self, ids: List[int]):
+        rows = await fetch("SELECT * FROM destinations WHERE id = ANY($1::int[])", ids)
+        for doc_id in ids:
+            self.remove(doc_id)
+        for row in rows:
+            self.upsert(row)
+
+
+search_index = SearchIndex().watch()
+
+
+async def search_destinations(text, limit: int = 10) -> List[dict]:
+    """Free-text destination search (BM25 over name/province/region/category/description + rating)"""
+    await listener.ensure_started()
+    await search_index.ensure_loaded()
+    return [row for row, _ in search_index.search(text, limit)]
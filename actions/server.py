@@ -0,0 +1,51 @@
+"""Action server with a Prometheus ``/metrics`` endpoint next to ``/webhook``.
+
+Run with ``python -m actions.server`` instead of ``rasa run actions``. Metrics live
+in process memory, so run a single worker (the default here).
+"""
+import os
+import argparse
+import logging
+
+from .metrics import metrics, CONTENT_TYPE
+
+DEFAULT_PORT = int(os.getenv('ACTION_SERVER_PORT', 5055))
+
+
+def render_metrics() -> str:
+    from .db import get_pool_stats
+    from .cache import get_cache_stats
+    return metrics.render({
+        'actions_db_pool': get_pool_stats(),
+        'actions_query_cache': get_cache_stats(),
+    })
+
+
+def create_app(action_package_name: str = 'actions', cors_origins="*"):
+    # Imported lazily: rasa_sdk imports every module of the actions package at startup
+    from sanic import response
+    from rasa_sdk.endpoint import create_app as create_action_app
+
+    app = create_action_app(action_package_name, cors_origins=cors_origins)
+
+    async def metrics_endpoint(request):
+        return response.text(render_metrics(), content_type=CONTENT_TYPE)
+
+    app.add_route(metrics_endpoint, "/metrics", methods=["GET"])
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the action server with a /metrics endpoint")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--actions', default='actions', help="Package containing the custom actions")
+    parser.add_argument('--cors', default="*")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    app = create_app(args.actions, cors_origins=args.cors)
+    app.run(host="0.0.0.0", port=args.port, workers=1, access_log=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+import re
+import logging
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .destination_resolver import resolve_destination_ids
+from .text_utils import normalize_text, fold_diacritics, parse_price
+
+logger = logging.getLogger(__name__)
+
+# Senders whose last turn is remembered; one entry per sender
+TURN_MEMO_SIZE = 2048
+
+# Slots that feed TurnSlots; a change in any of them (e.g. set by a form mid-turn) re-parses
+PARSED_SLOTS = ('destination', 'month', 'duration', 'traveler_count', 'star_rating', 'price_range')
+
+# Folded Vietnamese number words ("mười" and "mươi" both fold to "muoi")
+_DIGIT_WORDS = {
+    'khong': 0, 'mot': 1, 'hai': 2, 'ba': 3, 'bon': 4, 'tu': 4, 'nam': 5, 'lam': 5,
+    'sau': 6, 'bay': 7, 'tam': 8, 'chin': 9,
+}
+_NUMBER_WORDS = set(_DIGIT_WORDS) | {'muoi', 'linh', 'le'}
+
+_MONTH_NAMES = {'gieng': 1, 'gieng nam': 1, 'chap': 12}
+_MONTH_YEAR = re.compile(r"\b(\d{1,2})\s*/\s*\d{4}\b")
+_DAY_MONTH = re.compile(r"\b\d{1,2}\s*/\s*(\d{1,2})\b")
+
+_DAY_UNITS = {'ngay': 1, 'dem': 1, 'tuan': 7, 'thang': 30}
+_WEEKEND = "cuoi tuan"
+_PEOPLE_UNITS = ('nguoi', 'khach', 'ban', 've')
+_PEOPLE_PHRASES = {'mot minh': 1, 'cap doi': 2, 'vo chong': 2, 'hai vo chong': 2, 'hai dua': 2}
+_STAR_UNIT = 'sao'
+
+# Price bands as stored in hotels/restaurants.price_range (see hotel_night_price() in migrations/0004)
+PRICE_BANDS = (
+    ('rẻ', ('re', 'binh dan', 'tiet kiem', 'sinh vien', 'gia tot', 'hop ly')),
+    ('trung bình', ('trung binh', 'tam trung', 'vua phai', 'vua tui')),
+    ('cao cấp', ('cao cap', 'sang trong', 'sang chanh', 'luxury', 'dat tien', 'vip')),
+)
+_PRICE_BAND_PATTERNS = tuple((band, re.compile(r"\b(?:%s)\b" % "|".join(phrases))) for band, phrases in PRICE_BANDS)
+# Upper bound (VND per night) of each band for amounts like "dưới 500k"
+PRICE_BAND_LIMITS = ((700_000, 'rẻ'), (1_500_000, 'trung bình'))
+
+
+def _words(text) -> List[str]:
+    return fold_diacritics(normalize_text(text)).split()
+
+
+def _parse_number_words(words: List[str], strict: bool = False) -> Optional[int]:
+    """Value of the number words at the start of ``words`` ("hai muoi lam" -> 25, "muoi hai" -> 12).
+
+    With ``strict`` every word must belong to the number, so "tam ba" (not a number) gives None.
+    """
+    if words and words[0].isdigit():
+        return int(words[0]) if not strict or len(words) == 1 else None
+    value, current, tens, used = 0, None, False, 0
+    for word in words:
+        if word not in _NUMBER_WORDS:
+            break
+        if word == 'muoi':
+            if tens:
+                break
+            value += (current if current is not None else 1) * 10
+            current, tens = None, True
+        elif word in ('linh', 'le'):
+            if not used:
+                break
+        elif current is not None:
+            break
+        else:
+            current = _DIGIT_WORDS[word]
+        used += 1
+    if not used or (strict and used < len(words)):
+        return None
+    return value + (current or 0)
+
+
+def parse_number(text) -> Optional[int]:
+    """First number in ``text``, in digits or Vietnamese words ("hai người" -> 2, "tháng mười hai" -> 12)"""
+    words = _words(text)
+    for i, word in enumerate(words):
+        if word.isdigit():
+            return int(word)
+        if word in _NUMBER_WORDS and word not in ('linh', 'le'):
+            return _parse_number_words(words[i:])
+    return None
+
+
+def _number_before(words: List[str], units) -> Optional[int]:
+    """Number right before one of ``units`` ("3 ngay", "hai muoi nguoi", "tam ba ngay" -> 3)"""
+    for i, word in enumerate(words):
+        if word not in units or not i:
+            continue
+        if words[i - 1].isdigit():
+            return int(words[i - 1])
+        start = i
+        while start and words[start - 1] in _NUMBER_WORDS:
+            start -= 1
+        # Longest run of words that reads as one number ("tầm ba" is "about three", not 83)
+        for first in range(start, i):
+            value = _parse_number_words(words[first:i], strict=True)
+            if value is not None:
+                return value
+    return None
+
+
+def parse_month(text) -> Optional[int]:
+    """Month 1-12 ("tháng 5", "tháng mười hai", "12/2025", "15/8", "tháng chạp"), None otherwise"""
+    if text is None:
+        return None
+    raw = str(text)
+    match = _MONTH_YEAR.search(raw) or _DAY_MONTH.search(raw)
+    if match:
+        month = int(match.group(1))
+        return month if 1 <= month <= 12 else None
+    words = _words(raw)
+    if 'thang' in words:
+        rest = words[words.index('thang') + 1:]
+        name = " ".join(rest[:2])
+        for key, month in _MONTH_NAMES.items():
+            if name.startswith(key):
+                return month
+        month = _parse_number_words(rest)
+    elif len(words) <= 2:
+        month = _parse_number_words(words)
+    else:
+        month = None
+    return month if month is not None and 1 <= month <= 12 else None
+
+
+def parse_days(text) -> Optional[int]:
+    """Trip length in days ("3 ngày 2 đêm" -> 3, "1 tuần" -> 7, "cuối tuần" -> 2, "hai ngày" -> 2)"""
+    if text is None:
+        return None
+    folded = " ".join(_words(text))
+    if _WEEKEND in folded:
+        return 2
+    words = folded.split()
+    for unit, factor in _DAY_UNITS.items():
+        count = _number_before(words, (unit,))
+        if count:
+            # "2 đêm" alone means a 3-day trip
+            return count + 1 if unit == 'dem' else count * factor
+    count = _parse_number_words(words) if len(words) <= 2 else None
+    return count or None
+
+
+def parse_people(text) -> Optional[int]:
+    """Number of travellers ("hai người" -> 2, "gia đình 4 người" -> 4, "cặp đôi" -> 2)"""
+    if text is None:
+        return None
+    folded = " ".join(_words(text))
+    words = folded.split()
+    count = _number_before(words, _PEOPLE_UNITS)
+    if count:
+        return count
+    for phrase, count in _PEOPLE_PHRASES.items():
+        if phrase in folded:
+            return count
+    count = _parse_number_words(words) if len(words) <= 2 else None
+    return count or None
+
+
+def parse_star_rating(text) -> Optional[int]:
+    """Hotel class 1-5 ("5 sao", "khách sạn năm sao", "4")"""
+    if text is None:
+        return None
+    words = _words(text)
+    stars = _number_before(words, (_STAR_UNIT,))
+    if stars is None and len(words) == 1:
+        stars = _parse_number_words(words)
+    return stars if stars is not None and 1 <= stars <= 5 else None
+
+
+def parse_price_band(text) -> Optional[str]:
+    """One of the stored price bands ("giá sinh viên" -> "rẻ", "dưới 500k" -> "rẻ"), None if unknown"""
+    if text is None:
+        return None
+    folded = " ".join(_words(text))
+    for band, pattern in _PRICE_BAND_PATTERNS:
+        if pattern.search(folded):
+            return band
+    amount = parse_price(text)
+    if amount:
+        for limit, band in PRICE_BAND_LIMITS:
+            if amount <= limit:
+                return band
+        return PRICE_BANDS[-1][0]
+    return None
+
+
+class TurnSlots:
+    """Typed view of one turn's slots, parsed once and shared by every action the turn runs"""
+
+    __slots__ = ('destination', 'month', 'days', 'people', 'star_rating', 'price_band', '_destination_ids')
+
+    def __init__(self, values: dict):
+        self.destination = values.get('destination')
+        self.month = parse_month(values.get('month'))
+        self.days = parse_days(values.get('duration'))
+        self.people = parse_people(values.get('traveler_count'))
+        self.star_rating = parse_star_rating(values.get('star_rating'))
+        self.price_band = parse_price_band(values.get('price_range'))
+        self._destination_ids: Optional[List[int]] = None
+
+    async def destination_ids(self) -> List[int]:
+        """Resolved ids of the destination slot, best match first (resolved once per turn)"""
+        if self._destination_ids is None:
+            self._destination_ids = await resolve_destination_ids(self.destination)
+        return self._destination_ids
+
+    def __repr__(self):
+        return (f"TurnSlots(destination={self.destination!r}, month={self.month}, days={self.days}, "
+                f"people={self.people}, star_rating={self.star_rating}, price_band={self.price_band!r})")
+
+
+_turns: "OrderedDict[str, Tuple[tuple, TurnSlots]]" = OrderedDict()
+
+
+def _turn_id(tracker):
+    """Identifies the user message that started the current turn"""
+    message_id = (tracker.latest_message or {}).get('message_id')
+    if message_id:
+        return message_id
+    for event in reversed(tracker.events or []):
+        if event.get('event') == 'user':
+            return event.get('timestamp')
+    return None
+
+
+def turn_slots(tracker) -> TurnSlots:
+    """Parsed slots for the tracker's current turn, memoized per sender"""
+    values = {name: tracker.get_slot(name) for name in PARSED_SLOTS}
+    turn = _turn_id(tracker)
+    if turn is None:
+        return TurnSlots(values)
+    key = (turn, tuple(values.values()))
+    sender = tracker.sender_id
+
+    cached = _turns.get(sender)
+    if cached is not None and cached[0] == key:
+        _turns.move_to_end(sender)
+        return cached[1]
+
+    slots = TurnSlots(values)
+    _turns[sender] = (key, slots)
+    _turns.move_to_end(sender)
+    if len(_turns) > TURN_MEMO_SIZE:
+        _turns.popitem(last=False)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Parsed slots for {sender}: {slots!r}")
+    return slots
@@ -0,0 +1,81 @@
+import json
+import re
+import unicodedata
+from typing import Optional
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+# VND amounts on folded text: "1.500.000", "500k", "1,2 trieu", "1tr5"
+_PRICE = re.compile(r"(\d+(?:[.,]\d+)*)(?:\s*(k|nghin|ngan|tr|trieu)(?![a-z])(\d)?)?")
+_PRICE_UNITS = {'k': 1_000, 'nghin': 1_000, 'ngan': 1_000, 'tr': 1_000_000, 'trieu': 1_000_000}
+
+
+def normalize_text(text) -> str:
+    """Lowercase, NFC-normalize and collapse whitespace/punctuation ("  Đà-Nẵng " -> "đà nẵng")"""
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFC", str(text)).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fold_diacritics(text: str) -> str:
+    """Strip Vietnamese tone and vowel marks ("đà nẵng" -> "da nang")"""
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+    return stripped.replace("đ", "d").replace("Đ", "D")
+
+
+def parse_text_list(value):
+    """Decode a list-ish column: a real list, a JSON list/object string, or "a, b, c".
+
+    Also repairs TEXT[] values that were stored one character per element
+    (["[", "\"", "w", ...]). JSON objects yield their keys with truthy values.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(x, str) and len(x) == 1 for x in value):
+            value = "".join(value)
+        else:
+            return list(value)
+    text = str(value).strip()
+    if text.startswith(("[", "{")):
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return [k for k, v in parsed.items() if v]
+        if isinstance(parsed, list):
+            return parsed
+    return [x.strip() for x in text.split(",") if x.strip()]
+
+
+def _amount(number: str, unit: str, fraction: str = "") -> float:
+    if not unit:
+        # Bare amounts use dots/commas as thousands separators: "1.500.000"
+        return float(re.sub(r"[.,]", "", number))
+    # With a unit, a single separator is a decimal point: "1,5 triệu", "1.5tr"
+    if number.count('.') + number.count(',') == 1:
+        value = float(number.replace(',', '.'))
+    else:
+        value = float(re.sub(r"[.,]", "", number))
+    # "1tr5" is 1.5 triệu
+    if fraction:
+        value += int(fraction) / 10
+    return value * _PRICE_UNITS[unit]
+
+
+def parse_price(text) -> Optional[float]:
+    """Lowest VND amount in a free-text price or range ("500k - 1,2 triệu" -> 500000, "1-2 triệu" -> 1000000)"""
+    if not text:
+        return None
+    matches = _PRICE.findall(fold_diacritics(str(text).lower()))
+    prices = []
+    for i, (number, unit, fraction) in enumerate(matches):
+        if not unit and i + 1 < len(matches) and matches[i + 1][1] and len(re.sub(r"[.,]", "", number)) <= 3:
+            # "1-2 triệu": the unit after the range applies to both ends
+            unit = matches[i + 1][1]
+        prices.append(_amount(number, unit, fraction))
+    return min(prices) if prices else None
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.activity import ActivityCreate, ActivityUpdate, ActivityResponse
+from app.schemas.pagination import Page
 from app.models.tables import activities
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -11,14 +15,18 @@ router = APIRouter()
 async def create_activity(activity: ActivityCreate, db=Depends(get_db)):
     query = activities.insert().values(**activity.model_dump())
     last_id = await db.execute(query)
+    await notify_change(db, "activities", last_id)
     return {**activity.model_dump(), "id": last_id}
 
 
-@router.get("/", response_model=List[dict])
-async def get_activities(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = activities.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results] 
+@router.post("/bulk", response_model=dict)
+async def bulk_load_activities(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, activities, ActivityCreate)
+
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_activities(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, activities, skip, limit, cursor)
 
 
 @router.get("/{activity_id}", response_model=dict)
@@ -38,6 +46,7 @@ async def update_activity(activity_id: int, activity: ActivityUpdate, db=Depends
 
     query = activities.update().where(activities.c.id == activity_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "activities", activity_id)
 
     query_select = activities.select().where(activities.c.id == activity_id)
     updated = await db.fetch_one(query_select)
@@ -50,4 +59,5 @@ async def update_activity(activity_id: int, activity: ActivityUpdate, db=Depends
 async def delete_activity(activity_id: int, db=Depends(get_db)):
     query = activities.delete().where(activities.c.id == activity_id)
     await db.execute(query)
+    await notify_change(db, "activities", activity_id)
     return {"message": "Activity deleted"}
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.destination import DestinationCreate, DestinationUpdate, DestinationResponse
+from app.schemas.pagination import Page
 from app.models.tables import destinations
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,14 +14,18 @@ router = APIRouter()
 async def create_destination(destination: DestinationCreate, db=Depends(get_db)):
     query = destinations.insert().values(**destination.dict())
     last_id = await db.execute(query)
+    await notify_change(db, "destinations", last_id)
     return {**destination.dict(), "id": last_id}
 
 
-@router.get("/", response_model=List[dict])
-async def get_destinations(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = destinations.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results] 
+@router.post("/bulk", response_model=dict)
+async def bulk_load_destinations(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, destinations, DestinationCreate)
+
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_destinations(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, destinations, skip, limit, cursor)
 
 
 @router.get("/{destination_id}", response_model=dict)
@@ -37,6 +45,7 @@ async def update_destination(destination_id: int, destination: DestinationUpdate
 
     query = destinations.update().where(destinations.c.id == destination_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "destinations", destination_id)
     
     query_select = destinations.select().where(destinations.c.id == destination_id)
     updated = await db.fetch_one(query_select)
@@ -48,4 +57,5 @@ async def update_destination(destination_id: int, destination: DestinationUpdate
 async def delete_destination(destination_id: int, db=Depends(get_db)):
     query = destinations.delete().where(destinations.c.id == destination_id)
     await db.execute(query)
+    await notify_change(db, "destinations", destination_id)
     return {"message": "Destination deleted"}
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import List, Optional, Union
 from app.schemas.event import EventCreate, EventResponse
+from app.schemas.pagination import Page
 from app.models.tables import events
 from app.api.deps import get_db
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -14,11 +16,9 @@ async def create_event(event: EventCreate, db=Depends(get_db)):
     return {**event.model_dump(), "id": last_id}
 
 
-@router.get("/", response_model=List[dict])
-async def get_events(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = events.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results] 
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_events(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, events, skip, limit, cursor)
 
 
 @router.get("/{event_id}", response_model=dict)
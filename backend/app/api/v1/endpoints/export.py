@@ -0,0 +1,65 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.models.tables import metadata
+from app.api.deps import get_db
+from app.core.responses import dumps
+
+router = APIRouter()
+
+# Rows buffered into one chunk of the response body
+EXPORT_CHUNK_ROWS = 500
+
+
+def _export_tables():
+    """Tables with a single-column primary key, exported in key order (resumable with after_id).
+
+    tour_destinations (composite key) is left out: it is rebuilt from tours.destinations.
+    """
+    tables = {}
+    for name, table in metadata.tables.items():
+        key = list(table.primary_key.columns)
+        if len(key) == 1:
+            tables[name] = (table, key[0])
+    return tables
+
+
+EXPORT_TABLES = _export_tables()
+
+
+async def _ndjson(db, query):
+    chunk = []
+    async for record in db.iterate(query):
+        chunk.append(dumps(record))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+@router.get("/{table_name}")
+async def export_table(table_name: str, after_id: Optional[int] = None,
+                       limit: Optional[int] = Query(None, ge=1), db=Depends(get_db)):
+    """Stream a whole table as newline-delimited JSON, one row per line, in primary key order.
+
+    Rows come from a server-side cursor, so memory stays flat however large the table is.
+    After an interrupted download, call again with ``after_id`` set to the last key received.
+    """
+    entry = EXPORT_TABLES.get(table_name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table_name}")
+    table, key = entry
+
+    query = table.select()
+    if after_id is not None:
+        query = query.where(key > after_id)
+    query = query.order_by(key)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return StreamingResponse(
+        _ndjson(db, query),
+        media_type="application/x-ndjson",
+        headers={"X-Export-Key": key.name},
+    )
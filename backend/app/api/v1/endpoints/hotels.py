@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.hotel import HotelCreate, HotelUpdate, HotelResponse
+from app.schemas.pagination import Page
 from app.models.tables import hotels
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -11,54 +15,18 @@ router = APIRouter()
 async def create_hotel(hotel: HotelCreate, db=Depends(get_db)):
     query = hotels.insert().values(**hotel.dict())
     last_id = await db.execute(query)
+    await notify_change(db, "hotels", last_id)
     return {**hotel.dict(), "id": last_id}
 
 
-@router.get("/", response_model=List[dict])
-async def get_hotels(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = hotels.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    
-    processed_results = []
-    for r in results:
-        item = dict(r)
-        amenities = item.get("amenities")
-        
-        # Handle amenities anomalies
-        if amenities:
-            # Case 1: List of characters ["{", "\"", "s", ...] -> Join and Parse
-            if isinstance(amenities, list) and len(amenities) > 0 and len(str(amenities[0])) == 1:
-                try:
-                    joined = "".join(str(x) for x in amenities)
-                    import json
-                    if joined.strip().startswith('{') or joined.strip().startswith('['):
-                        parsed = json.loads(joined)
-                        if isinstance(parsed, dict):
-                            item["amenities"] = [k for k, v in parsed.items() if v]
-                        elif isinstance(parsed, list):
-                            item["amenities"] = parsed
-                except Exception:
-                    pass
-            
-            # Case 2: String "{...}" or "[...]" -> Parse
-            elif isinstance(amenities, str):
-                try:
-                    import json
-                    if amenities.strip().startswith('{') or amenities.strip().startswith('['):
-                        parsed = json.loads(amenities)
-                        if isinstance(parsed, dict):
-                            item["amenities"] = [k for k, v in parsed.items() if v]
-                        elif isinstance(parsed, list):
-                            item["amenities"] = parsed
-                    elif "," in amenities:
-                        item["amenities"] = [x.strip() for x in amenities.split(",")]
-                    else:
-                        item["amenities"] = [amenities]
-                except Exception:
-                    item["amenities"] = [amenities]
+@router.post("/bulk", response_model=dict)
+async def bulk_load_hotels(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, hotels, HotelCreate)
 
-        processed_results.append(item)
-    return processed_results  
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_hotels(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, hotels, skip, limit, cursor)
 
 
 @router.get("/{hotel_id}", response_model=dict)
@@ -67,40 +35,7 @@ async def get_hotel(hotel_id: int, db=Depends(get_db)):
     result = await db.fetch_one(query)
     if not result:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    
-    item = dict(result)
-    amenities = item.get("amenities")
-    
-    if amenities:
-        if isinstance(amenities, list) and len(amenities) > 0 and len(str(amenities[0])) == 1:
-            try:
-                joined = "".join(str(x) for x in amenities)
-                import json
-                if joined.strip().startswith('{') or joined.strip().startswith('['):
-                    parsed = json.loads(joined)
-                    if isinstance(parsed, dict):
-                        item["amenities"] = [k for k, v in parsed.items() if v]
-                    elif isinstance(parsed, list):
-                        item["amenities"] = parsed
-            except Exception:
-                pass
-        elif isinstance(amenities, str):
-            try:
-                import json
-                if amenities.strip().startswith('{') or amenities.strip().startswith('['):
-                    parsed = json.loads(amenities)
-                    if isinstance(parsed, dict):
-                        item["amenities"] = [k for k, v in parsed.items() if v]
-                    elif isinstance(parsed, list):
-                        item["amenities"] = parsed
-                elif "," in amenities:
-                    item["amenities"] = [x.strip() for x in amenities.split(",")]
-                else:
-                     item["amenities"] = [amenities]
-            except:
-                pass
-            
-    return item 
+    return dict(result)
 
 
 @router.put("/{hotel_id}", response_model=dict)
@@ -111,6 +46,7 @@ async def update_hotel(hotel_id: int, hotel: HotelUpdate, db=Depends(get_db)):
 
     query = hotels.update().where(hotels.c.id == hotel_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "hotels", hotel_id)
 
     query_select = hotels.select().where(hotels.c.id == hotel_id)
     updated = await db.fetch_one(query_select)
@@ -123,4 +59,5 @@ async def update_hotel(hotel_id: int, hotel: HotelUpdate, db=Depends(get_db)):
 async def delete_hotel(hotel_id: int, db=Depends(get_db)):
     query = hotels.delete().where(hotels.c.id == hotel_id)
     await db.execute(query)
+    await notify_change(db, "hotels", hotel_id)
     return {"message": "Hotel deleted"}
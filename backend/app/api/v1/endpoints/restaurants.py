@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.restaurant import RestaurantCreate, RestaurantUpdate, RestaurantResponse
+from app.schemas.pagination import Page
 from app.models.tables import restaurants
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,13 +14,17 @@ router = APIRouter()
 async def create_restaurant(restaurant: RestaurantCreate, db=Depends(get_db)):
     query = restaurants.insert().values(**restaurant.dict())
     last_id = await db.execute(query)
+    await notify_change(db, "restaurants", last_id)
     return {**restaurant.dict(), "id": last_id}
 
-@router.get("/", response_model=List[dict])
-async def get_restaurants(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = restaurants.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results]
+@router.post("/bulk", response_model=dict)
+async def bulk_load_restaurants(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, restaurants, RestaurantCreate)
+
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_restaurants(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, restaurants, skip, limit, cursor)
 
 @router.get("/{restaurant_id}", response_model=dict)
 async def get_restaurant(restaurant_id: int, db=Depends(get_db)):
@@ -33,6 +41,7 @@ async def update_restaurant(restaurant_id: int, restaurant: RestaurantUpdate, db
         raise HTTPException(status_code=400, detail="No fields to update")
     query = restaurants.update().where(restaurants.c.id == restaurant_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "restaurants", restaurant_id)
     query_select = restaurants.select().where(restaurants.c.id == restaurant_id)
     updated = await db.fetch_one(query_select)
     if not updated:
@@ -43,4 +52,5 @@ async def update_restaurant(restaurant_id: int, restaurant: RestaurantUpdate, db
 async def delete_restaurant(restaurant_id: int, db=Depends(get_db)):
     query = restaurants.delete().where(restaurants.c.id == restaurant_id)
     await db.execute(query)
+    await notify_change(db, "restaurants", restaurant_id)
     return {"message": "Restaurant deleted"}
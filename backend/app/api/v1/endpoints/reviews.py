@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import List, Optional, Union
 from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
+from app.schemas.pagination import Page
 from app.models.tables import reviews
 from app.api.deps import get_db
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,13 +13,12 @@ router = APIRouter()
 async def create_review(review: ReviewCreate, db=Depends(get_db)):
     query = reviews.insert().values(**review.model_dump())
     last_id = await db.execute(query)
+    await notify_change(db, "reviews", last_id)
     return {**review.model_dump(), "id": last_id}
 
-@router.get("/", response_model=List[dict])
-async def get_reviews(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = reviews.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results]
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_reviews(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, reviews, skip, limit, cursor)
 
 @router.get("/{review_id}", response_model=dict)
 async def get_review(review_id: int, db=Depends(get_db)):
@@ -33,6 +35,7 @@ async def update_review(review_id: int, review: ReviewUpdate, db=Depends(get_db)
         raise HTTPException(status_code=400, detail="No fields to update")
     query = reviews.update().where(reviews.c.id == review_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "reviews", review_id)
     query_select = reviews.select().where(reviews.c.id == review_id)
     updated = await db.fetch_one(query_select)
     if not updated:
@@ -43,4 +46,5 @@ async def update_review(review_id: int, review: ReviewUpdate, db=Depends(get_db)
 async def delete_review(review_id: int, db=Depends(get_db)):
     query = reviews.delete().where(reviews.c.id == review_id)
     await db.execute(query)
+    await notify_change(db, "reviews", review_id)
     return {"message": "Review deleted"}
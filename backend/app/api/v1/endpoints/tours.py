@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import List, Optional, Union
 from app.schemas.tour import TourCreate, TourUpdate, TourResponse
+from app.schemas.pagination import Page
 from app.models.tables import tours
 from app.api.deps import get_db
+from app.services.notify import notify_change
+from app.services.tour_links import sync_tour_destinations
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,13 +14,13 @@ router = APIRouter()
 async def create_tour(tour: TourCreate, db=Depends(get_db)):
     query = tours.insert().values(**tour.dict())
     last_id = await db.execute(query)
+    await sync_tour_destinations(db, last_id)
+    await notify_change(db, "tours", last_id)
     return {**tour.dict(), "id": last_id}
 
-@router.get("/", response_model=List[dict])
-async def get_tours(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = tours.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results]
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_tours(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, tours, skip, limit, cursor)
 
 @router.get("/{tour_id}", response_model=dict)
 async def get_tour(tour_id: int, db=Depends(get_db)):
@@ -33,6 +37,9 @@ async def update_tour(tour_id: int, tour: TourUpdate, db=Depends(get_db)):
         raise HTTPException(status_code=400, detail="No fields to update")
     query = tours.update().where(tours.c.id == tour_id).values(**update_data)
     await db.execute(query)
+    if "destinations" in update_data:
+        await sync_tour_destinations(db, tour_id)
+    await notify_change(db, "tours", tour_id)
     query_select = tours.select().where(tours.c.id == tour_id)
     updated = await db.fetch_one(query_select)
     if not updated:
@@ -43,4 +50,5 @@ async def update_tour(tour_id: int, tour: TourUpdate, db=Depends(get_db)):
 async def delete_tour(tour_id: int, db=Depends(get_db)):
     query = tours.delete().where(tours.c.id == tour_id)
     await db.execute(query)
+    await notify_change(db, "tours", tour_id)
     return {"message": "Tour deleted"}
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.transportation import TransportationCreate, TransportationUpdate, TransportationResponse
+from app.schemas.pagination import Page
 from app.models.tables import transportation
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,13 +14,17 @@ router = APIRouter()
 async def create_transportation(trans: TransportationCreate, db=Depends(get_db)):
     query = transportation.insert().values(**trans.model_dump())
     last_id = await db.execute(query)
+    await notify_change(db, "transportation", last_id)
     return {**trans.model_dump(), "id": last_id}
 
-@router.get("/", response_model=List[dict])
-async def get_transportations(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = transportation.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results]
+@router.post("/bulk", response_model=dict)
+async def bulk_load_transportation(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, transportation, TransportationCreate)
+
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_transportations(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, transportation, skip, limit, cursor)
 
 @router.get("/{trans_id}", response_model=dict)
 async def get_transportation(trans_id: int, db=Depends(get_db)):
@@ -33,6 +41,7 @@ async def update_transportation(trans_id: int, trans: TransportationUpdate, db=D
         raise HTTPException(status_code=400, detail="No fields to update")
     query = transportation.update().where(transportation.c.id == trans_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "transportation", trans_id)
     query_select = transportation.select().where(transportation.c.id == trans_id)
     updated = await db.fetch_one(query_select)
     if not updated:
@@ -43,4 +52,5 @@ async def update_transportation(trans_id: int, trans: TransportationUpdate, db=D
 async def delete_transportation(trans_id: int, db=Depends(get_db)):
     query = transportation.delete().where(transportation.c.id == trans_id)
     await db.execute(query)
+    await notify_change(db, "transportation", trans_id)
     return {"message": "Transportation deleted"}
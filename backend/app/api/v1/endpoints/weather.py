@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional, Union
 from app.schemas.weather import WeatherCreate, WeatherUpdate, WeatherResponse
+from app.schemas.pagination import Page
 from app.models.tables import weather
 from app.api.deps import get_db
+from app.services.bulk import bulk_load
+from app.services.notify import notify_change
+from app.services.pagination import paginate
 
 router = APIRouter()
 
@@ -10,13 +14,17 @@ router = APIRouter()
 async def create_weather(w: WeatherCreate, db=Depends(get_db)):
     query = weather.insert().values(**w.model_dump())
     last_id = await db.execute(query)
+    await notify_change(db, "weather", last_id)
     return {**w.model_dump(), "id": last_id}
 
-@router.get("/", response_model=List[dict])
-async def get_weathers(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    query = weather.select().offset(skip).limit(limit)
-    results = await db.fetch_all(query)
-    return [dict(r) for r in results]
+@router.post("/bulk", response_model=dict)
+async def bulk_load_weather(request: Request, db=Depends(get_db)):
+    return await bulk_load(db, request, weather, WeatherCreate)
+
+
+@router.get("/", response_model=Union[List[dict], Page])
+async def get_weathers(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, db=Depends(get_db)):
+    return await paginate(db, weather, skip, limit, cursor)
 
 @router.get("/{weather_id}", response_model=dict)
 async def get_weather(weather_id: int, db=Depends(get_db)):
@@ -33,6 +41,7 @@ async def update_weather(weather_id: int, w: WeatherUpdate, db=Depends(get_db)):
         raise HTTPException(status_code=400, detail="No fields to update")
     query = weather.update().where(weather.c.id == weather_id).values(**update_data)
     await db.execute(query)
+    await notify_change(db, "weather", weather_id)
     query_select = weather.select().where(weather.c.id == weather_id)
     updated = await db.fetch_one(query_select)
     if not updated:
@@ -43,4 +52,5 @@ async def update_weather(weather_id: int, w: WeatherUpdate, db=Depends(get_db)):
 async def delete_weather(weather_id: int, db=Depends(get_db)):
     query = weather.delete().where(weather.c.id == weather_id)
     await db.execute(query)
+    await notify_change(db, "weather", weather_id)
     return {"message": "Weather deleted"}
@@ -9,7 +9,8 @@ from app.api.v1.endpoints import (
     weather,
     reviews,
     events,
-    upload
+    upload,
+    export
 )
 
 api_router = APIRouter()
@@ -24,3 +25,4 @@ api_router.include_router(weather.router, prefix="/weather", tags=["Weather"])
 api_router.include_router(reviews.router, prefix="/reviews", tags=["Reviews"])
 api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(upload.router, prefix="/upload", tags=["Upload"])
+api_router.include_router(export.router, prefix="/export", tags=["Export"])
@@ -0,0 +1,24 @@
+"""Pydantic 1/2 helpers: uv.lock pins pydantic 1.10, requirements.txt installs the latest"""
+try:
+    from pydantic import field_validator
+except ImportError:  # pydantic 1
+    field_validator = None
+    from pydantic import validator
+
+PYDANTIC_V2 = field_validator is not None
+
+
+def before_validator(*fields):
+    """Validator for ``fields`` that runs before type coercion; decorate a ``(cls, value)`` method"""
+    if PYDANTIC_V2:
+        return field_validator(*fields, mode="before")
+    return validator(*fields, pre=True, allow_reuse=True)
+
+
+def model_fields(schema) -> dict:
+    """Field name -> field info of a model class"""
+    return schema.model_fields if PYDANTIC_V2 else schema.__fields__
+
+
+def model_dump(model, **kwargs) -> dict:
+    return model.model_dump(**kwargs) if PYDANTIC_V2 else model.dict(**kwargs)
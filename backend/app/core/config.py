@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "Travel Chatbot API"
+    # List routes serialize records with RecordsJSONResponse (orjson when installed)
+    FAST_JSON_RESPONSES: bool = False
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,45 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json keeps the same output, only slower
+    orjson = None
+
+
+def _default(value: Any):
+    """Types the JSON encoders do not know: database records, Decimal, dates"""
+    # databases records expose their row as ``_mapping``; their keys() is deprecated
+    mapping = getattr(value, "_mapping", None)
+    if mapping is not None:
+        return dict(mapping)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Decimal):
+        # Same as FastAPI's encoder: whole numbers stay integers
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON for ``content``, which may hold database records"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class RecordsJSONResponse(JSONResponse):
+    """JSON response that serializes database records as they come from ``fetch_all``.
+
+    Returning it from a route skips response_model validation and jsonable_encoder;
+    response_model then only documents the route.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -13,8 +13,11 @@ destinations = sqlalchemy.Table(
     sqlalchemy.Column("rating", sqlalchemy.Numeric(2, 1), default=0),
     sqlalchemy.Column("description", sqlalchemy.Text),
     sqlalchemy.Column("best_time_to_visit", sqlalchemy.String(255)),
+    # Derived from weather by a trigger (migrations/0005_best_months.sql)
+    sqlalchemy.Column("best_months", sqlalchemy.ARRAY(sqlalchemy.SmallInteger)),
     sqlalchemy.Column("image_url", sqlalchemy.String(500)),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    # Trigram GIN indexes on lower(name/province/region) are created in migrations/0003_search_indexes.sql
 )
 
 activities = sqlalchemy.Table(
@@ -28,6 +31,7 @@ activities = sqlalchemy.Table(
     sqlalchemy.Column("duration", sqlalchemy.String(100)),
     sqlalchemy.Column("description", sqlalchemy.Text),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_activities_destination_id", "destination_id"),
 )
 
 hotels = sqlalchemy.Table(
@@ -43,6 +47,7 @@ hotels = sqlalchemy.Table(
     sqlalchemy.Column("amenities", sqlalchemy.ARRAY(sqlalchemy.Text)),
     sqlalchemy.Column("image_url", sqlalchemy.String(500)),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_hotels_destination_id", "destination_id"),
 )
 
 restaurants = sqlalchemy.Table(
@@ -57,6 +62,7 @@ restaurants = sqlalchemy.Table(
     sqlalchemy.Column("rating", sqlalchemy.Numeric(2, 1), default=0),
     sqlalchemy.Column("image_url", sqlalchemy.String(500)),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_restaurants_destination_id", "destination_id"),
 )
 
 tours = sqlalchemy.Table(
@@ -83,6 +89,8 @@ transportation = sqlalchemy.Table(
     sqlalchemy.Column("duration", sqlalchemy.String(100)),
     sqlalchemy.Column("price_range", sqlalchemy.String(100)),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_transportation_from_destination_id", "from_destination_id"),
+    sqlalchemy.Index("ix_transportation_to_destination_id", "to_destination_id"),
 )
 
 weather = sqlalchemy.Table(
@@ -95,6 +103,7 @@ weather = sqlalchemy.Table(
     sqlalchemy.Column("description", sqlalchemy.Text),
     sqlalchemy.Column("is_best_time", sqlalchemy.Boolean, default=False),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_weather_destination_id_month", "destination_id", "month"),
 )
 
 reviews = sqlalchemy.Table(
@@ -106,6 +115,32 @@ reviews = sqlalchemy.Table(
     sqlalchemy.Column("rating", sqlalchemy.Integer),
     sqlalchemy.Column("comment", sqlalchemy.Text),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("ix_reviews_entity", "entity_type", "entity_id", "created_at"),
+)
+
+# Maintained by triggers on hotels/restaurants/activities (migrations/0004_destination_costs.sql)
+destination_costs = sqlalchemy.Table(
+    "destination_costs",
+    metadata,
+    sqlalchemy.Column("destination_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("hotel_per_night", sqlalchemy.Numeric(12, 2), nullable=False),
+    sqlalchemy.Column("meal_price", sqlalchemy.Numeric(12, 2), nullable=False),
+    sqlalchemy.Column("activity_per_day", sqlalchemy.Numeric(12, 2), nullable=False),
+    sqlalchemy.Column("transport_estimate", sqlalchemy.Numeric(12, 2), nullable=False, default=500000),
+    sqlalchemy.Column("hotel_count", sqlalchemy.Integer, nullable=False, default=0),
+    sqlalchemy.Column("restaurant_count", sqlalchemy.Integer, nullable=False, default=0),
+    sqlalchemy.Column("activity_count", sqlalchemy.Integer, nullable=False, default=0),
+    sqlalchemy.Column("updated_at", sqlalchemy.DateTime, default=datetime.utcnow),
+)
+
+# Kept in sync with tours.destinations by sync_tour_destinations() (migrations/0006_tour_destinations.sql)
+tour_destinations = sqlalchemy.Table(
+    "tour_destinations",
+    metadata,
+    sqlalchemy.Column("tour_id", sqlalchemy.Integer, sqlalchemy.ForeignKey("tours.id", ondelete="CASCADE"), primary_key=True),
+    sqlalchemy.Column("destination_id", sqlalchemy.Integer, sqlalchemy.ForeignKey("destinations.id", ondelete="CASCADE"), primary_key=True),
+    sqlalchemy.Column("position", sqlalchemy.SmallInteger, nullable=False),
+    sqlalchemy.Index("ix_tour_destinations_destination_id", "destination_id", "tour_id"),
 )
 
 events = sqlalchemy.Table(
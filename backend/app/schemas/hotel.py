@@ -1,7 +1,40 @@
+import json
 from pydantic import BaseModel
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
+from app.core.compat import before_validator
+
+
+def normalize_amenities(value):
+    """Amenities as a clean list of names, same rules as normalize_amenities() in migrations/0007.
+
+    Accepts a list, a JSON list/object ('{"wifi": true}' keeps the keys switched on),
+    "wifi, spa", or a list holding one of those texts one character per element.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        if len(value) > 1 and all(isinstance(x, str) and len(x) == 1 for x in value):
+            value = "".join(value)
+        elif len(value) == 1 and isinstance(value[0], str):
+            value = value[0]
+        else:
+            return [str(x).strip() for x in value if str(x).strip()]
+    if not isinstance(value, str):
+        raise ValueError("amenities must be a list of strings")
+    text = value.strip()
+    if text.startswith(("[", "{")):
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return [str(k) for k, v in parsed.items() if v]
+        if isinstance(parsed, list):
+            return [str(x).strip() for x in parsed if str(x).strip()]
+    return [x.strip() for x in text.split(",") if x.strip()]
+
 
 class HotelBase(BaseModel):
     name: str
@@ -13,6 +46,10 @@ class HotelBase(BaseModel):
     amenities: Optional[List[str]] = None
     image_url: Optional[str] = None
 
+    @before_validator("amenities")
+    def clean_amenities(cls, value):
+        return normalize_amenities(value)
+
 class HotelCreate(HotelBase):
     pass
 
@@ -26,6 +63,10 @@ class HotelUpdate(BaseModel):
     amenities: Optional[List[str]] = None
     image_url: Optional[str] = None
 
+    @before_validator("amenities")
+    def clean_amenities(cls, value):
+        return normalize_amenities(value)
+
 class HotelResponse(HotelBase):
     id: int
     created_at: Optional[datetime] = None
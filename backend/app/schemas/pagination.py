@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class Page(BaseModel):
+    data: List[dict]
+    next_cursor: Optional[str] = None
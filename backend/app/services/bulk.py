@@ -0,0 +1,226 @@
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Type
+
+import asyncpg
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from app.core.compat import model_dump, model_fields
+from app.services.notify import notify_change
+
+logger = logging.getLogger(__name__)
+
+# Rows sent to the database per COPY / upsert statement
+BULK_BATCH_ROWS = 5000
+# Rejected rows listed in the response; later ones are only counted
+MAX_REPORTED_ERRORS = 1000
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+# Derived data the triggers would refresh per row or per statement (migrations 0004, 0005,
+# 0008, 0009, 0010): a bulk load switches them off and runs the refresh once at the end.
+# table -> (column whose old and new values are collected, statement taking them as $1)
+_REFRESH_COSTS = "SELECT refresh_destination_costs(id) FROM unnest($1::int[]) AS id"
+REFRESH_FUNCTIONS: Dict[str, Tuple[str, str]] = {
+    "hotels": ("destination_id", _REFRESH_COSTS),
+    "restaurants": ("destination_id", _REFRESH_COSTS),
+    "activities": ("destination_id", _REFRESH_COSTS),
+    "transportation": ("to_destination_id", _REFRESH_COSTS),
+    "weather": ("destination_id", "SELECT refresh_best_months(id) FROM unnest($1::int[]) AS id"),
+    # Old and new names, so tours that named a renamed destination are relinked too
+    "destinations": ("name", "SELECT relink_destination_tours($1::text[])"),
+}
+
+
+def _parse_line(line: bytes) -> Tuple[object, Optional[str]]:
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"invalid JSON: {e}"
+
+
+async def request_rows(request: Request) -> AsyncIterator[Tuple[int, object, Optional[str]]]:
+    """(row index, item, parse error) from a JSON array body or an NDJSON stream.
+
+    NDJSON is read as it arrives, so the whole body never has to be held in memory.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        index, pending = 0, b""
+        async for chunk in request.stream():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *_parse_line(line))
+                    index += 1
+        if pending.strip():
+            yield (index, *_parse_line(pending))
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of objects")
+    for index, item in enumerate(body):
+        yield index, item, None
+
+
+class BulkLoader:
+    """Validates rows with a Create schema and loads them a batch at a time.
+
+    Rows without an ``id`` are COPYed straight into the table; rows with one are COPYed
+    into a staging table and upserted with INSERT ... ON CONFLICT (id) DO UPDATE, which
+    replaces every schema column. A batch the database rejects is retried row by row so
+    the response can name the offending rows; the rest of the batch is still loaded.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, table, schema: Type[BaseModel]):
+        self.conn = conn
+        self.table = table.name
+        self.schema = schema
+        self.columns = [name for name in model_fields(schema) if name in table.c]
+        self.inserted = 0
+        self.updated = 0
+        self.rejected = 0
+        self.errors: List[dict] = []
+        self._batch: List[Tuple[int, Optional[int], tuple]] = []
+        self._staging: Optional[str] = None
+        self._explicit_ids = False
+        self._refresh = REFRESH_FUNCTIONS.get(self.table)
+        self._touched: Set[object] = set()
+
+        columns = ", ".join(f'"{c}"' for c in self.columns)
+        updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in self.columns)
+        values = ", ".join(f"${i}" for i in range(1, len(self.columns) + 1))
+        self._columns_sql = columns
+        self._upsert_tail = f"ON CONFLICT (id) DO UPDATE SET {updates} RETURNING (xmax = 0) AS inserted"
+        self._insert_row = f"INSERT INTO {self.table} ({columns}) VALUES ({values})"
+        self._upsert_row = (f"INSERT INTO {self.table} (id, {columns}) "
+                            f"VALUES (${len(self.columns) + 1}, {values}) {self._upsert_tail}")
+
+    async def start(self):
+        if self._refresh:
+            await self.conn.execute("SELECT set_config('app.bulk_load', 'on', true)")
+
+    def _reject(self, index: int, errors: List[str]):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": index, "errors": errors})
+
+    async def add(self, index: int, item, error: Optional[str] = None):
+        if error is not None:
+            self._reject(index, [error])
+            return
+        if not isinstance(item, dict):
+            self._reject(index, ["row must be a JSON object"])
+            return
+        row_id = item.get("id")
+        if row_id is not None and (not isinstance(row_id, int) or isinstance(row_id, bool) or row_id < 1):
+            self._reject(index, ["id: must be a positive integer"])
+            return
+        try:
+            row = model_dump(self.schema(**item))
+        except ValidationError as e:
+            self._reject(index, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()])
+            return
+        values = tuple(row[c] for c in self.columns)
+        if self._refresh and row.get(self._refresh[0]) is not None:
+            self._touched.add(row[self._refresh[0]])
+        self._batch.append((index, row_id, values))
+        if len(self._batch) >= BULK_BATCH_ROWS:
+            await self.flush()
+
+    async def _touch_existing(self, where: str, *args):
+        """Collect the refresh column of rows an upsert is about to overwrite"""
+        if self._refresh:
+            column = self._refresh[0]
+            rows = await self.conn.fetch(f'SELECT DISTINCT t."{column}" FROM {where}', *args)
+            self._touched.update(r[column] for r in rows if r[column] is not None)
+
+    async def _load_batch(self, new: List[tuple], keyed: List[tuple]) -> Tuple[int, int]:
+        inserted = updated = 0
+        if new:
+            await self.conn.copy_records_to_table(self.table, records=new, columns=self.columns)
+            inserted += len(new)
+        if keyed:
+            await self.conn.copy_records_to_table(self._staging, records=keyed, columns=["id", *self.columns])
+            await self._touch_existing(f"{self.table} t JOIN {self._staging} s ON s.id = t.id")
+            results = await self.conn.fetch(
+                f"INSERT INTO {self.table} (id, {self._columns_sql}) "
+                f"SELECT id, {self._columns_sql} FROM {self._staging} {self._upsert_tail}")
+            await self.conn.execute(f"TRUNCATE {self._staging}")
+            batch_inserted = sum(1 for r in results if r["inserted"])
+            inserted += batch_inserted
+            updated += len(results) - batch_inserted
+        return inserted, updated
+
+    async def _load_rows(self, batch: List[Tuple[int, Optional[int], tuple]]):
+        """Row by row, each in its own savepoint, to report which rows the database rejects"""
+        for index, row_id, values in batch:
+            try:
+                async with self.conn.transaction():
+                    if row_id is None:
+                        await self.conn.execute(self._insert_row, *values)
+                        self.inserted += 1
+                    else:
+                        await self._touch_existing(f"{self.table} t WHERE t.id = $1", row_id)
+                        if await self.conn.fetchval(self._upsert_row, *values, row_id):
+                            self.inserted += 1
+                        else:
+                            self.updated += 1
+            except (asyncpg.PostgresError, asyncpg.DataError) as e:
+                self._reject(index, [str(e)])
+
+    async def flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        new = [values for _, row_id, values in batch if row_id is None]
+        keyed = [(row_id, *values) for _, row_id, values in batch if row_id is not None]
+        self._explicit_ids = self._explicit_ids or bool(keyed)
+        if keyed and self._staging is None:
+            # Created outside the batch savepoint so a rolled back batch does not drop it
+            self._staging = f"bulk_{self.table}"
+            await self.conn.execute(f"CREATE TEMP TABLE {self._staging} (LIKE {self.table}) ON COMMIT DROP")
+        try:
+            async with self.conn.transaction():
+                inserted, updated = await self._load_batch(new, keyed)
+        except (asyncpg.PostgresError, asyncpg.DataError) as e:
+            logger.info(f"Bulk load into {self.table}: batch of {len(batch)} rejected ({e}), retrying row by row")
+            await self._load_rows(batch)
+            return
+        self.inserted += inserted
+        self.updated += updated
+
+    async def finish(self) -> dict:
+        await self.flush()
+        if self._explicit_ids:
+            # Explicit ids bypass the sequence: move it past them so later inserts do not collide
+            await self.conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{self.table}', 'id'), "
+                f"GREATEST((SELECT max(id) FROM {self.table}), 1))")
+        if self._refresh and self._touched:
+            await self.conn.execute("SELECT set_config('app.bulk_load', 'off', true)")
+            await self.conn.execute(self._refresh[1], sorted(self._touched))
+        return {"inserted": self.inserted, "updated": self.updated,
+                "rejected": self.rejected, "errors": self.errors}
+
+
+async def bulk_load(db, request: Request, table, schema: Type[BaseModel]) -> dict:
+    """Load a JSON array or NDJSON body into ``table`` in one transaction; bad rows are reported, not fatal"""
+    async with db.connection() as connection:
+        conn = connection.raw_connection
+        async with conn.transaction():
+            loader = BulkLoader(conn, table, schema)
+            await loader.start()
+            async for index, item, error in request_rows(request):
+                await loader.add(index, item, error)
+            report = await loader.finish()
+    logger.info(f"Bulk load into {table.name}: {report['inserted']} inserted, "
+                f"{report['updated']} updated, {report['rejected']} rejected")
+    if report["inserted"] or report["updated"]:
+        await notify_change(db, table.name)
+    return report
@@ -0,0 +1,14 @@
+import json
+from typing import Optional
+
+# Must match CATALOG_CHANNEL in actions/db.py, the action server LISTENs on it
+CATALOG_CHANNEL = "catalog_changed"
+
+
+async def notify_change(db, table: str, row_id: Optional[int] = None):
+    """Tell listeners (the action server caches) that a catalog table changed"""
+    payload = json.dumps({"table": table, "id": row_id})
+    await db.execute(
+        query="SELECT pg_notify(:channel, :payload)",
+        values={"channel": CATALOG_CHANNEL, "payload": payload},
+    )
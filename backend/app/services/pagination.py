@@ -0,0 +1,58 @@
+import json
+import base64
+import binascii
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.responses import RecordsJSONResponse
+
+# Upper bound on a cursor page; legacy skip/limit requests are left as they were
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """Last id seen from an opaque cursor; the empty cursor starts at the beginning"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+async def paginate(db, table, skip: int, limit: int, cursor: Optional[str] = None):
+    """List rows of ``table``, by keyset when a ``cursor`` is given, else by skip/limit.
+
+    Keyset pages are ordered by id and returned as ``{"data": [...], "next_cursor": ...}``;
+    pass ``cursor=`` (empty) for the first page and stop when ``next_cursor`` is null.
+    Each page is one index range scan on the primary key, however deep it is.
+    Without a cursor the old plain list is returned. With FAST_JSON_RESPONSES the records
+    are serialized straight into a RecordsJSONResponse.
+    """
+    fast = settings.FAST_JSON_RESPONSES
+    if cursor is None:
+        results = await db.fetch_all(table.select().offset(skip).limit(limit))
+        return RecordsJSONResponse(results) if fast else [dict(r) for r in results]
+
+    last_id = decode_cursor(cursor)
+    size = max(1, min(limit, MAX_PAGE_SIZE))
+    query = table.select()
+    if last_id is not None:
+        query = query.where(table.c.id > last_id)
+    # One extra row tells whether another page follows
+    results = await db.fetch_all(query.order_by(table.c.id).limit(size + 1))
+    next_cursor = encode_cursor(results[size - 1]["id"]) if len(results) > size else None
+    if fast:
+        return RecordsJSONResponse({"data": results[:size], "next_cursor": next_cursor})
+    return {"data": [dict(r) for r in results[:size]], "next_cursor": next_cursor}
@@ -0,0 +1,6 @@
+async def sync_tour_destinations(db, tour_id: int) -> int:
+    """Rebuild the tour_destinations rows for one tour from its destinations column"""
+    return await db.fetch_val(
+        query="SELECT sync_tour_destinations(:tour_id)",
+        values={"tour_id": tour_id},
+    )
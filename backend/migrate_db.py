@@ -1,62 +1,133 @@
 import sys
 import os
+import re
+import argparse
 # Add the current directory to sys.path so we can import app
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from app.core.config import settings
-except ImportError as e:
-    print(f"Error importing settings: {e}")
-    # Fallback/Hardcoded if strictly necessary or ask user to check env
-    sys.exit(1)
-
 import psycopg2
-from urllib.parse import urlparse
 
-def migrate():
-    print(f"Starting migration...")
-    
-    url = settings.DATABASE_URL
-    print(f"Database URL found (masked): {url.split('@')[1] if '@' in url else '...'}")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
 
+def get_database_url():
+    try:
+        from app.core.config import settings
+    except ImportError as e:
+        print(f"Error importing settings: {e}")
+        sys.exit(1)
+
+    url = settings.DATABASE_URL
     # Remove driver specific prefix if present for psycopg2
     if "postgresql+asyncpg://" in url:
         url = url.replace("postgresql+asyncpg://", "postgresql://")
-    
+    return url
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return [(version, name, path)] for every migration file, ordered by version"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(directory, filename)))
+
+    versions = [m[0] for m in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise RuntimeError(f"Duplicate migration versions: {', '.join(sorted(duplicates))}")
+    return migrations
+
+
+def ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(16) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        );
+    """)
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def migrate(url, directory=MIGRATIONS_DIR, target=None):
+    """Apply every pending migration up to ``target`` (inclusive), each in its own transaction"""
+    conn = psycopg2.connect(url)
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                ensure_migrations_table(cur)
+                done = applied_versions(cur)
+
+        pending = [m for m in discover_migrations(directory)
+                   if m[0] not in done and (target is None or m[0] <= target)]
+        if not pending:
+            print("Database is up to date.")
+            return []
+
+        for version, name, path in pending:
+            print(f"Applying {version}_{name}...")
+            with open(path, encoding="utf-8") as f:
+                sql = f.read()
+            with conn:
+                with conn.cursor() as cur:
+                    # Serialize concurrent runners on the same database
+                    cur.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+                    if version in applied_versions(cur):
+                        print(f"  {version} was applied concurrently, skipping.")
+                        continue
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name),
+                    )
+            print(f"  Applied {version}_{name}.")
+        return [m[0] for m in pending]
+    finally:
+        conn.close()
+
+
+def status(url, directory=MIGRATIONS_DIR):
+    conn = psycopg2.connect(url)
     try:
-        conn = psycopg2.connect(url)
-        conn.autocommit = True
-        cur = conn.cursor()
-        
-        tables = ['destinations', 'hotels', 'restaurants', 'tours']
-        column = 'image_url'
-        dtype = 'VARCHAR(500)'
-        
-        for table in tables:
-            print(f"Checking table '{table}'...")
-            try:
-                # Check if column exists
-                cur.execute(f"""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name='{table}' AND column_name='{column}';
-                """)
-                if not cur.fetchone():
-                    print(f"  Column '{column}' missing. Adding...")
-                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {dtype};")
-                    print(f"  Successfully added '{column}' to '{table}'.")
-                else:
-                    print(f"  Column '{column}' already exists.")
-            except Exception as e:
-                print(f"  Error processing table '{table}': {e}")
-                
-        cur.close()
+        with conn:
+            with conn.cursor() as cur:
+                ensure_migrations_table(cur)
+                done = applied_versions(cur)
+    finally:
         conn.close()
-        print("Migration completed successfully.")
-        
+
+    for version, name, _ in discover_migrations(directory):
+        state = "applied" if version in done else "pending"
+        print(f"{version}_{name}: {state}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned SQL migrations from backend/migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations and whether they are applied")
+    parser.add_argument("--target", help="stop after this version (e.g. 0003)")
+    parser.add_argument("--database-url", help="override DATABASE_URL from settings")
+    args = parser.parse_args()
+
+    url = args.database_url or get_database_url()
+    print(f"Database URL found (masked): {url.split('@')[1] if '@' in url else '...'}")
+
+    try:
+        if args.status:
+            status(url)
+        else:
+            migrate(url, target=args.target)
+            print("Migration completed successfully.")
     except Exception as e:
         print(f"Migration failed: {e}")
         print("Ensure the database is running and configuration is correct.")
+        sys.exit(1)
+
 
 if __name__ == "__main__":
-    migrate()
+    main()
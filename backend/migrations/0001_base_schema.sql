@@ -0,0 +1,95 @@
+-- Base schema, mirrors app/models/tables.py
+CREATE TABLE IF NOT EXISTS destinations (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    province VARCHAR(100) NOT NULL,
+    region VARCHAR(50) NOT NULL,
+    category VARCHAR(100),
+    rating NUMERIC(2, 1) DEFAULT 0,
+    description TEXT,
+    best_time_to_visit VARCHAR(255),
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    destination_id INTEGER,
+    type VARCHAR(100),
+    price NUMERIC(10, 2),
+    duration VARCHAR(100),
+    description TEXT,
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS hotels (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    address TEXT,
+    destination_id INTEGER,
+    star_rating INTEGER,
+    price_range VARCHAR(50),
+    rating NUMERIC(2, 1) DEFAULT 0,
+    amenities TEXT[],
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS restaurants (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    address TEXT,
+    destination_id INTEGER,
+    cuisine_type VARCHAR(100),
+    price_range VARCHAR(50),
+    rating NUMERIC(2, 1) DEFAULT 0,
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS tours (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    destinations TEXT,
+    duration_days INTEGER,
+    price NUMERIC(10, 2),
+    description TEXT,
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS transportation (
+    id SERIAL PRIMARY KEY,
+    from_destination_id INTEGER,
+    to_destination_id INTEGER,
+    type VARCHAR(50),
+    duration VARCHAR(100),
+    price_range VARCHAR(100),
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS weather (
+    id SERIAL PRIMARY KEY,
+    destination_id INTEGER,
+    month INTEGER,
+    avg_temp NUMERIC(4, 1),
+    description TEXT,
+    is_best_time BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id SERIAL PRIMARY KEY,
+    entity_type VARCHAR(50),
+    entity_id INTEGER,
+    rating INTEGER,
+    comment TEXT,
+    created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id SERIAL PRIMARY KEY,
+    sender_id VARCHAR(255) NOT NULL,
+    type_name VARCHAR(255) NOT NULL,
+    timestamp DOUBLE PRECISION,
+    intent_name VARCHAR(255),
+    action_name VARCHAR(255),
+    data TEXT
+);
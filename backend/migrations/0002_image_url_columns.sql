@@ -0,0 +1,5 @@
+-- Replaces the original one-off migrate_db.py script
+ALTER TABLE destinations ADD COLUMN IF NOT EXISTS image_url VARCHAR(500);
+ALTER TABLE hotels ADD COLUMN IF NOT EXISTS image_url VARCHAR(500);
+ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS image_url VARCHAR(500);
+ALTER TABLE tours ADD COLUMN IF NOT EXISTS image_url VARCHAR(500);
@@ -0,0 +1,23 @@
+-- Indexes for the action server's hot search paths
+
+-- Trigram indexes serve LOWER(col) LIKE '%x%' filters and the % similarity operator
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_destinations_name_trgm
+    ON destinations USING gin (lower(name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_destinations_province_trgm
+    ON destinations USING gin (lower(province) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_destinations_region_trgm
+    ON destinations USING gin (lower(region) gin_trgm_ops);
+
+-- Foreign-key style lookups by destination
+CREATE INDEX IF NOT EXISTS ix_activities_destination_id ON activities (destination_id);
+CREATE INDEX IF NOT EXISTS ix_hotels_destination_id ON hotels (destination_id);
+CREATE INDEX IF NOT EXISTS ix_restaurants_destination_id ON restaurants (destination_id);
+CREATE INDEX IF NOT EXISTS ix_transportation_from_destination_id ON transportation (from_destination_id);
+CREATE INDEX IF NOT EXISTS ix_transportation_to_destination_id ON transportation (to_destination_id);
+
+-- Also serves plain destination_id lookups (leading column)
+CREATE INDEX IF NOT EXISTS ix_weather_destination_id_month ON weather (destination_id, month);
+
+CREATE INDEX IF NOT EXISTS ix_reviews_entity ON reviews (entity_type, entity_id, created_at);
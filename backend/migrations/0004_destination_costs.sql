@@ -0,0 +1,124 @@
+-- Per-destination cost estimates for the budget action, kept current by triggers
+
+-- Same price_range buckets the budget action used to compute inline
+CREATE OR REPLACE FUNCTION hotel_night_price(price_range TEXT) RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN price_range LIKE '%rẻ%' THEN 500000
+        WHEN price_range LIKE '%trung bình%' THEN 1000000
+        WHEN price_range LIKE '%cao cấp%' THEN 2500000
+        ELSE 1000000
+    END::NUMERIC
+$$;
+
+CREATE OR REPLACE FUNCTION meal_price(price_range TEXT) RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN price_range LIKE '%rẻ%' THEN 100000
+        WHEN price_range LIKE '%trung bình%' THEN 250000
+        WHEN price_range LIKE '%cao cấp%' THEN 500000
+        ELSE 200000
+    END::NUMERIC
+$$;
+
+CREATE TABLE IF NOT EXISTS destination_costs (
+    destination_id INTEGER PRIMARY KEY,
+    hotel_per_night NUMERIC(12, 2) NOT NULL,
+    meal_price NUMERIC(12, 2) NOT NULL,
+    activity_per_day NUMERIC(12, 2) NOT NULL,
+    transport_estimate NUMERIC(12, 2) NOT NULL DEFAULT 500000,
+    hotel_count INTEGER NOT NULL DEFAULT 0,
+    restaurant_count INTEGER NOT NULL DEFAULT 0,
+    activity_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+-- Recompute one destination's row; each aggregate reads a single table through its destination_id index
+CREATE OR REPLACE FUNCTION refresh_destination_costs(dest_id INTEGER) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF dest_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM destinations WHERE id = dest_id) THEN
+        DELETE FROM destination_costs WHERE destination_id = dest_id;
+        RETURN;
+    END IF;
+
+    INSERT INTO destination_costs AS c (
+        destination_id, hotel_per_night, meal_price, activity_per_day,
+        hotel_count, restaurant_count, activity_count, updated_at
+    )
+    SELECT dest_id,
+           COALESCE(h.avg_price, 1000000),
+           COALESCE(r.avg_price, 200000),
+           COALESCE(a.avg_price, 300000),
+           h.n, r.n, a.n,
+           now() AT TIME ZONE 'utc'
+    FROM (SELECT AVG(hotel_night_price(price_range)) AS avg_price, COUNT(*) AS n
+          FROM hotels WHERE destination_id = dest_id) h,
+         (SELECT AVG(meal_price(price_range)) AS avg_price, COUNT(*) AS n
+          FROM restaurants WHERE destination_id = dest_id) r,
+         (SELECT AVG(price) FILTER (WHERE price > 0) AS avg_price, COUNT(*) AS n
+          FROM activities WHERE destination_id = dest_id) a
+    ON CONFLICT (destination_id) DO UPDATE SET
+        hotel_per_night = EXCLUDED.hotel_per_night,
+        meal_price = EXCLUDED.meal_price,
+        activity_per_day = EXCLUDED.activity_per_day,
+        hotel_count = EXCLUDED.hotel_count,
+        restaurant_count = EXCLUDED.restaurant_count,
+        activity_count = EXCLUDED.activity_count,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$;
+
+-- Row trigger for hotels/restaurants/activities: refresh the old and new destination
+CREATE OR REPLACE FUNCTION destination_costs_on_child_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_destination_costs(OLD.destination_id);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND NEW.destination_id IS DISTINCT FROM OLD.destination_id) THEN
+        PERFORM refresh_destination_costs(NEW.destination_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION destination_costs_on_destination_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM refresh_destination_costs(OLD.id);
+    ELSE
+        PERFORM refresh_destination_costs(NEW.id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_hotels_destination_costs ON hotels;
+CREATE TRIGGER trg_hotels_destination_costs
+    AFTER INSERT OR DELETE OR UPDATE OF destination_id, price_range ON hotels
+    FOR EACH ROW EXECUTE FUNCTION destination_costs_on_child_change();
+
+DROP TRIGGER IF EXISTS trg_restaurants_destination_costs ON restaurants;
+CREATE TRIGGER trg_restaurants_destination_costs
+    AFTER INSERT OR DELETE OR UPDATE OF destination_id, price_range ON restaurants
+    FOR EACH ROW EXECUTE FUNCTION destination_costs_on_child_change();
+
+DROP TRIGGER IF EXISTS trg_activities_destination_costs ON activities;
+CREATE TRIGGER trg_activities_destination_costs
+    AFTER INSERT OR DELETE OR UPDATE OF destination_id, price ON activities
+    FOR EACH ROW EXECUTE FUNCTION destination_costs_on_child_change();
+
+DROP TRIGGER IF EXISTS trg_destinations_destination_costs ON destinations;
+CREATE TRIGGER trg_destinations_destination_costs
+    AFTER INSERT OR DELETE ON destinations
+    FOR EACH ROW EXECUTE FUNCTION destination_costs_on_destination_change();
+
+-- Backfill existing destinations
+SELECT refresh_destination_costs(id) FROM destinations;
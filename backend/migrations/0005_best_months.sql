@@ -0,0 +1,60 @@
+-- Best months to visit per destination, derived from weather and kept current by a trigger
+ALTER TABLE destinations ADD COLUMN IF NOT EXISTS best_months SMALLINT[];
+
+-- Pleasant month: 20-30°C and no rain/storm in the description.
+-- Sets weather.is_best_time for the destination and destinations.best_months
+-- (NULL when the destination has no weather rows, '{}' when none qualify).
+CREATE OR REPLACE FUNCTION refresh_best_months(dest_id INTEGER) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF dest_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    UPDATE weather w SET is_best_time = x.best
+    FROM (
+        SELECT id,
+               COALESCE(avg_temp BETWEEN 20 AND 30
+                        AND lower(COALESCE(description, '')) NOT LIKE '%mưa%'
+                        AND lower(COALESCE(description, '')) NOT LIKE '%bão%', FALSE) AS best
+        FROM weather
+        WHERE destination_id = dest_id
+    ) x
+    WHERE w.id = x.id AND w.is_best_time IS DISTINCT FROM x.best;
+
+    UPDATE destinations d SET best_months = (
+        SELECT CASE WHEN COUNT(*) = 0 THEN NULL
+                    ELSE COALESCE(array_agg(DISTINCT month::SMALLINT ORDER BY month::SMALLINT)
+                                  FILTER (WHERE is_best_time), '{}')
+               END
+        FROM weather WHERE destination_id = dest_id
+    )
+    WHERE d.id = dest_id;
+
+    -- Derived column changed: let the action server refresh this destination
+    PERFORM pg_notify('catalog_changed', json_build_object('table', 'destinations', 'id', dest_id)::TEXT);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION best_months_on_weather_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_best_months(OLD.destination_id);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND NEW.destination_id IS DISTINCT FROM OLD.destination_id) THEN
+        PERFORM refresh_best_months(NEW.destination_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Not fired by the is_best_time updates refresh_best_months makes itself
+DROP TRIGGER IF EXISTS trg_weather_best_months ON weather;
+CREATE TRIGGER trg_weather_best_months
+    AFTER INSERT OR DELETE OR UPDATE OF destination_id, month, avg_temp, description ON weather
+    FOR EACH ROW EXECUTE FUNCTION best_months_on_weather_change();
+
+-- Backfill
+SELECT refresh_best_months(id) FROM destinations;
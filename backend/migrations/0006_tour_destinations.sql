@@ -0,0 +1,61 @@
+-- Normalized tour -> destination links, replacing LIKE searches on tours.destinations
+CREATE TABLE IF NOT EXISTS tour_destinations (
+    tour_id INTEGER NOT NULL REFERENCES tours (id) ON DELETE CASCADE,
+    destination_id INTEGER NOT NULL REFERENCES destinations (id) ON DELETE CASCADE,
+    position SMALLINT NOT NULL,
+    PRIMARY KEY (tour_id, destination_id)
+);
+
+-- "Tours visiting destination X" (the primary key serves lookups by tour)
+CREATE INDEX IF NOT EXISTS ix_tour_destinations_destination_id ON tour_destinations (destination_id, tour_id);
+
+-- Split a tours.destinations value: a JSON list ('["Đà Lạt", "Nha Trang"]') or "Đà Lạt, Nha Trang"
+CREATE OR REPLACE FUNCTION tour_destination_names(value TEXT)
+RETURNS TABLE (dest_name TEXT, dest_position INTEGER)
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) = '' THEN
+        RETURN;
+    END IF;
+    IF value ~ '^\s*\[' THEN
+        BEGIN
+            RETURN QUERY
+                SELECT btrim(x.elem), x.ord::INTEGER
+                FROM json_array_elements_text(value::JSON) WITH ORDINALITY AS x(elem, ord)
+                WHERE btrim(x.elem) <> '';
+            RETURN;
+        EXCEPTION WHEN invalid_text_representation THEN
+            -- Not valid JSON after all: treat it as a comma separated list
+            value := btrim(value, '[] ');
+        END;
+    END IF;
+    RETURN QUERY
+        SELECT btrim(x.elem, ' "'''), x.ord::INTEGER
+        FROM unnest(string_to_array(value, ',')) WITH ORDINALITY AS x(elem, ord)
+        WHERE btrim(x.elem, ' "''') <> '';
+END;
+$$;
+
+-- Rebuild one tour's links from its destinations column (called by the backend after writes)
+CREATE OR REPLACE FUNCTION sync_tour_destinations(p_tour_id INTEGER) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    linked INTEGER;
+BEGIN
+    DELETE FROM tour_destinations WHERE tour_id = p_tour_id;
+
+    INSERT INTO tour_destinations (tour_id, destination_id, position)
+    SELECT DISTINCT ON (d.id) t.id, d.id, n.dest_position
+    FROM tours t
+    CROSS JOIN LATERAL tour_destination_names(t.destinations) n
+    JOIN destinations d ON lower(d.name) = lower(n.dest_name)
+    WHERE t.id = p_tour_id
+    ORDER BY d.id, n.dest_position;
+
+    GET DIAGNOSTICS linked = ROW_COUNT;
+    RETURN linked;
+END;
+$$;
+
+-- Backfill
+SELECT sync_tour_destinations(id) FROM tours;
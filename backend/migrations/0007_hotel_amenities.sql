@@ -0,0 +1,76 @@
+-- Clean hotels.amenities once so reads can return the column as stored.
+-- Old rows hold a JSON list or object as one element ('{"[\"wifi\", \"spa\"]"}'), the same
+-- text split one character per element, or "wifi, spa"; new writes are validated by the API.
+CREATE OR REPLACE FUNCTION normalize_amenities(value TEXT[])
+RETURNS TEXT[]
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    raw TEXT;
+    result TEXT[];
+BEGIN
+    IF value IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF cardinality(value) > 1 AND NOT EXISTS (SELECT 1 FROM unnest(value) AS v WHERE length(v) <> 1) THEN
+        -- One character per element: join them back into the original text
+        raw := array_to_string(value, '');
+    ELSIF cardinality(value) = 1 THEN
+        raw := value[1];
+    ELSE
+        SELECT array_agg(btrim(v.elem) ORDER BY v.ord) INTO result
+        FROM unnest(value) WITH ORDINALITY AS v(elem, ord)
+        WHERE btrim(v.elem) <> '';
+        RETURN COALESCE(result, '{}');
+    END IF;
+
+    raw := btrim(raw);
+    IF raw ~ '^[\[{]' THEN
+        BEGIN
+            IF json_typeof(raw::JSON) = 'array' THEN
+                SELECT array_agg(btrim(x.elem) ORDER BY x.ord) INTO result
+                FROM json_array_elements_text(raw::JSON) WITH ORDINALITY AS x(elem, ord)
+                WHERE btrim(x.elem) <> '';
+                RETURN COALESCE(result, '{}');
+            ELSIF json_typeof(raw::JSON) = 'object' THEN
+                -- {"wifi": true, "spa": false} -> the keys switched on
+                SELECT array_agg(x.key ORDER BY x.ord) INTO result
+                FROM json_each_text(raw::JSON) WITH ORDINALITY AS x(key, val, ord)
+                WHERE x.val IS NOT NULL AND x.val NOT IN ('false', '0', '', '[]', '{}');
+                RETURN COALESCE(result, '{}');
+            END IF;
+        EXCEPTION WHEN invalid_text_representation THEN
+            -- Not JSON: fall through to the comma separated form
+            NULL;
+        END;
+    END IF;
+
+    SELECT array_agg(btrim(x.elem) ORDER BY x.ord) INTO result
+    FROM unnest(string_to_array(raw, ',')) WITH ORDINALITY AS x(elem, ord)
+    WHERE btrim(x.elem) <> '';
+    RETURN COALESCE(result, '{}');
+END;
+$$;
+
+-- Backfill in id order, a batch at a time, touching only rows that change
+DO $$
+DECLARE
+    last_id INTEGER := 0;
+    batch_end INTEGER;
+BEGIN
+    LOOP
+        SELECT max(id) INTO batch_end
+        FROM (SELECT id FROM hotels WHERE id > last_id ORDER BY id LIMIT 5000) AS batch;
+        EXIT WHEN batch_end IS NULL;
+
+        UPDATE hotels
+        SET amenities = normalize_amenities(amenities)
+        WHERE id > last_id AND id <= batch_end
+          AND amenities IS DISTINCT FROM normalize_amenities(amenities);
+
+        last_id := batch_end;
+    END LOOP;
+END;
+$$;
+
+-- Cached hotel rows in the action server are stale now
+SELECT pg_notify('catalog_changed', json_build_object('table', 'hotels', 'id', NULL)::TEXT);
@@ -0,0 +1,35 @@
+-- Bulk loads (POST /<table>/bulk) set app.bulk_load for their transaction and refresh each
+-- touched destination once at the end, instead of once per row from these triggers.
+CREATE OR REPLACE FUNCTION destination_costs_on_child_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('app.bulk_load', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_destination_costs(OLD.destination_id);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND NEW.destination_id IS DISTINCT FROM OLD.destination_id) THEN
+        PERFORM refresh_destination_costs(NEW.destination_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION best_months_on_weather_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('app.bulk_load', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_best_months(OLD.destination_id);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND NEW.destination_id IS DISTINCT FROM OLD.destination_id) THEN
+        PERFORM refresh_best_months(NEW.destination_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
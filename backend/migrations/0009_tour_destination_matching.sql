@@ -0,0 +1,123 @@
+-- Tour links follow destination changes and tolerate partial names.
+-- A tour's listed name links to the destination with the same name; when none has it,
+-- to destinations whose name contains it or is contained in it ("Hạ Long" <-> "Vịnh Hạ Long"),
+-- the same hits the old LIKE search on tours.destinations gave.
+
+-- Case- and whitespace-insensitive form of a place name
+CREATE OR REPLACE FUNCTION destination_name_key(value TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT regexp_replace(lower(btrim(value)), '\s+', ' ', 'g')
+$$;
+
+-- Substring match in either direction; keys shorter than 3 characters only match exactly
+-- (MIN_SUBSTRING_LENGTH in actions/destination_resolver.py)
+CREATE OR REPLACE FUNCTION destination_names_overlap(tour_name TEXT, dest_name TEXT) RETURNS BOOLEAN
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT length(a) >= 3 AND length(b) >= 3 AND (position(a IN b) > 0 OR position(b IN a) > 0)
+    FROM (SELECT destination_name_key(tour_name) AS a, destination_name_key(dest_name) AS b) AS k
+$$;
+
+CREATE OR REPLACE FUNCTION sync_tour_destinations(p_tour_id INTEGER) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    linked INTEGER;
+BEGIN
+    DELETE FROM tour_destinations WHERE tour_id = p_tour_id;
+
+    WITH names AS (
+        SELECT n.dest_name, n.dest_position
+        FROM tours t
+        CROSS JOIN LATERAL tour_destination_names(t.destinations) n
+        WHERE t.id = p_tour_id
+    ), exact AS (
+        SELECT d.id, names.dest_position
+        FROM names
+        JOIN destinations d ON destination_name_key(d.name) = destination_name_key(names.dest_name)
+    ), partial AS (
+        SELECT d.id, names.dest_position
+        FROM names
+        JOIN destinations d ON destination_names_overlap(names.dest_name, d.name)
+        WHERE NOT EXISTS (SELECT 1 FROM exact e WHERE e.dest_position = names.dest_position)
+    )
+    INSERT INTO tour_destinations (tour_id, destination_id, position)
+    SELECT DISTINCT ON (m.id) p_tour_id, m.id, m.dest_position
+    FROM (SELECT * FROM exact UNION ALL SELECT * FROM partial) AS m
+    ORDER BY m.id, m.dest_position;
+
+    GET DIAGNOSTICS linked = ROW_COUNT;
+    RETURN linked;
+END;
+$$;
+
+-- Resync the tours that name any of ``dest_names`` or are linked to any of ``dest_ids``,
+-- with one catalog_changed notification for all of them; returns how many were resynced
+CREATE OR REPLACE FUNCTION relink_destination_tours(dest_names TEXT[], dest_ids INTEGER[] DEFAULT '{}')
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    relinked INTEGER;
+BEGIN
+    SELECT count(sync_tour_destinations(t.id)) INTO relinked
+    FROM tours t
+    WHERE EXISTS (SELECT 1 FROM tour_destinations td
+                  WHERE td.tour_id = t.id AND td.destination_id = ANY(dest_ids))
+       OR EXISTS (SELECT 1
+                  FROM tour_destination_names(t.destinations) n, unnest(dest_names) AS g(dest_name)
+                  WHERE destination_name_key(n.dest_name) = destination_name_key(g.dest_name)
+                     OR destination_names_overlap(n.dest_name, g.dest_name));
+
+    IF relinked > 0 THEN
+        PERFORM pg_notify('catalog_changed', json_build_object('table', 'tours', 'id', NULL)::TEXT);
+    END IF;
+    RETURN relinked;
+END;
+$$;
+
+-- Statement triggers: a multi-row INSERT or UPDATE relinks once. Bulk loads (app.bulk_load,
+-- see 0008) skip them and call relink_destination_tours once at the end instead.
+CREATE OR REPLACE FUNCTION tour_links_on_destination_insert() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('app.bulk_load', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM relink_destination_tours(ARRAY(SELECT name FROM new_rows));
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tour_links_on_destination_update() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    renamed INTEGER[];
+BEGIN
+    IF current_setting('app.bulk_load', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    SELECT array_agg(n.id) INTO renamed
+    FROM new_rows n JOIN old_rows o ON o.id = n.id
+    WHERE n.name IS DISTINCT FROM o.name;
+    IF renamed IS NOT NULL THEN
+        PERFORM relink_destination_tours(
+            ARRAY(SELECT name FROM new_rows WHERE id = ANY(renamed)), renamed);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables cannot be combined with UPDATE OF <column>, so the update trigger
+-- fires on every UPDATE statement and looks for renames itself
+DROP TRIGGER IF EXISTS trg_destinations_tour_links_insert ON destinations;
+CREATE TRIGGER trg_destinations_tour_links_insert
+    AFTER INSERT ON destinations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tour_links_on_destination_insert();
+
+DROP TRIGGER IF EXISTS trg_destinations_tour_links_update ON destinations;
+CREATE TRIGGER trg_destinations_tour_links_update
+    AFTER UPDATE ON destinations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tour_links_on_destination_update();
+
+-- Relink with the new rules
+SELECT sync_tour_destinations(id) FROM tours;
@@ -0,0 +1,127 @@
+-- destination_costs.transport_estimate from the transportation table: the cheapest way in,
+-- falling back to the old flat 500000 for destinations nothing leads to
+
+-- Lowest VND amount in a free-text price, same rules as parse_price() in actions/text_utils.py
+-- ("500k - 1,2 triệu" -> 500000, "1-2 triệu" -> 1000000, "1tr5" -> 1500000); NULL when none
+CREATE OR REPLACE FUNCTION transport_price(price_range TEXT) RETURNS NUMERIC
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    numbers TEXT[];
+    units TEXT[];
+    fractions TEXT[];
+    unit TEXT;
+    digits TEXT;
+    value NUMERIC;
+    lowest NUMERIC;
+BEGIN
+    IF price_range IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT array_agg(m[1] ORDER BY ord), array_agg(m[2] ORDER BY ord), array_agg(m[3] ORDER BY ord)
+    INTO numbers, units, fractions
+    FROM regexp_matches(lower(price_range),
+                        '(\d+(?:[.,]\d+)*)(?:\s*(triệu|trieu|nghìn|nghin|ngàn|ngan|tr|k)(?![a-z])(\d)?)?', 'g')
+         WITH ORDINALITY AS x(m, ord);
+    IF numbers IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    FOR i IN 1 .. array_length(numbers, 1) LOOP
+        unit := units[i];
+        digits := regexp_replace(numbers[i], '[.,]', '', 'g');
+        IF unit IS NULL AND i < array_length(numbers, 1) AND units[i + 1] IS NOT NULL AND length(digits) <= 3 THEN
+            -- "1-2 triệu": the unit after the range applies to both ends
+            unit := units[i + 1];
+        END IF;
+
+        IF unit IS NULL THEN
+            -- Bare amounts use dots/commas as thousands separators: "1.500.000"
+            value := digits::NUMERIC;
+        ELSE
+            -- With a unit, a single separator is a decimal point: "1,5 triệu"
+            IF length(numbers[i]) - length(digits) = 1 THEN
+                value := replace(numbers[i], ',', '.')::NUMERIC;
+            ELSE
+                value := digits::NUMERIC;
+            END IF;
+            IF fractions[i] IS NOT NULL THEN
+                value := value + fractions[i]::NUMERIC / 10;
+            END IF;
+            value := value * CASE WHEN unit IN ('triệu', 'trieu', 'tr') THEN 1000000 ELSE 1000 END;
+        END IF;
+        lowest := LEAST(lowest, value);
+    END LOOP;
+    RETURN lowest;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_destination_costs(dest_id INTEGER) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF dest_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM destinations WHERE id = dest_id) THEN
+        DELETE FROM destination_costs WHERE destination_id = dest_id;
+        RETURN;
+    END IF;
+
+    INSERT INTO destination_costs AS c (
+        destination_id, hotel_per_night, meal_price, activity_per_day, transport_estimate,
+        hotel_count, restaurant_count, activity_count, updated_at
+    )
+    SELECT dest_id,
+           COALESCE(h.avg_price, 1000000),
+           COALESCE(r.avg_price, 200000),
+           COALESCE(a.avg_price, 300000),
+           COALESCE(t.min_price, 500000),
+           h.n, r.n, a.n,
+           now() AT TIME ZONE 'utc'
+    FROM (SELECT AVG(hotel_night_price(price_range)) AS avg_price, COUNT(*) AS n
+          FROM hotels WHERE destination_id = dest_id) h,
+         (SELECT AVG(meal_price(price_range)) AS avg_price, COUNT(*) AS n
+          FROM restaurants WHERE destination_id = dest_id) r,
+         (SELECT AVG(price) FILTER (WHERE price > 0) AS avg_price, COUNT(*) AS n
+          FROM activities WHERE destination_id = dest_id) a,
+         (SELECT MIN(transport_price(price_range)) FILTER (WHERE transport_price(price_range) > 0) AS min_price
+          FROM transportation WHERE to_destination_id = dest_id) t
+    ON CONFLICT (destination_id) DO UPDATE SET
+        hotel_per_night = EXCLUDED.hotel_per_night,
+        meal_price = EXCLUDED.meal_price,
+        activity_per_day = EXCLUDED.activity_per_day,
+        transport_estimate = EXCLUDED.transport_estimate,
+        hotel_count = EXCLUDED.hotel_count,
+        restaurant_count = EXCLUDED.restaurant_count,
+        activity_count = EXCLUDED.activity_count,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$;
+
+-- Row trigger for transportation: refresh the old and new arrival destination.
+-- Skipped under app.bulk_load like the triggers in 0008; bulk loads refresh once at the end.
+CREATE OR REPLACE FUNCTION destination_costs_on_transportation_change() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('app.bulk_load', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_destination_costs(OLD.to_destination_id);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND NEW.to_destination_id IS DISTINCT FROM OLD.to_destination_id) THEN
+        PERFORM refresh_destination_costs(NEW.to_destination_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_transportation_destination_costs ON transportation;
+CREATE TRIGGER trg_transportation_destination_costs
+    AFTER INSERT OR DELETE OR UPDATE OF to_destination_id, price_range ON transportation
+    FOR EACH ROW EXECUTE FUNCTION destination_costs_on_transportation_change();
+
+-- Backfill
+SELECT refresh_destination_costs(id) FROM destinations;
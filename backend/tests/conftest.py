@@ -0,0 +1,37 @@
+import os
+import asyncio
+
+import pytest
+
+# app.core.config needs a DATABASE_URL at import time; tests never connect through it
+os.environ.setdefault("DATABASE_URL", os.getenv("TEST_DATABASE_URL", "postgresql://localhost/travel_chatbot_test"))
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    """Migrated test database from TEST_DATABASE_URL; tests that need one are skipped without it"""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import migrate_db
+    migrate_db.migrate(url)
+    return url
+
+
+@pytest.fixture
+def in_rollback(database_url):
+    """Run ``coro_fn(conn)`` inside a transaction that is rolled back afterwards"""
+    import asyncpg
+
+    def run(coro_fn):
+        async def main():
+            conn = await asyncpg.connect(database_url)
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                return await coro_fn(conn)
+            finally:
+                await transaction.rollback()
+                await conn.close()
+        return asyncio.run(main())
+    return run
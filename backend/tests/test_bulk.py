@@ -0,0 +1,154 @@
+import asyncio
+
+from app.models.tables import destinations, hotels, transportation
+from app.schemas.destination import DestinationCreate
+from app.schemas.hotel import HotelCreate
+from app.schemas.transportation import TransportationCreate
+from app.services import bulk
+from app.services.bulk import BulkLoader, request_rows
+
+
+class FakeRequest:
+    def __init__(self, content_type, chunks=(), body=None):
+        self.headers = {"content-type": content_type}
+        self._chunks = chunks
+        self._body = body
+
+    async def stream(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def json(self):
+        return self._body
+
+
+async def collect(request):
+    return [row async for row in request_rows(request)]
+
+
+def test_request_rows_reads_ndjson_split_across_chunks():
+    request = FakeRequest("application/x-ndjson; charset=utf-8",
+                          [b'{"name": "A"}\n{"na', b'me": "B"}\n\nnot json\n{"name": "C"}'])
+    rows = asyncio.run(collect(request))
+    assert [(i, item) for i, item, _ in rows] == [(0, {"name": "A"}), (1, {"name": "B"}), (2, None), (3, {"name": "C"})]
+    assert rows[2][2].startswith("invalid JSON")
+
+
+def test_request_rows_reads_json_array():
+    rows = asyncio.run(collect(FakeRequest("application/json", body=[{"name": "A"}, 3])))
+    assert rows == [(0, {"name": "A"}, None), (1, 3, None)]
+
+
+async def new_destination(conn):
+    return await conn.fetchval(
+        "INSERT INTO destinations (name, province, region) VALUES ('Bulk test', 'Test', 'Test') RETURNING id")
+
+
+async def load(conn, items, table=hotels, schema=HotelCreate):
+    loader = BulkLoader(conn, table, schema)
+    await loader.start()
+    for index, item in enumerate(items):
+        await loader.add(index, item)
+    return await loader.finish()
+
+
+def test_copy_path_inserts_new_rows_and_refreshes_costs(in_rollback, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_BATCH_ROWS", 2)
+
+    async def check(conn):
+        dest = await new_destination(conn)
+        report = await load(conn, [
+            {"name": f"Hotel {i}", "destination_id": dest, "price_range": "1.000.000 VND", "amenities": "wifi, spa"}
+            for i in range(5)])
+        assert report == {"inserted": 5, "updated": 0, "rejected": 0, "errors": []}
+        rows = await conn.fetch("SELECT name, amenities FROM hotels WHERE destination_id = $1 ORDER BY name", dest)
+        assert [r["name"] for r in rows] == [f"Hotel {i}" for i in range(5)]
+        assert rows[0]["amenities"] == ["wifi", "spa"]
+        # Row triggers were skipped during the load; the destination was refreshed once at the end
+        assert await conn.fetchval(
+            "SELECT hotel_per_night FROM destination_costs WHERE destination_id = $1", dest) == 1000000
+
+    in_rollback(check)
+
+
+def test_upsert_path_replaces_rows_by_id(in_rollback):
+    async def check(conn):
+        dest = await new_destination(conn)
+        existing = await conn.fetchval(
+            "INSERT INTO hotels (name, destination_id, star_rating) VALUES ('Old', $1, 2) RETURNING id", dest)
+        new_id = await conn.fetchval("SELECT max(id) FROM hotels") + 100
+        report = await load(conn, [
+            {"id": existing, "name": "Renamed", "destination_id": dest},
+            {"id": new_id, "name": "Explicit", "destination_id": dest},
+        ])
+        assert report == {"inserted": 1, "updated": 1, "rejected": 0, "errors": []}
+        renamed = await conn.fetchrow("SELECT name, star_rating FROM hotels WHERE id = $1", existing)
+        # Full replace: columns left out of the row are reset to the schema default
+        assert (renamed["name"], renamed["star_rating"]) == ("Renamed", None)
+        assert await conn.fetchval("SELECT name FROM hotels WHERE id = $1", new_id) == "Explicit"
+        # The sequence moved past the explicit id
+        assert await conn.fetchval("SELECT nextval(pg_get_serial_sequence('hotels', 'id'))") > new_id
+
+    in_rollback(check)
+
+
+def test_rejected_rows_are_reported_and_the_rest_loaded(in_rollback):
+    async def check(conn):
+        dest = await new_destination(conn)
+        report = await load(conn, [
+            {"name": "Good 1", "destination_id": dest},
+            {"destination_id": dest},
+            {"name": "Too long", "destination_id": dest, "price_range": "x" * 80},
+            {"id": "seven", "name": "Bad id"},
+            "not an object",
+            {"name": "Good 2", "destination_id": dest},
+        ])
+        assert (report["inserted"], report["updated"], report["rejected"]) == (2, 0, 4)
+        errors = {e["row"]: e["errors"] for e in report["errors"]}
+        assert [e.lower() for e in errors[1]] == ["name: field required"]
+        assert "too long" in errors[2][0]
+        assert errors[3] == ["id: must be a positive integer"]
+        assert errors[4] == ["row must be a JSON object"]
+        names = {r["name"] for r in await conn.fetch("SELECT name FROM hotels WHERE destination_id = $1", dest)}
+        assert names == {"Good 1", "Good 2"}
+
+    in_rollback(check)
+
+
+def test_transportation_refreshes_the_arrival_destination(in_rollback):
+    async def check(conn):
+        origin = await new_destination(conn)
+        dest = await new_destination(conn)
+        route = await conn.fetchval(
+            "INSERT INTO transportation (from_destination_id, to_destination_id, price_range) "
+            "VALUES ($1, $2, '300k') RETURNING id", origin, origin)
+        report = await load(conn, [
+            {"from_destination_id": origin, "to_destination_id": dest, "price_range": "200k - 400k"},
+            {"id": route, "from_destination_id": dest, "to_destination_id": dest, "price_range": "150k"},
+        ], transportation, TransportationCreate)
+        assert (report["inserted"], report["updated"]) == (1, 1)
+        costs = dict(await conn.fetch(
+            "SELECT destination_id, transport_estimate FROM destination_costs WHERE destination_id = ANY($1)",
+            [origin, dest]))
+        # The route moved away from origin, whose estimate falls back to the flat default
+        assert costs == {origin: 500000, dest: 150000}
+
+    in_rollback(check)
+
+
+def test_destinations_relink_tours_once_at_the_end(in_rollback):
+    async def check(conn):
+        tour = await conn.fetchval(
+            "INSERT INTO tours (name, destinations) VALUES ('Test tour', 'Zz Sapa, Zz Catba') RETURNING id")
+        await conn.fetchval("SELECT sync_tour_destinations($1)", tour)
+        report = await load(conn, [
+            {"name": "Zz Sapa", "province": "Test", "region": "Test"},
+            {"name": "Zz Catba", "province": "Test", "region": "Test"},
+        ], destinations, DestinationCreate)
+        assert report["inserted"] == 2
+        linked = await conn.fetch(
+            "SELECT d.name FROM tour_destinations td JOIN destinations d ON d.id = td.destination_id "
+            "WHERE td.tour_id = $1 ORDER BY td.position", tour)
+        assert [r["name"] for r in linked] == ["Zz Sapa", "Zz Catba"]
+
+    in_rollback(check)
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("500k - 1,2 triệu", 500000),
+    ("1-2 triệu", 1000000),
+    ("1.200.000 - 2.500.000 VNĐ", 1200000),
+    ("600k - 1,2 triệu", 600000),
+    ("1tr5", 1500000),
+    ("300 nghìn", 300000),
+    ("liên hệ", None),
+    (None, None),
+])
+def test_transport_price_matches_parse_price(in_rollback, text, expected):
+    async def check(conn):
+        return await conn.fetchval("SELECT transport_price($1)", text)
+
+    assert in_rollback(check) == expected
+
+
+def test_transport_estimate_is_cheapest_inbound_leg(in_rollback):
+    async def check(conn):
+        add = "INSERT INTO destinations (name, province, region) VALUES ($1, 'Test', 'Test') RETURNING id"
+        origin = await conn.fetchval(add, "Origin")
+        target = await conn.fetchval(add, "Target")
+        estimate = "SELECT transport_estimate FROM destination_costs WHERE destination_id = $1"
+        assert await conn.fetchval(estimate, target) == 500000
+
+        leg = "INSERT INTO transportation (from_destination_id, to_destination_id, type, price_range) " \
+              "VALUES ($1, $2, $3, $4) RETURNING id"
+        await conn.fetchval(leg, origin, target, "máy bay", "1.200.000 - 2.500.000 VNĐ")
+        bus = await conn.fetchval(leg, origin, target, "xe khách", "300k")
+        # Outbound legs do not count
+        await conn.fetchval(leg, target, origin, "xe khách", "100k")
+        assert await conn.fetchval(estimate, target) == 300000
+
+        await conn.execute("DELETE FROM transportation WHERE id = $1", bus)
+        assert await conn.fetchval(estimate, target) == 1200000
+
+    in_rollback(check)
+
+
+def test_bulk_loads_skip_the_transportation_trigger(in_rollback):
+    async def check(conn):
+        add = "INSERT INTO destinations (name, province, region) VALUES ($1, 'Test', 'Test') RETURNING id"
+        origin = await conn.fetchval(add, "Origin")
+        target = await conn.fetchval(add, "Target")
+        await conn.execute("SELECT set_config('app.bulk_load', 'on', true)")
+        await conn.execute("INSERT INTO transportation (from_destination_id, to_destination_id, price_range) "
+                           "VALUES ($1, $2, '300k')", origin, target)
+        estimate = "SELECT transport_estimate FROM destination_costs WHERE destination_id = $1"
+        assert await conn.fetchval(estimate, target) == 500000
+        await conn.execute("SELECT refresh_destination_costs($1)", target)
+        assert await conn.fetchval(estimate, target) == 300000
+
+    in_rollback(check)
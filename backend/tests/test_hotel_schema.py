@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.hotel import HotelCreate, HotelUpdate, normalize_amenities
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("wifi, spa ,, hồ bơi", ["wifi", "spa", "hồ bơi"]),
+    ('["wifi", " spa ", ""]', ["wifi", "spa"]),
+    ('{"wifi": true, "spa": false, "gym": 1}', ["wifi", "gym"]),
+    (["wifi", " spa", ""], ["wifi", "spa"]),
+    (['["wifi", "spa"]'], ["wifi", "spa"]),
+    (list("wifi, spa"), ["wifi", "spa"]),
+    ([], []),
+    ("[not json", ["[not json"]),
+])
+def test_normalize_amenities(value, expected):
+    assert normalize_amenities(value) == expected
+
+
+def test_normalize_amenities_rejects_other_types():
+    with pytest.raises(ValueError):
+        normalize_amenities(42)
+
+
+def test_schemas_normalize_amenities_on_input():
+    assert HotelCreate(name="A", amenities='["wifi", "spa"]').amenities == ["wifi", "spa"]
+    assert HotelUpdate(amenities="wifi, spa").amenities == ["wifi", "spa"]
+    assert HotelUpdate().amenities is None
+    with pytest.raises(ValidationError):
+        HotelCreate(name="A", amenities=42)
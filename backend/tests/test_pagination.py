@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.tables import hotels
+from app.services.pagination import decode_cursor, encode_cursor, paginate
+
+
+@pytest.mark.parametrize("last_id", [0, 1, 99, 2 ** 31 - 1])
+def test_cursor_round_trip(last_id):
+    cursor = encode_cursor(last_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == last_id
+
+
+def test_empty_cursor_starts_at_the_beginning():
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor(1)[:-2], "e30", "eyJpZCI6ImEifQ"])
+def test_invalid_cursor_is_a_400(cursor):
+    # "e30" is {} and "eyJpZCI6ImEifQ" is {"id":"a"}
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+class FakeDatabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch_all(self, query):
+        self.queries.append(query)
+        compiled = query.compile()
+        last_id = compiled.params.get("id_1")
+        limit = compiled.params.get("param_1")
+        rows = [r for r in self.rows if last_id is None or r["id"] > last_id]
+        return rows[:limit]
+
+
+def test_keyset_pages_walk_the_whole_table():
+    db = FakeDatabase([{"id": i, "name": f"Hotel {i}"} for i in range(1, 6)])
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = asyncio.run(paginate(db, hotels, 0, 2, cursor))
+        seen.extend(row["id"] for row in page["data"])
+        cursor = page["next_cursor"]
+    assert seen == [1, 2, 3, 4, 5]
+    assert len(db.queries) == 3
+
+
+def test_without_cursor_returns_the_plain_list():
+    db = FakeDatabase([{"id": 1, "name": "Hotel 1"}])
+    assert asyncio.run(paginate(db, hotels, 0, 100)) == [{"id": 1, "name": "Hotel 1"}]
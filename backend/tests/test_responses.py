@@ -0,0 +1,66 @@
+import json
+import warnings
+from datetime import date, datetime
+from decimal import Decimal
+from types import MappingProxyType
+
+import pytest
+
+from app.core import responses
+
+
+class Record:
+    """Like a ``databases`` record: the row behind ``_mapping``, a deprecated keys()"""
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def _mapping(self):
+        return self._row
+
+    def keys(self):
+        warnings.warn("Row.keys() is deprecated", DeprecationWarning)
+        return self._row.keys()
+
+    def __getitem__(self, key):
+        return self._row[key]
+
+
+CONTENT = {
+    "data": [Record({"id": 1, "name": "Đà Lạt", "rating": Decimal("4.5"), "price": Decimal("1200000"),
+                     "created_at": datetime(2024, 1, 2, 8, 30), "best_months": [11, 12]})],
+    "meta": {"day": date(2024, 1, 2), 3: "non-string key"},
+}
+EXPECTED = {
+    "data": [{"id": 1, "name": "Đà Lạt", "rating": 4.5, "price": 1200000,
+              "created_at": "2024-01-02T08:30:00", "best_months": [11, 12]}],
+    "meta": {"day": "2024-01-02", "3": "non-string key"},
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+    return request.param
+
+
+def test_dumps_serializes_records_and_database_types(serializer):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        body = responses.dumps(CONTENT)
+    assert json.loads(body) == EXPECTED
+    # Compact and UTF-8 on both paths
+    assert b": " not in body and "Đà Lạt".encode() in body
+
+
+def test_plain_mappings_are_still_accepted(serializer):
+    assert json.loads(responses.dumps([MappingProxyType({"id": 1})])) == [{"id": 1}]
+
+
+def test_unknown_types_are_rejected(serializer):
+    with pytest.raises(TypeError):
+        responses.dumps({"value": object()})
@@ -0,0 +1,86 @@
+async def add_destination(conn, name):
+    return await conn.fetchval(
+        "INSERT INTO destinations (name, province, region) VALUES ($1, 'Test', 'Test') RETURNING id", name)
+
+
+async def add_tour(conn, destinations):
+    tour_id = await conn.fetchval(
+        "INSERT INTO tours (name, destinations) VALUES ('Test tour', $1) RETURNING id", destinations)
+    await conn.fetchval("SELECT sync_tour_destinations($1)", tour_id)
+    return tour_id
+
+
+async def links(conn, tour_id):
+    rows = await conn.fetch(
+        "SELECT destination_id FROM tour_destinations WHERE tour_id = $1 ORDER BY position, destination_id", tour_id)
+    return [r["destination_id"] for r in rows]
+
+
+def test_exact_name_wins_over_partial_matches(in_rollback):
+    async def check(conn):
+        exact = await add_destination(conn, "Ha Long Zz")
+        await add_destination(conn, "Vinh Ha Long Zz")
+        tour = await add_tour(conn, '["ha long  zz"]')
+        assert await links(conn, tour) == [exact]
+
+    in_rollback(check)
+
+
+def test_partial_names_link_in_either_direction(in_rollback):
+    async def check(conn):
+        bay = await add_destination(conn, "Vinh Ha Long Zz")
+        city = await add_destination(conn, "Hue Zz")
+        tour = await add_tour(conn, "Ha Long Zz, Thanh pho Hue Zz")
+        assert await links(conn, tour) == [bay, city]
+
+    in_rollback(check)
+
+
+def test_destination_added_later_links_existing_tours(in_rollback):
+    async def check(conn):
+        tour = await add_tour(conn, "Zz Con Dao, Zz Phu Quoc")
+        assert await links(conn, tour) == []
+        island = await add_destination(conn, "Zz Phu Quoc")
+        assert await links(conn, tour) == [island]
+
+    in_rollback(check)
+
+
+def test_renaming_a_destination_relinks_tours(in_rollback):
+    async def check(conn):
+        dest = await add_destination(conn, "Zz Sa Pa")
+        tour = await add_tour(conn, "Zz Sapa")
+        assert await links(conn, tour) == []
+        await conn.execute("UPDATE destinations SET name = 'Zz Sapa' WHERE id = $1", dest)
+        assert await links(conn, tour) == [dest]
+        await conn.execute("UPDATE destinations SET name = 'Zz Mu Cang Chai' WHERE id = $1", dest)
+        assert await links(conn, tour) == []
+
+    in_rollback(check)
+
+
+def test_one_update_statement_relinks_every_renamed_destination(in_rollback):
+    async def check(conn):
+        first = await add_destination(conn, "Zz Sa Pa")
+        second = await add_destination(conn, "Zz Cat Ba")
+        sapa = await add_tour(conn, "Zz Sapa")
+        catba = await add_tour(conn, "Zz Catba")
+        await conn.execute(
+            "UPDATE destinations SET name = CASE id WHEN $1 THEN 'Zz Sapa' ELSE 'Zz Catba' END "
+            "WHERE id = ANY($2::int[])", first, [first, second])
+        assert await links(conn, sapa) == [first]
+        assert await links(conn, catba) == [second]
+
+    in_rollback(check)
+
+
+def test_bulk_loads_skip_the_trigger_and_relink_once(in_rollback):
+    async def check(conn):
+        tour = await add_tour(conn, "Zz Quy Nhon")
+        await conn.execute("SELECT set_config('app.bulk_load', 'on', true)")
+        dest = await add_destination(conn, "Zz Quy Nhon")
+        assert await links(conn, tour) == []
+        assert await conn.fetchval("SELECT relink_destination_tours($1::text[])", ["Zz Quy Nhon"]) == 1
+        assert await links(conn, tour) == [dest]
+
+    in_rollback(check)
@@ -0,0 +1,109 @@
+"""Benchmark: /destinations list responses, FastAPI's default path vs RecordsJSONResponse.
+
+Both routes serve the same pre-fetched records (no database), so only what happens after
+``fetch_all`` is measured: "default" converts each record with dict() and lets FastAPI
+validate against the response_model and run jsonable_encoder; "fast" returns the records
+in a RecordsJSONResponse (orjson when installed).
+
+Run from the repo root:  python -m benchmarks.list_responses [--requests 200]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List, Union
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core import responses  # noqa: E402
+from app.core.responses import RecordsJSONResponse  # noqa: E402
+from app.schemas.pagination import Page  # noqa: E402
+
+SIZES = (100, 10_000)
+
+
+class Record:
+    """Stand-in for a ``databases`` record: a read-only mapping over one row"""
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def _mapping(self):
+        return self._row
+
+    def keys(self):
+        return self._row.keys()
+
+    def __getitem__(self, key):
+        return self._row[key]
+
+
+def make_records(n):
+    created = datetime(2024, 1, 1, 8, 30)
+    return [Record({
+        'id': i, 'name': f"Địa điểm {i}", 'province': "Lâm Đồng", 'region': "Tây Nguyên",
+        'category': "núi", 'rating': Decimal("4.5"),
+        'description': "Thành phố ngàn hoa với khí hậu mát mẻ quanh năm, đồi thông và hồ nước.",
+        'best_time_to_visit': "Tháng 11 - Tháng 3", 'best_months': [11, 12, 1, 2, 3],
+        'image_url': f"/static/uploads/{i}.jpg", 'created_at': created + timedelta(minutes=i),
+    }) for i in range(n)]
+
+
+def create_app(records):
+    app = FastAPI()
+
+    @app.get("/default", response_model=Union[List[dict], Page])
+    async def default_route():
+        return [dict(r) for r in records]
+
+    @app.get("/fast", response_model=Union[List[dict], Page])
+    async def fast_route():
+        return RecordsJSONResponse(records)
+
+    return app
+
+
+async def bench(client, path, requests):
+    size = len((await client.get(path)).content)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    return requests / elapsed, elapsed / requests * 1000, size
+
+
+async def run(requests):
+    print(f"{'rows':>7} {'path':<8} {'req/s':>9} {'ms/req':>9} {'bytes':>10}")
+    for n in SIZES:
+        app = create_app(make_records(n))
+        # Fewer requests for the large page so both sizes take similar time
+        count = max(5, requests * SIZES[0] // n)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            default = await bench(client, "/default", count)
+            fast = await bench(client, "/fast", count)
+        for path, (rps, ms, size) in (("default", default), ("fast", fast)):
+            print(f"{n:>7} {path:<8} {rps:>9.1f} {ms:>9.2f} {size:>10}")
+        print(f"{'':>7} speedup {fast[0] / default[0]:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests for the 100-row page")
+    args = parser.parse_args()
+    print(f"serializer: {'orjson' if responses.orjson is not None else 'json (orjson not installed)'}")
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Prepared vs unprepared cost of the fixed action query shapes (actions/queries.py).
+
+Creates, migrates and seeds a throwaway database like benchmarks/replay.py, then for each
+registered statement reports the planning/execution split from EXPLAIN ANALYZE and the
+per-call latency when the SQL is parsed and planned on every call (statement cache off)
+versus executed through one server-side prepared statement.
+
+Run from the repo root:
+    python -m benchmarks.prepared_statements [--destinations 200] [--number 500]
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import asyncpg
+import psycopg2
+
+from .replay import load_nlu, seed, percentile, _with_database
+from actions import queries  # noqa: F401  (registers the statements)
+from actions.db import STATEMENTS
+
+
+async def sample_args(conn):
+    """Arguments for every statement, drawn from the seeded catalog"""
+    ids = [r['id'] for r in await conn.fetch("SELECT id FROM destinations ORDER BY rating DESC LIMIT 3")]
+    province = await conn.fetchval("SELECT province FROM destinations WHERE id = $1", ids[0])
+    return {
+        'search_destinations': (ids, f"%{province}%", None),
+        'city_summary': (f"%{province}%", 5),
+        'hotels': (ids, 4, "%trung bình%"),
+        'restaurants': (ids, None, "%rẻ%"),
+        'activities': (ids, None),
+        'tours': (ids, None),
+        'weather': (ids, 6),
+        'weather_by_month': (ids[0],),
+        'direct_transportation': (ids, ids),
+        'reviews': (ids,),
+        'destination_costs': (ids,),
+        'compare_destinations': (ids, 6),
+    }
+
+
+async def explain(conn, sql, args):
+    plan = json.loads(await conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", *args))[0]
+    return plan['Planning Time'], plan['Execution Time']
+
+
+async def time_calls(call, number):
+    latencies = []
+    for _ in range(number):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+async def run(url, number):
+    # statement_cache_size=0: asyncpg parses and plans the SQL again on every call
+    plain = await asyncpg.connect(url, statement_cache_size=0)
+    prepared_conn = await asyncpg.connect(url)
+    try:
+        args_by_name = await sample_args(plain)
+        report = {}
+        for name, stmt in STATEMENTS.items():
+            args = args_by_name.get(name)
+            if args is None:
+                print(f"  {name}: no sample arguments, skipped", file=sys.stderr)
+                continue
+            planning_ms, execution_ms = await explain(plain, stmt.sql, args)
+            prepared = await prepared_conn.prepare(stmt.sql)
+            # Warm-up: the server switches to a generic plan after five custom ones
+            for _ in range(10):
+                await plain.fetch(stmt.sql, *args)
+                await prepared.fetch(*args)
+            unprepared = await time_calls(lambda: plain.fetch(stmt.sql, *args), number)
+            reused = await time_calls(lambda: prepared.fetch(*args), number)
+            report[name] = {
+                'planning_ms': round(planning_ms, 3),
+                'execution_ms': round(execution_ms, 3),
+                'unprepared_p50_ms': round(percentile(unprepared, 50) * 1000, 3),
+                'prepared_p50_ms': round(percentile(reused, 50) * 1000, 3),
+                'unprepared_p95_ms': round(percentile(unprepared, 95) * 1000, 3),
+                'prepared_p95_ms': round(percentile(reused, 95) * 1000, 3),
+            }
+    finally:
+        await plain.close()
+        await prepared_conn.close()
+    return report
+
+
+def print_report(report):
+    print(f"{'statement':<24} {'plan ms':>8} {'exec ms':>8} {'unprep p50':>11} {'prep p50':>9} "
+          f"{'unprep p95':>11} {'prep p95':>9} {'saved':>7}")
+    for name, r in report.items():
+        saved = 1 - r['prepared_p50_ms'] / r['unprepared_p50_ms'] if r['unprepared_p50_ms'] else 0
+        print(f"{name:<24} {r['planning_ms']:>8} {r['execution_ms']:>8} {r['unprepared_p50_ms']:>11} "
+              f"{r['prepared_p50_ms']:>9} {r['unprepared_p95_ms']:>11} {r['prepared_p95_ms']:>9} {saved * 100:>6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--admin-url", default=os.getenv(
+        "BENCH_ADMIN_URL", f"postgresql://postgres:{os.getenv('DB_PASSWORD', 'test1234')}@localhost:5432/postgres"),
+        help="connection used to create/drop the disposable database")
+    parser.add_argument("--destinations", type=int, default=200, help="catalog size (other tables scale with it)")
+    parser.add_argument("--number", type=int, default=500, help="timed calls per statement and mode")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import migrate_db  # backend/migrate_db.py, on sys.path via benchmarks.replay
+
+    _, entity_values = load_nlu()
+    database = f"travel_chatbot_bench_{os.getpid()}"
+    admin = psycopg2.connect(args.admin_url)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f'CREATE DATABASE "{database}" ENCODING \'UTF8\' TEMPLATE template0')
+    url = _with_database(args.admin_url, database)
+    try:
+        migrate_db.migrate(url)
+        conn = psycopg2.connect(url)
+        try:
+            seed(conn, args.destinations, entity_values, random.Random(args.seed))
+        finally:
+            conn.close()
+        report = asyncio.run(run(url, args.number))
+    finally:
+        with admin.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s", (database,))
+            cur.execute(f'DROP DATABASE IF EXISTS "{database}"')
+        admin.close()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Micro-benchmark for actions/renderers.py: cost of rendering one search reply of 10 rows.
+
+Run from the repo root:  python -m benchmarks.render_results [--number 20000]
+"""
+import argparse
+import timeit
+from decimal import Decimal
+
+from actions.renderers import format_results
+from actions.text_utils import parse_text_list
+
+ROWS = 10
+
+SAMPLES = {
+    'destination': lambda i: {
+        'name': f"Địa điểm {i}", 'province': "Lâm Đồng", 'rating': Decimal("4.5"),
+        'category': "núi", 'description': "Thành phố ngàn hoa với khí hậu mát mẻ quanh năm " * 3,
+    },
+    'hotel': lambda i: {
+        'name': f"Khách sạn {i}", 'address': "1 Trần Phú", 'star_rating': 4, 'price_range': "trung bình",
+        'amenities': parse_text_list('["wifi", "hồ bơi", "spa", "gym"]'),
+    },
+    'restaurant': lambda i: {
+        'name': f"Nhà hàng {i}", 'cuisine_type': "Việt", 'price_range': "rẻ", 'rating': Decimal("4.2"),
+    },
+    'activity': lambda i: {
+        'name': f"Hoạt động {i}", 'type': "tham quan", 'price': Decimal("250000.00"),
+        'duration': "3 giờ", 'description': "Khám phá đồi chè và thác nước " * 4,
+    },
+    'tour': lambda i: {
+        'name': f"Tour {i}", 'duration_days': 3, 'price': Decimal("3500000.00"),
+        'destinations': parse_text_list("Đà Lạt, Nha Trang, Mũi Né"),
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="renders per entity type")
+    args = parser.parse_args()
+
+    print(f"{'entity':<12} {'us / ' + str(ROWS) + ' rows':>14}")
+    for entity_type, make_row in SAMPLES.items():
+        rows = [make_row(i) for i in range(ROWS)]
+        seconds = min(timeit.repeat(lambda: format_results(rows, entity_type), number=args.number, repeat=3))
+        print(f"{entity_type:<12} {seconds / args.number * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
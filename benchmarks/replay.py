@@ -0,0 +1,343 @@
+"""Replay benchmark: run every custom action against a disposable, seeded Postgres.
+
+Trackers are built from the stories/rules in data/ (the slots each action sees there),
+with entity values varied using the annotated examples in data/nlu.yml. A throwaway
+database is created, migrated (backend/migrations) and seeded with a synthetic catalog,
+then each action's run() is called --runs times with --concurrency in flight.
+
+Run from the repo root:
+    python -m benchmarks.replay [--destinations 200] [--runs 200] [--concurrency 10] [--output after.json]
+    python -m benchmarks.replay --baseline before.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import inspect
+import argparse
+import itertools
+from urllib.parse import urlparse, urlunparse
+
+import yaml
+import psycopg2
+from psycopg2.extras import execute_values
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, 'data')
+DOMAIN_FILE = os.path.join(ROOT, 'domain.yml')
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import migrate_db  # noqa: E402  (backend/migrate_db.py)
+
+# Catalog rows generated per destination
+PER_DESTINATION = {'hotels': 8, 'restaurants': 8, 'activities': 6, 'reviews': 5, 'routes': 3}
+PRICE_BANDS = ("rẻ", "trung bình", "cao cấp")
+TRANSPORT_TYPES = (("máy bay", "1 giờ 30 phút", "1.200.000 - 2.500.000 VNĐ"),
+                   ("tàu hỏa", "8 tiếng", "600k - 1,2 triệu"),
+                   ("xe khách", "10 tiếng", "300k"))
+
+_ANNOTATION = re.compile(r'\[([^\]]+)\](?:\((\w+)(?::[^)]*)?\)|\{"entity":\s*"(\w+)"[^}]*\})')
+
+
+def _load_yaml(path):
+    with open(path, encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_nlu(path=os.path.join(DATA_DIR, 'nlu.yml')):
+    """({intent: [plain example texts]}, {entity: [annotated values]})"""
+    texts, values = {}, {}
+    for block in _load_yaml(path).get('nlu', []):
+        if 'intent' not in block:
+            continue
+        for line in (block.get('examples') or "").splitlines():
+            line = line.strip().lstrip('-').strip()
+            if not line:
+                continue
+            for match in _ANNOTATION.finditer(line):
+                entity = match.group(2) or match.group(3)
+                bucket = values.setdefault(entity, [])
+                if match.group(1) not in bucket:
+                    bucket.append(match.group(1))
+            texts.setdefault(block['intent'], []).append(_ANNOTATION.sub(lambda m: m.group(1), line))
+    return texts, values
+
+
+def load_scenarios(texts):
+    """[(action, slots, latest_message)] for every custom action step in data/stories.yml and data/rules.yml"""
+    domain_slots = [s for s in (_load_yaml(DOMAIN_FILE).get('slots') or {}) if s != 'requested_slot']
+    scenarios = []
+    flows = (_load_yaml(os.path.join(DATA_DIR, 'stories.yml')).get('stories', [])
+             + _load_yaml(os.path.join(DATA_DIR, 'rules.yml')).get('rules', []))
+    for flow in flows:
+        slots = dict.fromkeys(domain_slots)
+        latest = {}
+        for step in flow.get('steps') or []:
+            if 'intent' in step:
+                entities = []
+                for entity in step.get('entities') or []:
+                    for name, value in entity.items():
+                        entities.append({'entity': name, 'value': value})
+                        if name in slots:
+                            slots[name] = value
+                examples = texts.get(step['intent']) or [""]
+                latest = {'intent': {'name': step['intent'], 'confidence': 1.0},
+                          'entities': entities, 'text': examples[0]}
+            elif str(step.get('action', '')).startswith('action_') and latest:
+                scenarios.append((step['action'], dict(slots), latest))
+    return scenarios
+
+
+def vary(scenarios, entity_values, variants, rng):
+    """Each scenario plus ``variants - 1`` copies with entity slots resampled from nlu.yml values"""
+    result = []
+    for action, slots, latest in scenarios:
+        result.append((action, slots, latest))
+        for _ in range(variants - 1):
+            new_slots, entities = dict(slots), []
+            for entity in latest['entities']:
+                value = rng.choice(entity_values.get(entity['entity']) or [entity['value']])
+                entities.append({'entity': entity['entity'], 'value': value})
+                if entity['entity'] in new_slots:
+                    new_slots[entity['entity']] = value
+            result.append((action, new_slots, {**latest, 'entities': entities}))
+    return result
+
+
+def seed(conn, destinations, entity_values, rng):
+    """Fill a freshly migrated database with a synthetic catalog of ``destinations`` places"""
+    names = list(dict.fromkeys(entity_values.get('destination', []) + entity_values.get('from_location', [])
+                               + entity_values.get('to_location', [])))
+    names += [f"Điểm đến {i}" for i in range(len(names), destinations)]
+    names = names[:destinations]
+    regions = entity_values.get('region') or ["miền Bắc", "miền Trung", "miền Nam"]
+    categories = entity_values.get('category') or ["biển", "núi", "văn hóa"]
+    cuisines = entity_values.get('cuisine_type') or ["hải sản", "Việt"]
+    activity_types = entity_values.get('activity_type') or ["tham quan", "lặn biển"]
+    amenities = entity_values.get('amenities') or ["wifi", "hồ bơi", "spa"]
+
+    with conn, conn.cursor() as cur:
+        dest_ids = [r[0] for r in execute_values(cur, """
+            INSERT INTO destinations (name, province, region, category, rating, description)
+            VALUES %s RETURNING id""", [
+            (name, name, rng.choice(regions), rng.choice(categories), round(rng.uniform(3, 5), 1),
+             f"{name} là điểm đến {rng.choice(categories)} nổi tiếng với cảnh quan đẹp và ẩm thực phong phú.")
+            for name in names], fetch=True)]
+
+        execute_values(cur, """
+            INSERT INTO hotels (name, address, destination_id, star_rating, price_range, rating, amenities)
+            VALUES %s""", [
+            (f"Khách sạn {d}-{i}", f"{i} Trần Phú", d, rng.randint(1, 5), rng.choice(PRICE_BANDS),
+             round(rng.uniform(3, 5), 1), rng.sample(amenities, min(3, len(amenities))))
+            for d in dest_ids for i in range(PER_DESTINATION['hotels'])])
+        execute_values(cur, """
+            INSERT INTO restaurants (name, address, destination_id, cuisine_type, price_range, rating)
+            VALUES %s""", [
+            (f"Nhà hàng {d}-{i}", f"{i} Lê Lợi", d, rng.choice(cuisines), rng.choice(PRICE_BANDS),
+             round(rng.uniform(3, 5), 1))
+            for d in dest_ids for i in range(PER_DESTINATION['restaurants'])])
+        execute_values(cur, """
+            INSERT INTO activities (name, destination_id, type, price, duration, description)
+            VALUES %s""", [
+            (f"Hoạt động {d}-{i}", d, rng.choice(activity_types), rng.randrange(100, 2000) * 1000,
+             f"{rng.randint(1, 6)} giờ", "Trải nghiệm địa phương")
+            for d in dest_ids for i in range(PER_DESTINATION['activities'])])
+        execute_values(cur, """
+            INSERT INTO weather (destination_id, month, avg_temp, description)
+            VALUES %s""", [
+            (d, month, round(rng.uniform(15, 35), 1), rng.choice(["nắng", "mưa", "mát mẻ"]))
+            for d in dest_ids for month in range(1, 13)])
+        execute_values(cur, """
+            INSERT INTO reviews (entity_type, entity_id, rating, comment)
+            VALUES %s""", [
+            ('destination', d, rng.randint(1, 5), "Rất đáng để ghé thăm")
+            for d in dest_ids for _ in range(PER_DESTINATION['reviews'])])
+        execute_values(cur, """
+            INSERT INTO transportation (from_destination_id, to_destination_id, type, duration, price_range)
+            VALUES %s""", [
+            (d, rng.choice(dest_ids), *rng.choice(TRANSPORT_TYPES))
+            for d in dest_ids for _ in range(PER_DESTINATION['routes'])])
+        execute_values(cur, """
+            INSERT INTO tours (name, destinations, duration_days, price, description)
+            VALUES %s""", [
+            (f"Tour {i}", json.dumps([names[j] for j in rng.sample(range(len(names)), min(3, len(names)))],
+                                     ensure_ascii=False),
+             rng.randint(2, 7), rng.randrange(2000, 15000) * 1000, "Tour trọn gói")
+            for i in range(max(1, destinations // 2))])
+        cur.execute("SELECT sync_tour_destinations(id) FROM tours")
+        cur.execute("ANALYZE")
+    return len(dest_ids)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def bench_action(action, scenarios, runs, concurrency, domain):
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+
+    trackers = itertools.cycle([
+        {'sender_id': f"bench-{i}", 'slots': slots, 'latest_message': latest, 'events': [],
+         'paused': False, 'followup_action': None, 'active_loop': {}, 'latest_action_name': None}
+        for i, (_, slots, latest) in enumerate(scenarios)])
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(state):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = action.run(CollectingDispatcher(), Tracker.from_dict(state), domain)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(next(trackers)) for _ in range(runs)))
+    return sorted(latencies), errors, time.perf_counter() - started
+
+
+async def run_benchmarks(scenarios, args):
+    # Imported only now: DB_CONFIG is read from the environment at import time
+    from rasa_sdk import Action
+    from actions import actions as action_module
+    from actions.db import pool, listener
+    from actions.metrics import metrics
+
+    domain = _load_yaml(DOMAIN_FILE)
+    by_action = {}
+    for name, slots, latest in scenarios:
+        by_action.setdefault(name, []).append((name, slots, latest))
+    classes = {cls().name(): cls for _, cls in inspect.getmembers(action_module, inspect.isclass)
+               if issubclass(cls, Action) and cls.__module__ == action_module.__name__
+               and 'name' in cls.__dict__}
+
+    report = {}
+    try:
+        for name in sorted(by_action):
+            if name not in classes or (args.actions and name not in args.actions):
+                continue
+            action = classes[name]()
+            # Warm-up pass: first-use loads (search index, caches, pool) are not what we measure
+            await bench_action(action, by_action[name], len(by_action[name]), args.concurrency, domain)
+            metrics.reset()
+            latencies, errors, wall = await bench_action(action, by_action[name], args.runs, args.concurrency, domain)
+            stats = metrics.get(name)
+            report[name] = {
+                'runs': len(latencies),
+                'errors': errors + (stats.errors if stats else 0),
+                'throughput_per_s': round(len(latencies) / wall, 1),
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+                'db_ms_mean': round(stats.db.sum / stats.calls * 1000, 3) if stats and stats.calls else None,
+                'rows_mean': round(stats.rows / stats.calls, 1) if stats and stats.calls else None,
+            }
+            print(f"  {name}: {report[name]['p50_ms']} ms p50", file=sys.stderr)
+    finally:
+        await listener.close()
+        await pool.close()
+    return report
+
+
+def _with_database(url, database):
+    return urlunparse(urlparse(url)._replace(path=f"/{database}"))
+
+
+def _export_db_env(url):
+    parsed = urlparse(url)
+    os.environ.update({
+        'DB_HOST': parsed.hostname or 'localhost',
+        'DB_PORT': str(parsed.port or 5432),
+        'DB_USER': parsed.username or 'postgres',
+        'DB_PASSWORD': parsed.password or '',
+        'DB_NAME': parsed.path.lstrip('/'),
+    })
+
+
+def print_report(report, baseline=None):
+    header = f"{'action':<40} {'runs':>6} {'err':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'db ms':>8}"
+    if baseline:
+        header += f" {'p95 Δ':>8}"
+    print(header)
+    for name, r in report.items():
+        line = (f"{name:<40} {r['runs']:>6} {r['errors']:>4} {r['throughput_per_s']:>9} {r['p50_ms']:>9} "
+                f"{r['p95_ms']:>9} {r['p99_ms']:>9} {r['db_ms_mean'] if r['db_ms_mean'] is not None else '-':>8}")
+        before = (baseline or {}).get(name)
+        if before:
+            line += f" {(r['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0:>+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--admin-url", default=os.getenv(
+        "BENCH_ADMIN_URL", f"postgresql://postgres:{os.getenv('DB_PASSWORD', 'test1234')}@localhost:5432/postgres"),
+        help="connection used to create/drop the disposable database")
+    parser.add_argument("--destinations", type=int, default=200, help="catalog size (other tables scale with it)")
+    parser.add_argument("--runs", type=int, default=200, help="measured runs per action")
+    parser.add_argument("--concurrency", type=int, default=10, help="runs in flight at once")
+    parser.add_argument("--variants", type=int, default=5, help="entity variations per story step")
+    parser.add_argument("--actions", nargs="*", help="only these action names")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier --output report to compare p95 against")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark database afterwards")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts, entity_values = load_nlu()
+    scenarios = vary(load_scenarios(texts), entity_values, args.variants, rng)
+
+    database = f"travel_chatbot_bench_{os.getpid()}"
+    admin = psycopg2.connect(args.admin_url)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f'CREATE DATABASE "{database}" ENCODING \'UTF8\' TEMPLATE template0')
+    url = _with_database(args.admin_url, database)
+    try:
+        migrate_db.migrate(url)
+        conn = psycopg2.connect(url)
+        try:
+            seeded = seed(conn, args.destinations, entity_values, rng)
+        finally:
+            conn.close()
+        print(f"Seeded {seeded} destinations into {database}", file=sys.stderr)
+
+        _export_db_env(url)
+        report = asyncio.run(run_benchmarks(scenarios, args))
+    finally:
+        if not args.keep:
+            with admin.cursor() as cur:
+                cur.execute("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s", (database,))
+                cur.execute(f'DROP DATABASE IF EXISTS "{database}"')
+        admin.close()
+
+    result = {
+        'config': {'destinations': args.destinations, 'runs': args.runs, 'concurrency': args.concurrency,
+                   'variants': args.variants, 'seed': args.seed},
+        'actions': report,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f).get('actions')
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from actions import cache
+from actions.cache import QueryCache, cache_key, query_tables
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    query_cache = QueryCache(max_entries=8, ttl=60)
+    monkeypatch.setattr(cache, "query_cache", query_cache)
+
+    async def started():
+        pass
+    monkeypatch.setattr(cache.listener, "ensure_started", started)
+    return query_cache
+
+
+def test_query_tables_includes_derived_sources():
+    assert query_tables("SELECT * FROM hotels h JOIN destinations d ON d.id = h.destination_id") == {
+        "hotels", "destinations"}
+    assert {"hotels", "restaurants", "activities", "transportation"} <= query_tables(
+        "SELECT * FROM destination_costs")
+
+
+def test_cache_key_ignores_whitespace():
+    assert cache_key("SELECT *\n  FROM hotels", [1, 2]) == cache_key("SELECT * FROM hotels", (1, 2))
+
+
+def test_invalidation_drops_matching_entries_only(fresh_cache):
+    fresh_cache.set("a", 1, frozenset({"hotels"}))
+    fresh_cache.set("b", 2, frozenset({"weather"}))
+    fresh_cache.invalidate("hotels")
+    assert fresh_cache.get("a") == (False, None)
+    assert fresh_cache.get("b") == (True, 2)
+
+
+def test_result_fetched_across_an_invalidation_is_not_cached(fresh_cache, monkeypatch):
+    calls = []
+
+    async def fetch(query, *args):
+        calls.append(args)
+        if len(calls) == 1:
+            # NOTIFY handled while the query is in flight: the rows coming back are stale
+            fresh_cache.invalidate("hotels")
+            return [{"name": "old"}]
+        return [{"name": "new"}]
+
+    monkeypatch.setattr(cache, "fetch", fetch)
+    query = "SELECT * FROM hotels WHERE destination_id = $1"
+    assert asyncio.run(cache.cached_fetch(query, 1)) == [{"name": "old"}]
+    assert asyncio.run(cache.cached_fetch(query, 1)) == [{"name": "new"}]
+    assert asyncio.run(cache.cached_fetch(query, 1)) == [{"name": "new"}]
+    assert len(calls) == 2
+    assert fresh_cache.stats()["stale_results"] == 1
+
+
+def test_unrelated_invalidation_does_not_block_caching(fresh_cache, monkeypatch):
+    async def fetchrow(query, *args):
+        fresh_cache.invalidate("weather")
+        return {"id": 1}
+
+    monkeypatch.setattr(cache, "fetchrow", fetchrow)
+    asyncio.run(cache.cached_fetchrow("SELECT * FROM hotels WHERE id = $1", 1))
+    assert fresh_cache.stats()["size"] == 1
@@ -0,0 +1,59 @@
+from actions.destination_resolver import ALIAS_GROUPS, DestinationResolver, load_alias_groups
+from actions.text_utils import normalize_text
+
+ROWS = [
+    {"id": 1, "name": "Đà Lạt", "province": "Lâm Đồng"},
+    {"id": 2, "name": "Vịnh Hạ Long", "province": "Quảng Ninh"},
+    {"id": 3, "name": "Thành phố Hồ Chí Minh", "province": "Hồ Chí Minh"},
+    {"id": 4, "name": "Bảo Lộc", "province": "Lâm Đồng"},
+    {"id": 5, "name": "Nha Trang", "province": "Khánh Hòa"},
+]
+
+
+def make_resolver():
+    resolver = DestinationResolver(ALIAS_GROUPS)
+    resolver.load(ROWS)
+    return resolver
+
+
+def test_alias_groups_only_keep_places():
+    groups = load_alias_groups()
+    assert any({"sài gòn", "saigon", "thành phố hồ chí minh"} <= group for group in groups)
+    assert all(normalize_text("khách sạn") not in group for group in groups)
+
+
+def test_exact_name_ignores_case_spacing_and_diacritics():
+    resolver = make_resolver()
+    assert resolver.resolve("  đà   LẠT ") == (1,)
+    assert resolver.resolve("da lat") == (1,)
+
+
+def test_alias_resolves_to_the_canonical_destination():
+    resolver = make_resolver()
+    assert resolver.resolve("Sài Gòn") == (3,)
+    assert resolver.resolve("nt") == (5,)
+
+
+def test_province_lists_its_destinations():
+    assert make_resolver().resolve("Lâm Đồng") == (1, 4)
+
+
+def test_substring_match_like_the_old_like_filter():
+    resolver = make_resolver()
+    assert resolver.resolve("Hạ Long") == (2,)
+    # Short keys never match as substrings
+    assert resolver.resolve("lo") == ()
+
+
+def test_unknown_and_empty_text():
+    resolver = make_resolver()
+    assert resolver.resolve("Paris") == ()
+    assert resolver.resolve("") == ()
+
+
+def test_reload_clears_memoized_results():
+    resolver = make_resolver()
+    assert resolver.resolve("Phú Quốc") == ()
+    resolver.load(ROWS + [{"id": 6, "name": "Phú Quốc", "province": "Kiên Giang"}])
+    assert resolver.resolve("Phú Quốc") == (6,)
+    assert resolver.resolve("đảo ngọc") == (6,)
@@ -0,0 +1,70 @@
+import pytest
+
+from actions.fuzzy_match import FuzzyMatcher, edit_distance, fuzzy_key, max_distance
+
+ROWS = [
+    {"id": 1, "name": "Đà Lạt", "rating": 4.7},
+    {"id": 2, "name": "Đà Nẵng", "rating": 4.8},
+    {"id": 3, "name": "Phú Quốc", "rating": 4.6},
+    {"id": 4, "name": "Thành phố Hồ Chí Minh", "rating": 4.5},
+    {"id": 5, "name": "Huế", "rating": 4.4},
+]
+
+
+def make_matcher():
+    matcher = FuzzyMatcher([{"sài gòn", "saigon", "thành phố hồ chí minh"}])
+    matcher.build(ROWS)
+    return matcher
+
+
+def ids(matches):
+    return [(row["id"], distance) for row, distance in matches]
+
+
+@pytest.mark.parametrize("a, b, limit, expected", [
+    ("da lat", "da lat", 2, 0),
+    ("da lat", "da lta", 2, 1),
+    ("phu quoc", "phu quco", 2, 1),
+    ("kitten", "sitting", 3, 3),
+    ("abc", "xyzabc", 2, 3),
+])
+def test_edit_distance(a, b, limit, expected):
+    assert edit_distance(a, b, limit) == expected
+
+
+def test_fuzzy_key_and_allowed_distance():
+    assert fuzzy_key("  Đà   Lạt ") == "da lat"
+    assert max_distance("hu") == 0
+    assert max_distance("hue") == 1
+    assert max_distance("phu quoc") == 2
+
+
+def test_typos_match_within_the_allowed_distance():
+    matcher = make_matcher()
+    assert ids(matcher.match("Phu Quco")) == [(3, 1)]
+    assert ids(matcher.match("đà lạt")) == [(1, 0)]
+    assert ids(matcher.match("sai gonn")) == [(4, 1)]
+
+
+def test_ranked_by_distance_then_rating():
+    matcher = make_matcher()
+    assert ids(matcher.match("da lang")) == [(2, 1), (1, 2)]
+    matcher.upsert({"id": 6, "name": "Hòn Tre", "rating": 3.9})
+    matcher.upsert({"id": 7, "name": "Hon Tre", "rating": 4.9})
+    assert ids(matcher.match("hon tree")) == [(7, 1), (6, 1)]
+
+
+def test_short_keys_match_exactly_only():
+    matcher = make_matcher()
+    assert ids(matcher.match("hue")) == [(5, 0)]
+    assert ids(matcher.match("hu")) == []
+
+
+def test_upsert_and_remove_keep_the_index_current():
+    matcher = make_matcher()
+    matcher.upsert({"id": 3, "name": "Côn Đảo", "rating": 4.5})
+    assert ids(matcher.match("phu quoc")) == []
+    assert ids(matcher.match("con dao")) == [(3, 0)]
+    matcher.remove(3)
+    assert ids(matcher.match("con dao")) == []
+    assert len(matcher) == 4
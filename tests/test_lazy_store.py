@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from actions.lazy_store import LazyStore
+
+
+class RecordingStore(LazyStore):
+    table = 'destinations'
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.loads = []
+        self.fail = fail
+
+    async def _load_all(self):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.loads.append('all')
+
+    async def _load_ids(self, ids):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.loads.append(sorted(ids))
+
+
+def test_full_load_first_then_only_dirty_rows():
+    store = RecordingStore()
+    store.mark_dirty(3)
+    asyncio.run(store.ensure_loaded())
+    assert store.loads == ['all']
+    asyncio.run(store.ensure_loaded())
+    store.mark_dirty(5)
+    store.mark_dirty(2)
+    asyncio.run(store.ensure_loaded())
+    assert store.loads == ['all', [2, 5]]
+
+
+def test_failed_loads_are_retried():
+    store = RecordingStore(fail=True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.ensure_loaded())
+    assert store._stale
+
+    store.fail = False
+    asyncio.run(store.ensure_loaded())
+    store.mark_dirty(7)
+    store.fail = True
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.ensure_loaded())
+    assert store._dirty == {7}
+
+
+def test_notifications_for_other_tables_are_ignored():
+    store = RecordingStore()
+    store._stale = False
+    store.on_change('hotels', {'id': 1})
+    store.on_change('destinations', {'id': 4})
+    assert (store._stale, store._dirty) == (False, {4})
+    store.on_change('destinations', {'id': None})
+    assert store._stale
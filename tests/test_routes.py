@@ -0,0 +1,108 @@
+import pytest
+
+from actions.routes import (CHEAPEST, FASTEST, FEWEST_TRANSFERS, RouteGraph, objective_from_text,
+                            parse_duration)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 giờ 30 phút", 90),
+    ("1-2 tiếng", 90),
+    ("2h", 120),
+    ("45 phút", 45),
+    ("1 ngày", 1440),
+    ("1,5 giờ", 90),
+    ("tùy tình hình", None),
+    (None, None),
+])
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("đi sao cho rẻ nhất", CHEAPEST),
+    ("đi nhanh nhất", FASTEST),
+    ("đi thẳng, không đổi xe", FEWEST_TRANSFERS),
+    ("đi Đà Lạt thế nào", None),
+])
+def test_objective_from_text(text, expected):
+    assert objective_from_text(text) == expected
+
+
+def leg(leg_id, source, target, duration, price_range, kind="xe khách"):
+    return {"id": leg_id, "from_destination_id": source, "to_destination_id": target, "type": kind,
+            "duration": duration, "price_range": price_range}
+
+
+# 1 -> 4 direct by plane (fast, expensive); 1 -> 2 -> 3 -> 4 by bus (slow, cheap); 1 -> 3 -> 4 in between
+LEGS = [
+    leg(1, 1, 4, "1 giờ", "2 triệu", "máy bay"),
+    leg(2, 1, 2, "3 giờ", "100k"),
+    leg(3, 2, 3, "3 giờ", "100k"),
+    leg(4, 3, 4, "3 giờ", "100k"),
+    leg(5, 1, 3, "4 giờ", "500k", "tàu hỏa"),
+]
+
+
+def make_graph(rows=LEGS):
+    graph = RouteGraph()
+    graph.build(rows, {1: "A", 2: "B", 3: "C", 4: "D"})
+    return graph
+
+
+def leg_ids(route):
+    return [leg.id for leg in route.legs]
+
+
+def test_fastest_takes_the_direct_flight():
+    route = make_graph().shortest([1], [4], FASTEST)
+    assert leg_ids(route) == [1]
+    assert (route.minutes, route.price, route.transfers) == (60, 2_000_000, 0)
+
+
+def test_cheapest_takes_multiple_hops():
+    route = make_graph().shortest([1], [4], CHEAPEST)
+    assert leg_ids(route) == [2, 3, 4]
+    assert (route.minutes, route.price, route.transfers) == (540, 300_000, 2)
+
+
+def test_fewest_transfers_breaks_ties_by_time():
+    assert leg_ids(make_graph().shortest([1], [4], FEWEST_TRANSFERS)) == [1]
+    graph = make_graph([l for l in LEGS if l["id"] != 1])
+    assert leg_ids(graph.shortest([1], [4], FEWEST_TRANSFERS)) == [5, 4]
+
+
+def test_best_of_several_sources_and_targets():
+    route = make_graph().shortest([2, 3], [4, 3], FASTEST)
+    assert leg_ids(route) == [3]
+
+
+def test_unreachable_and_same_place():
+    graph = make_graph()
+    assert graph.shortest([4], [1]) is None
+    assert graph.shortest([1], [1]) is None
+
+
+def test_legs_with_unknown_cost_are_used_last():
+    graph = make_graph(LEGS + [leg(6, 1, 4, None, "liên hệ")])
+    assert leg_ids(graph.shortest([1], [4], CHEAPEST)) == [2, 3, 4]
+
+
+def test_updates_invalidate_cached_trees():
+    graph = make_graph()
+    assert leg_ids(graph.shortest([1], [4], CHEAPEST)) == [2, 3, 4]
+    graph.upsert(leg(1, 1, 4, "1 giờ", "50k", "máy bay"))
+    assert leg_ids(graph.shortest([1], [4], CHEAPEST)) == [1]
+    graph.remove(1)
+    assert leg_ids(graph.shortest([1], [4], FASTEST)) == [5, 4]
+
+
+@pytest.mark.parametrize("table, payload, stale, dirty_names", [
+    ('destinations', {'id': 7}, False, {7}),
+    ('destinations', {'id': None}, True, set()),
+    (None, {}, True, set()),
+])
+def test_destination_notifications(table, payload, stale, dirty_names):
+    graph = RouteGraph()
+    graph._stale = False
+    graph.on_change(table, payload)
+    assert (graph._stale, graph._dirty_names) == (stale, dirty_names)
@@ -0,0 +1,63 @@
+from actions.search_index import SearchIndex, tokenize
+
+ROWS = [
+    {"id": 1, "name": "Đà Lạt", "province": "Lâm Đồng", "category": "núi", "region": "Tây Nguyên",
+     "description": "Thành phố ngàn hoa, khí hậu mát mẻ", "rating": 4.7},
+    {"id": 2, "name": "Nha Trang", "province": "Khánh Hòa", "category": "biển", "region": "Nam Trung Bộ",
+     "description": "Bãi biển dài, lặn ngắm san hô", "rating": 4.6},
+    {"id": 3, "name": "Mũi Né", "province": "Bình Thuận", "category": "biển", "region": "Nam Trung Bộ",
+     "description": "Đồi cát và biển", "rating": 4.2},
+    {"id": 4, "name": "Sa Pa", "province": "Lào Cai", "category": "núi", "region": "Tây Bắc",
+     "description": "Ruộng bậc thang, núi Fansipan", "rating": 4.8},
+]
+
+
+def make_index():
+    index = SearchIndex()
+    index.build(ROWS)
+    return index
+
+
+def ranked_ids(index, text, limit=10):
+    return [row["id"] for row, _ in index.search(text, limit)]
+
+
+def test_tokenize_folds_and_drops_stopwords():
+    assert tokenize("Đà Lạt") == ["da", "lat", "da_lat"]
+    assert tokenize("tìm cho tôi Nha Trang") == ["nha", "trang", "nha_trang"]
+    assert tokenize("") == []
+
+
+def test_name_match_ranks_first():
+    assert ranked_ids(make_index(), "da lat")[0] == 1
+    assert ranked_ids(make_index(), "Nha Trang")[0] == 2
+
+
+def test_field_matches_and_limit():
+    index = make_index()
+    assert set(ranked_ids(index, "biển")) == {2, 3}
+    assert len(ranked_ids(index, "biển", limit=1)) == 1
+    assert ranked_ids(index, "Lào Cai") == [4]
+
+
+def test_scores_are_normalized_and_sorted():
+    scores = [score for _, score in make_index().search("núi biển")]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1 for score in scores)
+
+
+def test_no_match_and_stopword_only_queries():
+    index = make_index()
+    assert index.search("Paris") == []
+    assert index.search("tìm cho tôi") == []
+    assert SearchIndex().search("da lat") == []
+
+
+def test_incremental_updates():
+    index = make_index()
+    index.upsert({**ROWS[2], "name": "Phan Thiết"})
+    assert 3 in ranked_ids(index, "Phan Thiết")
+    assert ranked_ids(index, "Mũi Né") == []
+    index.remove(3)
+    assert ranked_ids(index, "Phan Thiết") == []
+    assert len(index) == 3
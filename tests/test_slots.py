@@ -0,0 +1,110 @@
+import pytest
+from rasa_sdk import Tracker
+
+from actions import slots
+from actions.slots import (parse_days, parse_month, parse_number, parse_people, parse_price_band,
+                           parse_star_rating, turn_slots)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("hai người", 2),
+    ("tháng mười hai", 12),
+    ("hai mươi lăm", 25),
+    ("không có gì", 0),
+    ("xin chào", None),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("tháng 5", 5),
+    ("Tháng Mười Hai", 12),
+    ("tháng mười", 10),
+    ("12/2025", 12),
+    ("15/8", 8),
+    ("tháng chạp", 12),
+    ("tháng giêng", 1),
+    ("3", 3),
+    ("tháng 13", None),
+    ("13/2025", None),
+    ("mùa hè năm sau nhé", None),
+    (None, None),
+])
+def test_parse_month(text, expected):
+    assert parse_month(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3 ngày 2 đêm", 3),
+    ("tầm ba ngày", 3),
+    ("2 đêm", 3),
+    ("1 tuần", 7),
+    ("hai tuần", 14),
+    ("cuối tuần", 2),
+    ("hai ngày", 2),
+    ("5", 5),
+    ("mười hai ngày", 12),
+    ("đi chơi lâu lâu", None),
+    (None, None),
+])
+def test_parse_days(text, expected):
+    assert parse_days(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("hai người", 2),
+    ("gia đình 4 người", 4),
+    ("cặp đôi", 2),
+    ("đi một mình", 1),
+    ("hai mươi khách", 20),
+    ("3", 3),
+    ("cả nhà", None),
+    (None, None),
+])
+def test_parse_people(text, expected):
+    assert parse_people(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5 sao", 5),
+    ("khách sạn năm sao", 5),
+    ("4", 4),
+    ("7 sao", None),
+    ("khách sạn đẹp", None),
+    (None, None),
+])
+def test_parse_star_rating(text, expected):
+    assert parse_star_rating(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("giá sinh viên", "rẻ"),
+    ("dưới 500k", "rẻ"),
+    ("tầm trung", "trung bình"),
+    ("khoảng 1 triệu", "trung bình"),
+    ("sang trọng", "cao cấp"),
+    ("3 triệu một đêm", "cao cấp"),
+    ("sao cũng được", None),
+    (None, None),
+])
+def test_parse_price_band(text, expected):
+    assert parse_price_band(text) == expected
+
+
+def make_tracker(sender, message_id, **slot_values):
+    return Tracker(sender, slot_values, {"message_id": message_id, "text": "hi"}, [], False, None, None, None)
+
+
+def test_turn_slots_parses_once_per_turn(monkeypatch):
+    monkeypatch.setattr(slots, "_turns", type(slots._turns)())
+    tracker = make_tracker("u1", "m1", month="tháng chạp", duration="2 đêm", traveler_count="cặp đôi",
+                           star_rating="4 sao", price_range="dưới 500k", destination="Đà Lạt")
+    parsed = turn_slots(tracker)
+    assert (parsed.month, parsed.days, parsed.people, parsed.star_rating, parsed.price_band) == (12, 3, 2, 4, "rẻ")
+    assert parsed.destination == "Đà Lạt"
+    assert turn_slots(tracker) is parsed
+
+    # A slot set mid-turn, or the next message, parses again
+    assert turn_slots(make_tracker("u1", "m1", month="tháng 5")) is not parsed
+    assert turn_slots(make_tracker("u1", "m2", month="tháng 5")).month == 5